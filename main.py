@@ -1,4 +1,7 @@
-from presentation import ObjectPlacementApp
+from multiprocessing import freeze_support
 
 if __name__=="__main__":
-    ObjectPlacementApp().run()
\ No newline at end of file
+    freeze_support()
+
+    from presentation import ObjectPlacementApp
+    ObjectPlacementApp().run()
@@ -1,4 +1,5 @@
 from .i_distance_resolver import IDistanceResolver
 from .geodetic_distance_resolver import GeodeticDistanceResolver
+from .haversine_distance_resolver import HaversineDistanceResolver
 from .road_network_distance_resolver import RoadNetworkDistanceResolver
 from .distance_resolvers_enum import DistanceResolverType
\ No newline at end of file
@@ -2,4 +2,5 @@ from enum import Enum
 
 class DistanceResolverType(Enum):
     GEODETIC = 1
-    ROADNETWORK = 2
\ No newline at end of file
+    ROADNETWORK = 2
+    HAVERSINE = 3
\ No newline at end of file
@@ -1,10 +1,19 @@
-from typing import Optional
+from typing import Optional, Sequence, Tuple
 import math
+import numpy as np
 from geopy.distance import geodesic
 
 from algorithms.distance_resolvers.i_distance_resolver import IDistanceResolver
 
 class GeodeticDistanceResolver(IDistanceResolver):
+    # WGS-84, same ellipsoid geopy uses by default
+    _A = 6378137.0
+    _F = 1 / 298.257223563
+    _B = _A * (1 - _F)
+
+    _MAX_ITERATIONS = 200
+    _TOLERANCE = 1e-12
+
     def get_distance_in_meters(
         self,
         origin_lon: float,
@@ -24,3 +33,90 @@ class GeodeticDistanceResolver(IDistanceResolver):
 
         return math.hypot(horizontal, dz)
 
+    def get_distance_matrix(
+        self,
+        origins: Sequence[Tuple[float, float, Optional[float]]],
+        destinations: Sequence[Tuple[float, float, Optional[float]]],
+    ) -> np.ndarray:
+        o_lon, o_lat, o_alt = self._split_coordinates(origins)
+        d_lon, d_lat, d_alt = self._split_coordinates(destinations)
+
+        horizontal = self._vincenty_inverse(o_lon[:, None], o_lat[:, None],
+                                            d_lon[None, :], d_lat[None, :])
+
+        dz = d_alt[None, :] - o_alt[:, None]
+
+        return np.hypot(horizontal, dz)
+
+    def get_pairwise_distances(
+        self,
+        origins: Sequence[Tuple[float, float, Optional[float]]],
+        destinations: Sequence[Tuple[float, float, Optional[float]]],
+    ) -> np.ndarray:
+        if len(origins) != len(destinations):
+            raise ValueError("Origins and destinations must have the same length.")
+
+        o_lon, o_lat, o_alt = self._split_coordinates(origins)
+        d_lon, d_lat, d_alt = self._split_coordinates(destinations)
+
+        return np.hypot(self._vincenty_inverse(o_lon, o_lat, d_lon, d_lat), d_alt - o_alt)
+
+    @classmethod
+    def _vincenty_inverse(cls,
+                          lon1: np.ndarray, lat1: np.ndarray,
+                          lon2: np.ndarray, lat2: np.ndarray) -> np.ndarray:
+        a, b, f = cls._A, cls._B, cls._F
+
+        lon1, lat1, lon2, lat2 = np.broadcast_arrays(lon1, lat1, lon2, lat2)
+
+        L = np.radians(lon2 - lon1)
+        U1 = np.arctan((1 - f) * np.tan(np.radians(lat1)))
+        U2 = np.arctan((1 - f) * np.tan(np.radians(lat2)))
+        sin_U1, cos_U1 = np.sin(U1), np.cos(U1)
+        sin_U2, cos_U2 = np.sin(U2), np.cos(U2)
+
+        lam = L.copy()
+        converged = np.zeros(L.shape, dtype=bool)
+
+        for _ in range(cls._MAX_ITERATIONS):
+            sin_lam, cos_lam = np.sin(lam), np.cos(lam)
+            sin_sigma = np.hypot(cos_U2 * sin_lam, cos_U1 * sin_U2 - sin_U1 * cos_U2 * cos_lam)
+            cos_sigma = sin_U1 * sin_U2 + cos_U1 * cos_U2 * cos_lam
+            sigma = np.arctan2(sin_sigma, cos_sigma)
+
+            with np.errstate(invalid="ignore", divide="ignore"):
+                sin_alpha = np.where(sin_sigma == 0.0, 0.0,
+                                     cos_U1 * cos_U2 * sin_lam / sin_sigma)
+                cos_sq_alpha = 1 - sin_alpha ** 2
+                # equatorial lines have cos_sq_alpha == 0
+                cos_2sigma_m = np.where(cos_sq_alpha == 0.0, 0.0,
+                                        cos_sigma - 2 * sin_U1 * sin_U2 / cos_sq_alpha)
+
+            C = f / 16 * cos_sq_alpha * (4 + f * (4 - 3 * cos_sq_alpha))
+            lam_prev = lam
+            lam = L + (1 - C) * f * sin_alpha * (
+                sigma + C * sin_sigma * (cos_2sigma_m + C * cos_sigma * (-1 + 2 * cos_2sigma_m ** 2))
+            )
+
+            converged = np.abs(lam - lam_prev) <= cls._TOLERANCE
+            if converged.all():
+                break
+
+        u_sq = cos_sq_alpha * (a ** 2 - b ** 2) / b ** 2
+        A = 1 + u_sq / 16384 * (4096 + u_sq * (-768 + u_sq * (320 - 175 * u_sq)))
+        B = u_sq / 1024 * (256 + u_sq * (-128 + u_sq * (74 - 47 * u_sq)))
+        delta_sigma = B * sin_sigma * (
+            cos_2sigma_m + B / 4 * (
+                cos_sigma * (-1 + 2 * cos_2sigma_m ** 2)
+                - B / 6 * cos_2sigma_m * (-3 + 4 * sin_sigma ** 2) * (-3 + 4 * cos_2sigma_m ** 2)
+            )
+        )
+
+        distance = b * A * (sigma - delta_sigma)
+        distance = np.where(sin_sigma == 0.0, 0.0, distance)
+
+        # Vincenty does not converge for nearly antipodal points, geopy (Karney) handles them
+        for idx in zip(*np.nonzero(~converged)):
+            distance[idx] = geodesic((lat1[idx], lon1[idx]), (lat2[idx], lon2[idx])).meters
+
+        return distance
@@ -0,0 +1,61 @@
+from typing import Optional, Sequence, Tuple
+import numpy as np
+
+from algorithms.distance_resolvers.i_distance_resolver import IDistanceResolver
+
+class HaversineDistanceResolver(IDistanceResolver):
+    # IUGG mean Earth radius
+    EARTH_RADIUS_M = 6_371_008.8
+
+    # Sphere vs WGS-84 geodesic: the relative error stays below 0.57 %
+    # (worst case for short meridional lines near the poles / along the equator)
+    MAX_RELATIVE_ERROR = 0.0057
+
+    def get_distance_in_meters(
+        self,
+        origin_lon: float,
+        origin_lat: float,
+        dest_lon: float,
+        dest_lat: float,
+        origin_alt: Optional[float] = None,
+        dest_alt:   Optional[float] = None,
+    ) -> float:
+        return float(self.get_distance_matrix([(origin_lon, origin_lat, origin_alt)],
+                                              [(dest_lon, dest_lat, dest_alt)])[0, 0])
+
+    def get_distance_matrix(
+        self,
+        origins: Sequence[Tuple[float, float, Optional[float]]],
+        destinations: Sequence[Tuple[float, float, Optional[float]]],
+    ) -> np.ndarray:
+        o_lon, o_lat, o_alt = self._split_coordinates(origins)
+        d_lon, d_lat, d_alt = self._split_coordinates(destinations)
+
+        horizontal = self._haversine(o_lon[:, None], o_lat[:, None], d_lon[None, :], d_lat[None, :])
+
+        dz = d_alt[None, :] - o_alt[:, None]
+
+        return np.hypot(horizontal, dz)
+
+    def get_pairwise_distances(
+        self,
+        origins: Sequence[Tuple[float, float, Optional[float]]],
+        destinations: Sequence[Tuple[float, float, Optional[float]]],
+    ) -> np.ndarray:
+        if len(origins) != len(destinations):
+            raise ValueError("Origins and destinations must have the same length.")
+
+        o_lon, o_lat, o_alt = self._split_coordinates(origins)
+        d_lon, d_lat, d_alt = self._split_coordinates(destinations)
+
+        return np.hypot(self._haversine(o_lon, o_lat, d_lon, d_lat), d_alt - o_alt)
+
+    @classmethod
+    def _haversine(cls,
+                   lon1: np.ndarray, lat1: np.ndarray,
+                   lon2: np.ndarray, lat2: np.ndarray) -> np.ndarray:
+        lat1, lat2 = np.radians(lat1), np.radians(lat2)
+        d_lon = np.radians(lon2 - lon1)
+
+        a = np.sin((lat2 - lat1) / 2) ** 2 + np.cos(lat1) * np.cos(lat2) * np.sin(d_lon / 2) ** 2
+        return 2 * cls.EARTH_RADIUS_M * np.arcsin(np.sqrt(np.clip(a, 0.0, 1.0)))
@@ -1,5 +1,7 @@
 from abc import ABC, abstractmethod
-from typing import Optional
+from typing import Optional, Sequence, Tuple
+
+import numpy as np
 
 class IDistanceResolver(ABC):
     @abstractmethod
@@ -12,4 +14,59 @@ class IDistanceResolver(ABC):
         origin_alt: Optional[float] = None,
         dest_alt:   Optional[float] = None,
     ) -> float:
-        raise NotImplementedError
\ No newline at end of file
+        raise NotImplementedError
+
+    def get_distance_matrix(
+        self,
+        origins: Sequence[Tuple[float, float, Optional[float]]],
+        destinations: Sequence[Tuple[float, float, Optional[float]]],
+    ) -> np.ndarray:
+        matrix = np.empty((len(origins), len(destinations)), dtype=np.float64)
+
+        for i, (o_lon, o_lat, o_alt) in enumerate(origins):
+            for j, (d_lon, d_lat, d_alt) in enumerate(destinations):
+                matrix[i, j] = self.get_distance_in_meters(o_lon, o_lat, d_lon, d_lat,
+                                                           o_alt, d_alt)
+
+        return matrix
+
+    def get_pairwise_distances(
+        self,
+        origins: Sequence[Tuple[float, float, Optional[float]]],
+        destinations: Sequence[Tuple[float, float, Optional[float]]],
+    ) -> np.ndarray:
+        if len(origins) != len(destinations):
+            raise ValueError("Origins and destinations must have the same length.")
+
+        return np.fromiter(
+            (self.get_distance_in_meters(o_lon, o_lat, d_lon, d_lat, o_alt, d_alt)
+             for (o_lon, o_lat, o_alt), (d_lon, d_lat, d_alt) in zip(origins, destinations)),
+            dtype=np.float64, count=len(origins))
+
+    def get_pairwise_distances_within(
+        self,
+        origins: Sequence[Tuple[float, float, Optional[float]]],
+        destinations: Sequence[Tuple[float, float, Optional[float]]],
+        limit_m: float,
+    ) -> np.ndarray:
+        # Pairs further apart than limit_m may come back as inf, which lets searching
+        # resolvers stop early; everything within the limit is exact
+        return self.get_pairwise_distances(origins, destinations)
+
+    def get_lower_bound_matrix(
+        self,
+        origins: Sequence[Tuple[float, float, Optional[float]]],
+        destinations: Sequence[Tuple[float, float, Optional[float]]],
+    ) -> Optional[np.ndarray]:
+        # Cheap admissible bounds (never above get_distance_in_meters) for resolvers
+        # whose exact distances are expensive; None means no bound is available
+        return None
+
+    @staticmethod
+    def _split_coordinates(points: Sequence[Tuple[float, float, Optional[float]]]
+                           ) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        lon = np.fromiter((p[0] for p in points), dtype=np.float64, count=len(points))
+        lat = np.fromiter((p[1] for p in points), dtype=np.float64, count=len(points))
+        alt = np.fromiter((0.0 if len(p) < 3 or p[2] is None else p[2] for p in points),
+                          dtype=np.float64, count=len(points))
+        return lon, lat, alt
@@ -1,40 +1,99 @@
-from typing import Optional, Tuple
-from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple
 from geopy.distance import geodesic
-import osmnx as ox
+import numpy as np
 import networkx as nx
 
 from algorithms.distance_resolvers.i_distance_resolver import IDistanceResolver
+from algorithms.distance_resolvers.haversine_distance_resolver import HaversineDistanceResolver
+
+from road_network.alt_landmarks import AltLandmarks
+from road_network.compact_road_graph import CompactRoadGraph
+from road_network.road_distance_cache import RoadDistanceCache
+from road_network.parallel_shortest_paths import ParallelShortestPaths
+from road_network.road_node_snapper import RoadNodeSnapper
+from road_network.road_network_tile_cache import RoadNetworkTileCache
 
 
 class RoadNetworkDistanceResolver(IDistanceResolver):
-    def __init__(self):
-        self._cached_graph: Optional[nx.MultiDiGraph] = None
+    # Headroom for float32 edge lengths and the slightly smaller sphere radius
+    LOWER_BOUND_SCALE = 1 - 1e-5
+
+    def __init__(self, keep_source_graph: bool = False,
+                 tile_cache: Optional[RoadNetworkTileCache] = None,
+                 distance_cache: Optional[RoadDistanceCache] = None,
+                 landmark_count: int = 0,
+                 landmark_dir: Optional[Path | str] = None,
+                 parallel_shortest_paths: Optional[ParallelShortestPaths] = None):
+        self._cached_graph: Optional[CompactRoadGraph] = None
         self._cached_center: Optional[Tuple[float, float]] = None
         self._cached_radius_km: Optional[float] = None
         self._buffer_km = 1.0
+        self._keep_source_graph = keep_source_graph
+        self._tile_cache = tile_cache if tile_cache is not None \
+            else RoadNetworkTileCache(keep_source_graph=keep_source_graph)
+
+        self._parallel_shortest_paths = parallel_shortest_paths if parallel_shortest_paths is not None \
+            else ParallelShortestPaths(workers=1)
+
+        self._landmark_count = landmark_count
+        self._landmark_dir = landmark_dir
+        self._landmarks: Optional[AltLandmarks] = None
+
+        self._haversine_dr = HaversineDistanceResolver()
+
+        self._snapper: Optional[RoadNodeSnapper] = None
+        self._snapped_nodes: Dict[Tuple[float, float], int] = {}
+
+        self._dist_cache: RoadDistanceCache = distance_cache if distance_cache is not None \
+            else RoadDistanceCache(RoadDistanceCache.IN_MEMORY, max_entries=4096)
+
+    def get_road_network(self) -> Optional[CompactRoadGraph]:
+        return self._cached_graph
+
+    def get_distance_cache(self) -> RoadDistanceCache:
+        return self._dist_cache
+
+    def get_landmark_count(self) -> int:
+        return self._landmark_count
 
-        self._dist_cache: "OrderedDict[Tuple[float, float, float, float], float]" = OrderedDict()
-        self._max_cache_size = 4096
+    def set_landmark_count(self, landmark_count: int) -> None:
+        self._landmark_count = landmark_count
+        self._landmarks = None
 
-    def set_road_network(self, graph: nx.MultiDiGraph | None = None,
+    def get_keep_source_graph(self) -> bool:
+        return self._keep_source_graph
+
+    def set_keep_source_graph(self, keep: bool) -> None:
+        self._keep_source_graph = keep
+        self._tile_cache.set_keep_source_graph(keep)
+
+    def set_road_network(self, graph: nx.MultiDiGraph | CompactRoadGraph | None = None,
                          center_coords: Tuple[float, float] | None = None,
                          radius_km: float | None = None):
         if graph is None:
             self._cached_graph = None
             self._cached_center = None
             self._cached_radius_km = None
-            self._dist_cache.clear()
         else:
+            if not isinstance(graph, CompactRoadGraph):
+                graph = CompactRoadGraph.from_networkx(graph, keep_source=self._keep_source_graph)
             self._cached_graph = graph
             self._cached_center = center_coords
             self._cached_radius_km = radius_km
+        self._rebuild_snapper()
     
     def clear_cache(self):
         self._cached_graph = None
         self._cached_center = None
         self._cached_radius_km = None
-        self._dist_cache.clear()
+        self._rebuild_snapper()
+
+    def close(self) -> None:
+        # Stops the search workers, removes their shared graph files and writes the buffered
+        # cache updates. Both start again on the next query
+        self._parallel_shortest_paths.close()
+        self._dist_cache.flush()
 
     def get_distance_in_meters(
         self,
@@ -46,62 +105,226 @@ class RoadNetworkDistanceResolver(IDistanceResolver):
         dest_alt: Optional[float] = None,
     ) -> float:
 
-        key = (origin_lon, origin_lat, dest_lon, dest_lat)
-        if key in self._dist_cache:
-            print("RoadNetworkDistanceResolver: distance retrieved from cache.")
-            self._dist_cache.move_to_end(key)
-            return self._dist_cache[key]
-
         origin = (origin_lat, origin_lon)
         dest = (dest_lat, dest_lon)
-        geo_dist_km = geodesic(origin, dest).km
-
-        if geo_dist_km > 35:
-            raise ValueError("Distance is too large, consider using a different method.")
-
-        radius_km = max(geo_dist_km / 2 + self._buffer_km, self._buffer_km)
-
-        center_lat = (origin_lat + dest_lat) / 2
-        center_lon = (origin_lon + dest_lon) / 2
-        center = (center_lat, center_lon)
 
         if not self._is_within_cache(origin, dest):
-            try:
-                G = ox.graph_from_point(center, dist=int(radius_km * 1000),
-                                        network_type="drive",
-                                        simplify=True,
-                                        truncate_by_edge=True)
-                self._cached_graph = G
-                self._cached_center = center
-                self._cached_radius_km = radius_km
-                print(f"Fetched new graph with {len(G.nodes())} nodes, {len(G.edges())} edges")
-            except Exception:
+            if not self._fetch_coverage([origin, dest]):
                 return float("inf")
 
+        fingerprint = self._cached_graph.get_fingerprint()
+        cached = self._dist_cache.get(fingerprint, (origin_lon, origin_lat), (dest_lon, dest_lat))
+        if cached is not None:
+            return cached
+
         try:
-            origin_node = ox.nearest_nodes(self._cached_graph, X=origin_lon, Y=origin_lat)
-            dest_node = ox.nearest_nodes(self._cached_graph, X=dest_lon, Y=dest_lat)
-            print(f"Origin node: {origin_node}, Dest node: {dest_node}")
+            origin_node, dest_node = self._snap_to_road_nodes([(origin_lon, origin_lat),
+                                                               (dest_lon, dest_lat)])
         except Exception as e:
             print(f"Error snapping to road nodes: {e}")
             return float("inf")
 
-        try:
-            route = nx.shortest_path(self._cached_graph, origin_node, dest_node, weight="length")
-            dist_m = nx.path_weight(self._cached_graph, route, weight="length")
-        except nx.NetworkXNoPath:
-            dist_m = float("inf")
+        landmarks = self._get_landmarks()
+        if landmarks is not None:
+            dist_m = landmarks.get_distance(origin_node, dest_node)
+        else:
+            dist_m = float(self._cached_graph.get_shortest_path_lengths([origin_node])[0, dest_node])
 
         if dist_m != float("inf"):
-            if len(self._dist_cache) >= self._max_cache_size:
-                old_key, _ = self._dist_cache.popitem(last=False)
-                print(f"RoadNetworkDistanceResolver: cache full, evicted {old_key}")
-            self._dist_cache[key] = dist_m
+            self._dist_cache.put(fingerprint, [((origin_lon, origin_lat), (dest_lon, dest_lat), dist_m)])
 
         return dist_m
 
+    def get_distance_matrix(
+        self,
+        origins: Sequence[Tuple[float, float, Optional[float]]],
+        destinations: Sequence[Tuple[float, float, Optional[float]]],
+    ) -> np.ndarray:
+        matrix = np.full((len(origins), len(destinations)), np.inf, dtype=np.float64)
+        if len(origins) == 0 or len(destinations) == 0:
+            return matrix
+
+        points = [(lat, lon) for lon, lat, *_ in list(origins) + list(destinations)]
+
+        if not all(self._is_within_cache(pt, pt) for pt in points):
+            if not self._fetch_coverage(points):
+                return matrix
+
+        origin_points = [(p[0], p[1]) for p in origins]
+        dest_points = [(p[0], p[1]) for p in destinations]
+
+        fingerprint = self._cached_graph.get_fingerprint()
+        cached = self._dist_cache.get_matrix(fingerprint, origin_points, dest_points)
+        missing = np.isnan(cached)
+        rows_to_compute = np.flatnonzero(missing.any(axis=1))
+
+        matrix[~missing] = cached[~missing]
+        if len(rows_to_compute) == 0:
+            print(f"RoadNetworkDistanceResolver: {len(origins)}x{len(destinations)} matrix retrieved from cache")
+            return matrix
+
+        try:
+            snapped = self._snap_to_road_nodes([origin_points[i] for i in rows_to_compute] + dest_points)
+            origin_nodes = snapped[:len(rows_to_compute)]
+            dest_nodes = snapped[len(rows_to_compute):]
+        except Exception as e:
+            print(f"Error snapping to road nodes: {e}")
+            return matrix
+
+        unique_origins, origin_rows = np.unique(origin_nodes, return_inverse=True)
+        unique_dests, dest_columns = np.unique(dest_nodes, return_inverse=True)
+
+        lengths = self._parallel_shortest_paths.get_shortest_path_lengths(self._cached_graph,
+                                                                          unique_origins, unique_dests)
+        matrix[rows_to_compute, :] = lengths[np.ix_(origin_rows.ravel(), dest_columns.ravel())]
+
+        self._dist_cache.put(fingerprint, (
+            (origin_points[i], dest_points[j], matrix[i, j])
+            for i, j in zip(*np.nonzero(missing & np.isfinite(matrix)))
+        ))
+
+        print(f"RoadNetworkDistanceResolver: {len(unique_origins)} searches for "
+              f"{len(origins)}x{len(destinations)} matrix, cache {self._dist_cache.get_stats()}")
+
+        return matrix
+
+    def get_pairwise_distances_within(
+        self,
+        origins: Sequence[Tuple[float, float, Optional[float]]],
+        destinations: Sequence[Tuple[float, float, Optional[float]]],
+        limit_m: float,
+    ) -> np.ndarray:
+        if len(origins) != len(destinations):
+            raise ValueError("Origins and destinations must have the same length.")
+
+        distances = np.full(len(origins), np.inf, dtype=np.float64)
+        if len(origins) == 0:
+            return distances
+
+        points = [(lat, lon) for lon, lat, *_ in list(origins) + list(destinations)]
+
+        if not all(self._is_within_cache(pt, pt) for pt in points):
+            if not self._fetch_coverage(points):
+                return distances
+
+        origin_points = [(p[0], p[1]) for p in origins]
+        dest_points = [(p[0], p[1]) for p in destinations]
+
+        fingerprint = self._cached_graph.get_fingerprint()
+        origin_index = {pt: i for i, pt in enumerate(dict.fromkeys(origin_points))}
+        dest_index = {pt: j for j, pt in enumerate(dict.fromkeys(dest_points))}
+        cached = self._dist_cache.get_matrix(fingerprint, list(origin_index), list(dest_index))
+        cached = cached[[origin_index[pt] for pt in origin_points], [dest_index[pt] for pt in dest_points]]
+
+        missing = np.flatnonzero(np.isnan(cached))
+        distances[~np.isnan(cached)] = cached[~np.isnan(cached)]
+        if len(missing) == 0:
+            return distances
+
+        try:
+            snapped = self._snap_to_road_nodes([origin_points[k] for k in missing] +
+                                               [dest_points[k] for k in missing])
+        except Exception as e:
+            print(f"Error snapping to road nodes: {e}")
+            return distances
+
+        # One search per distinct origin node, stopped at the limit, serves all of its pairs
+        unique_origins, origin_rows = np.unique(snapped[:len(missing)], return_inverse=True)
+        unique_dests, dest_columns = np.unique(snapped[len(missing):], return_inverse=True)
+
+        lengths = self._parallel_shortest_paths.get_shortest_path_lengths(self._cached_graph,
+                                                                          unique_origins, unique_dests, limit_m)
+        distances[missing] = lengths[origin_rows.ravel(), dest_columns.ravel()]
+
+        self._dist_cache.put(fingerprint, (
+            (origin_points[k], dest_points[k], distances[k])
+            for k in missing if np.isfinite(distances[k])
+        ))
+
+        print(f"RoadNetworkDistanceResolver: {len(unique_origins)} searches within {limit_m:.0f} m for "
+              f"{len(origins)} pairs, cache {self._dist_cache.get_stats()}")
+
+        return distances
+
+    def get_lower_bound_matrix(
+        self,
+        origins: Sequence[Tuple[float, float, Optional[float]]],
+        destinations: Sequence[Tuple[float, float, Optional[float]]],
+    ) -> Optional[np.ndarray]:
+        if len(origins) == 0 or len(destinations) == 0:
+            return np.zeros((len(origins), len(destinations)), dtype=np.float64)
+
+        points = [(lat, lon) for lon, lat, *_ in list(origins) + list(destinations)]
+
+        if not all(self._is_within_cache(pt, pt) for pt in points):
+            if not self._fetch_coverage(points):
+                return None
+
+        try:
+            snapped = np.asarray(self._snap_to_road_nodes([(p[0], p[1]) for p in origins] +
+                                                          [(p[0], p[1]) for p in destinations]))
+        except Exception as e:
+            print(f"Error snapping to road nodes: {e}")
+            return None
+
+        # Edge lengths are great-circle segment sums between the snapped nodes, so the
+        # straight great-circle line between those nodes never exceeds the road distance
+        nodes = [(lon, lat, None) for lon, lat in zip(self._cached_graph.get_lons()[snapped].tolist(),
+                                                      self._cached_graph.get_lats()[snapped].tolist())]
+
+        bounds = self._haversine_dr.get_distance_matrix(nodes[:len(origins)], nodes[len(origins):])
+
+        return bounds * self.LOWER_BOUND_SCALE
+
+    def _fetch_coverage(self, points: Sequence[Tuple[float, float]]) -> bool:
+        center_lat = (min(p[0] for p in points) + max(p[0] for p in points)) / 2
+        center_lon = (min(p[1] for p in points) + max(p[1] for p in points)) / 2
+        center = (center_lat, center_lon)
+
+        radius_km = max(geodesic(center, pt).km for pt in points) + self._buffer_km
+
+        try:
+            graph = self._tile_cache.get_coverage(center, radius_km * 1000)
+        except Exception:
+            return False
+
+        self._cached_graph = graph
+        self._cached_center = center
+        self._cached_radius_km = radius_km
+        self._rebuild_snapper()
+        print(f"Fetched new graph with {self._cached_graph.get_node_count()} nodes, "
+              f"{self._cached_graph.get_edge_count()} edges")
+        return True
+
+    def _get_landmarks(self) -> Optional[AltLandmarks]:
+        if self._landmark_count <= 0 or self._cached_graph is None or self._cached_graph.get_node_count() == 0:
+            return None
+        if self._landmarks is None or self._landmarks.get_graph() is not self._cached_graph:
+            self._landmarks = AltLandmarks.load_or_build(self._cached_graph, self._landmark_dir,
+                                                         self._landmark_count)
+        return self._landmarks
+
+    def _rebuild_snapper(self) -> None:
+        self._snapped_nodes.clear()
+        self._landmarks = None
+        if self._cached_graph is None or self._cached_graph.get_node_count() == 0:
+            self._snapper = None
+        else:
+            self._snapper = RoadNodeSnapper.from_graph(self._cached_graph)
+
+    def _snap_to_road_nodes(self, points: Sequence[Tuple[float, float]]) -> List[int]:
+        if self._snapper is None:
+            raise ValueError("Road network is not set")
+
+        missing = list({pt for pt in points if pt not in self._snapped_nodes})
+        if missing:
+            nodes, _ = self._snapper.snap([pt[0] for pt in missing], [pt[1] for pt in missing])
+            self._snapped_nodes.update(zip(missing, nodes.tolist()))
+
+        return [self._snapped_nodes[pt] for pt in points]
+
     def _is_within_cache(self, origin: Tuple[float, float], dest: Tuple[float, float]) -> bool:
-        if not self._cached_graph or not self._cached_center or self._cached_radius_km is None:
+        if self._cached_graph is None or not self._cached_center or self._cached_radius_km is None:
             return False
         radius = self._cached_radius_km - self._buffer_km * 0.25
         return all(geodesic(self._cached_center, pt).km <= radius for pt in [origin, dest])
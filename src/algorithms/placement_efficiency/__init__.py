@@ -1,2 +1,3 @@
 from .i_placement_efficiency_determinator import IPlacementEfficiencyDeterminator
+from .adj_pen_efficiency_engine import AdjPenEfficiencyEngine
 from .p_eff_adj_pen_determinator import PEffAdjPenDeterminator
\ No newline at end of file
@@ -0,0 +1,163 @@
+from typing import Optional
+
+import numpy as np
+
+from models import CompactPlacementNetwork
+
+class AdjPenEfficiencyEngine:
+    # Adjacent same-type penalty model over a CompactPlacementNetwork: a placed object
+    # contributes rate * (1 - penalty) when a neighbour holds the same type and its full
+    # rate otherwise. Per-node counts of same-type neighbours make a single type change
+    # an O(deg) update, so solvers can score moves without a full re-evaluation
+    def __init__(self, network : CompactPlacementNetwork, penalty : float = 0.0) -> None:
+        self._network = network
+        self._penalty_multiplier = 1.0 - penalty
+        self._indptr, self._indices = network.get_adjacency()
+        self._type_ids = network.get_type_ids().copy()
+        self._rates = np.nan_to_num(network.get_independent_rates(), nan=0.0)
+        self.recompute()
+
+    def recompute(self) -> float:
+        count = len(self._type_ids)
+        sources = np.repeat(np.arange(count), np.diff(self._indptr))
+        source_types = self._type_ids[sources]
+        same_type = (source_types == self._type_ids[self._indices]) & \
+                    (source_types != CompactPlacementNetwork.NO_TYPE)
+
+        self._same_type_counts = np.bincount(sources[same_type], minlength=count).astype(np.int32)
+        self._contributions = np.where(self._type_ids != CompactPlacementNetwork.NO_TYPE,
+                                       self._rates * np.where(self._same_type_counts > 0,
+                                                              self._penalty_multiplier, 1.0),
+                                       0.0)
+        self._total_efficiency = float(self._contributions.sum())
+        return self._total_efficiency
+
+    def get_network(self) -> CompactPlacementNetwork:
+        return self._network
+
+    def get_penalty(self) -> float:
+        return 1.0 - self._penalty_multiplier
+
+    def get_total_efficiency(self) -> float:
+        return self._total_efficiency
+
+    def get_type_ids(self) -> np.ndarray:
+        return self._type_ids
+
+    def get_rates(self) -> np.ndarray:
+        return self._rates
+
+    def get_same_type_counts(self) -> np.ndarray:
+        return self._same_type_counts
+
+    def get_contributions(self) -> np.ndarray:
+        return self._contributions
+
+    def get_context_rates(self) -> np.ndarray:
+        return np.where(self._type_ids != CompactPlacementNetwork.NO_TYPE, self._contributions, np.nan)
+
+    def get_change_delta(self, index : int, type_id : int, rate : float) -> float:
+        return self._evaluate_change(index, type_id, rate, apply=False)
+
+    def apply_change(self, index : int, type_id : int, rate : float) -> float:
+        return self._evaluate_change(index, type_id, rate, apply=True)
+
+    def apply_changes(self, indices : np.ndarray, type_id : int, rate : float) -> float:
+        # Bulk change re-evaluated with one O(edges) recompute; returns the total delta
+        before = self._total_efficiency
+        self._type_ids[indices] = type_id
+        self._rates[indices] = rate if type_id != CompactPlacementNetwork.NO_TYPE else 0.0
+        return self.recompute() - before
+
+    def get_change_deltas(self, type_id : int, rate : float, nodes : Optional[np.ndarray] = None) -> np.ndarray:
+        # get_change_delta(i, type_id, rate) for every node i at once in O(edges), or for the
+        # given nodes only in O(their degrees)
+        if nodes is None:
+            nodes = np.arange(len(self._type_ids))
+            degrees = np.diff(self._indptr)
+            targets = self._indices
+        else:
+            starts = self._indptr[nodes]
+            degrees = self._indptr[nodes + 1] - starts
+            offsets = np.arange(degrees.sum()) - np.repeat(np.cumsum(degrees) - degrees, degrees)
+            targets = self._indices[np.repeat(starts, degrees) + offsets]
+        count = len(nodes)
+        sources = np.repeat(np.arange(count), degrees)
+        node_types = self._type_ids[nodes]
+        target_types = self._type_ids[targets]
+        target_same_counts = self._same_type_counts[targets]
+        penalty = 1.0 - self._penalty_multiplier
+
+        # i gives up its object: neighbours whose only same-type neighbour was i are freed
+        freed_mask = (node_types[sources] == target_types) & (target_same_counts == 1) & \
+                     (target_types != CompactPlacementNetwork.NO_TYPE) & (target_types != type_id)
+        freed = np.bincount(sources[freed_mask], weights=self._rates[targets[freed_mask]], minlength=count)
+
+        contributions = self._contributions[nodes]
+        deltas = penalty * freed - contributions
+        if type_id != CompactPlacementNetwork.NO_TYPE:
+            # i receives type_id: neighbours of that type without a same-type neighbour get penalized
+            type_mask = target_types == type_id
+            type_neighbours = np.bincount(sources[type_mask], minlength=count)
+            joining_mask = type_mask & (target_same_counts == 0)
+            joining = np.bincount(sources[joining_mask], weights=self._rates[targets[joining_mask]],
+                                  minlength=count)
+            deltas += rate * np.where(type_neighbours > 0, self._penalty_multiplier, 1.0) - penalty * joining
+
+        unchanged = node_types == type_id
+        deltas[unchanged] = np.where(type_id == CompactPlacementNetwork.NO_TYPE, 0.0,
+                                     rate * np.where(self._same_type_counts[nodes[unchanged]] > 0,
+                                                     self._penalty_multiplier, 1.0)
+                                     - contributions[unchanged])
+        return deltas
+
+    def write_to_network(self) -> CompactPlacementNetwork:
+        self._network.get_type_ids()[:] = self._type_ids
+        self._network.get_independent_rates()[:] = np.where(self._type_ids != CompactPlacementNetwork.NO_TYPE,
+                                                             self._rates, np.nan)
+        self._network.get_context_rates()[:] = self.get_context_rates()
+        return self._network
+
+    def _evaluate_change(self, index : int, type_id : int, rate : float, apply : bool) -> float:
+        old_type = self._type_ids[index]
+        if old_type == CompactPlacementNetwork.NO_TYPE and type_id == CompactPlacementNetwork.NO_TYPE:
+            return 0.0
+
+        neighbours = self._indices[self._indptr[index]:self._indptr[index + 1]]
+        neighbour_types = self._type_ids[neighbours]
+        penalty = 1.0 - self._penalty_multiplier
+
+        delta = -float(self._contributions[index])
+
+        # Neighbours sharing the old type lose a same-type neighbour, those of the new
+        # type gain one; only 1 -> 0 and 0 -> 1 transitions change their contribution
+        leaving = neighbours[neighbour_types == old_type] if old_type != CompactPlacementNetwork.NO_TYPE \
+            else neighbours[:0]
+        joining = neighbours[neighbour_types == type_id] if type_id != CompactPlacementNetwork.NO_TYPE \
+            else neighbours[:0]
+        if old_type == type_id:
+            leaving = joining = neighbours[:0]
+
+        freed = leaving[self._same_type_counts[leaving] == 1]
+        penalized = joining[self._same_type_counts[joining] == 0]
+        delta += float(self._rates[freed].sum()) * penalty
+        delta -= float(self._rates[penalized].sum()) * penalty
+
+        own_same_type_count = int(np.count_nonzero(neighbour_types == type_id)) \
+            if type_id != CompactPlacementNetwork.NO_TYPE else 0
+        new_contribution = 0.0 if type_id == CompactPlacementNetwork.NO_TYPE \
+            else rate * (self._penalty_multiplier if own_same_type_count > 0 else 1.0)
+        delta += new_contribution
+
+        if apply:
+            self._same_type_counts[leaving] -= 1
+            self._same_type_counts[joining] += 1
+            self._contributions[freed] = self._rates[freed]
+            self._contributions[penalized] = self._rates[penalized] * self._penalty_multiplier
+            self._same_type_counts[index] = own_same_type_count
+            self._contributions[index] = new_contribution
+            self._type_ids[index] = type_id
+            self._rates[index] = rate if type_id != CompactPlacementNetwork.NO_TYPE else 0.0
+            self._total_efficiency += delta
+
+        return delta
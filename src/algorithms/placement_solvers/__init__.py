@@ -1,2 +1,9 @@
-from .i_placement_algorithm import IPlacementAlgorithm
-from .adj_pen_placement_algorithm_greedy import AdjPenPlacementAlgorithmGreedy
\ No newline at end of file
+from .i_placement_algorithm import IPlacementAlgorithm, PlacementCallback
+from .improvement_reporter import ImprovementReporter
+from .adj_pen_placement_algorithm_greedy import AdjPenPlacementAlgorithmGreedy
+from .adj_pen_placement_algorithm_local_search import AdjPenPlacementAlgorithmLocalSearch
+from .adj_pen_placement_algorithm_tree_dp import AdjPenPlacementAlgorithmTreeDP
+from .adj_pen_placement_algorithm_annealing import AdjPenPlacementAlgorithmAnnealing
+from .adj_pen_placement_algorithm_dsatur import AdjPenPlacementAlgorithmDSatur
+from .adj_pen_placement_algorithm_best_of import AdjPenPlacementAlgorithmBestOf
+from .adj_pen_placement_algorithm_partitioned import AdjPenPlacementAlgorithmPartitioned
\ No newline at end of file
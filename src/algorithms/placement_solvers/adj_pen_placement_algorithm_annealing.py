@@ -0,0 +1,191 @@
+import math
+import time
+from typing import List, Optional, Tuple
+
+import numpy as np
+
+from algorithms.placement_solvers import IPlacementAlgorithm, PlacementCallback, ImprovementReporter
+from algorithms.placement_solvers.adj_pen_placement_algorithm_best_of import AdjPenPlacementAlgorithmBestOf
+from algorithms.placement_efficiency import AdjPenEfficiencyEngine
+
+from models import PlacementNetwork, PlacementObject, CompactPlacementNetwork
+
+from utils import SpawnProcessPool
+
+
+# Initial temperature accepts an average worsening move with this probability,
+# the final one is this fraction of the initial
+INITIAL_ACCEPTANCE = 0.5
+FINAL_TEMPERATURE_RATIO = 1e-3
+TEMPERATURE_SAMPLES = 200
+CLOCK_CHECK_INTERVAL = 256
+PENALIZED_TRIES = 8
+
+
+def _anneal(network : CompactPlacementNetwork, penalty : float, seed : np.random.SeedSequence,
+            deadline : Optional[float], max_moves : Optional[int]) -> Tuple[float, np.ndarray, np.ndarray]:
+    # One restart: swaps of two points' objects (or relocation to an empty point) scored
+    # with O(deg) engine deltas. Progress towards the deadline or the move limit drives
+    # a geometric cooling schedule; returns the best efficiency, type ids and rates seen
+    rng = np.random.default_rng(seed)
+    engine = AdjPenEfficiencyEngine(network, penalty)
+    type_ids = engine.get_type_ids()
+    rates = engine.get_rates()
+
+    placed = np.flatnonzero(type_ids != CompactPlacementNetwork.NO_TYPE)
+    count = len(type_ids)
+    best = (engine.get_total_efficiency(), type_ids.copy(), rates.copy())
+    if len(placed) == 0 or len(placed) == count and len(np.unique(type_ids)) == 1:
+        return best
+
+    same_type_counts = engine.get_same_type_counts()
+
+    def propose() -> Tuple[int, int, int]:
+        # Mostly moves out of penalized points, the only ones that can improve
+        while True:
+            for _ in range(PENALIZED_TRIES):
+                slot = int(rng.integers(len(placed)))
+                if same_type_counts[placed[slot]] > 0:
+                    break
+            j = int(rng.integers(count))
+            if type_ids[j] != type_ids[placed[slot]]:
+                return slot, int(placed[slot]), j
+
+    def evaluate(i : int, j : int) -> Tuple[float, int, float, int, float]:
+        type_i, rate_i, type_j, rate_j = int(type_ids[i]), float(rates[i]), int(type_ids[j]), float(rates[j])
+        delta = engine.apply_change(i, type_j, rate_j) + engine.get_change_delta(j, type_i, rate_i)
+        return delta, type_i, rate_i, type_j, rate_j
+
+    worsening = []
+    for _ in range(TEMPERATURE_SAMPLES):
+        _, i, j = propose()
+        delta, type_i, rate_i, _, _ = evaluate(i, j)
+        engine.apply_change(i, type_i, rate_i)
+        if delta < 0:
+            worsening.append(-delta)
+    initial_temperature = (np.mean(worsening) if worsening else 1.0) / -math.log(INITIAL_ACCEPTANCE)
+
+    started = time.time()
+    temperature = initial_temperature
+    moves = 0
+    while True:
+        if moves % CLOCK_CHECK_INTERVAL == 0:
+            progress = 0.0
+            if deadline is not None:
+                progress = max(progress, (time.time() - started) / max(deadline - started, 1e-9))
+            if max_moves is not None:
+                progress = max(progress, moves / max(max_moves, 1))
+            if progress >= 1.0:
+                break
+            temperature = initial_temperature * FINAL_TEMPERATURE_RATIO ** progress
+        moves += 1
+
+        slot, i, j = propose()
+        delta, type_i, rate_i, type_j, _ = evaluate(i, j)
+        if delta >= 0 or rng.random() < math.exp(delta / temperature):
+            engine.apply_change(j, type_i, rate_i)
+            if type_j == CompactPlacementNetwork.NO_TYPE:
+                placed[slot] = j
+            if engine.get_total_efficiency() > best[0]:
+                best = (engine.get_total_efficiency(), type_ids.copy(), rates.copy())
+        else:
+            engine.apply_change(i, type_i, rate_i)
+
+    return best
+
+
+class AdjPenPlacementAlgorithmAnnealing(IPlacementAlgorithm):
+    # Multi-start simulated annealing from the better of the DSatur and greedy placements:
+    # every restart gets its own seed from one SeedSequence and runs in a worker process
+    # on a pickled CompactPlacementNetwork, the best restart wins (the lowest index on
+    # ties). Restarts keep the best placement they see, so the result is never worse than
+    # the start. With max_moves and no time budget the result depends on the seed only
+    def __init__(self, penalty : float = 0.5,
+                 time_budget_s : Optional[float] = 5.0,
+                 max_moves : Optional[int] = None,
+                 restarts : Optional[int] = None,
+                 workers : Optional[int] = None,
+                 seed : Optional[int] = None,
+                 initial_algorithm : Optional[IPlacementAlgorithm] = None):
+        if time_budget_s is None and max_moves is None:
+            raise ValueError("Either a time budget or a move limit is required.")
+
+        self._penalty = penalty
+        self._time_budget_s = time_budget_s
+        self._max_moves = max_moves
+        self._pool = SpawnProcessPool(workers)
+        self._restarts = restarts if restarts is not None else self._pool.get_workers()
+        self._seed = seed
+        self._initial_algorithm = initial_algorithm
+        self._restart_efficiencies : List[float] = []
+
+    def get_penalty(self) -> float:
+        return self._penalty
+
+    def set_penalty(self, penalty : float) -> None:
+        self._penalty = penalty
+
+    def get_time_budget(self) -> Optional[float]:
+        return self._time_budget_s
+
+    def set_time_budget(self, time_budget_s : Optional[float]) -> None:
+        self._time_budget_s = time_budget_s
+
+    def get_workers(self) -> int:
+        return self._pool.get_workers()
+
+    def set_workers(self, workers : int) -> None:
+        self._pool.set_workers(workers)
+
+    def get_restart_efficiencies(self) -> List[float]:
+        # Best efficiency of every restart of the last run, in seed order
+        return self._restart_efficiencies
+
+    def compute_placement(self, pnetwork : PlacementNetwork,
+                          to_place : List[PlacementObject]) -> PlacementNetwork:
+        return self._compute(pnetwork, to_place, self._time_budget_s, ImprovementReporter(None))
+
+    def compute_placement_anytime(self, pnetwork : PlacementNetwork,
+                                  to_place : List[PlacementObject],
+                                  on_improvement : PlacementCallback,
+                                  time_budget_s : Optional[float] = None) -> PlacementNetwork:
+        # Restarts run in other processes, so the start placement and the best restart
+        # are the interim results
+        return self._compute(pnetwork, to_place, time_budget_s if time_budget_s is not None else self._time_budget_s,
+                             ImprovementReporter(on_improvement))
+
+    def _compute(self, pnetwork : PlacementNetwork, to_place : List[PlacementObject],
+                 time_budget_s : Optional[float], reporter : ImprovementReporter) -> PlacementNetwork:
+        started = time.time()
+        deadline = None if time_budget_s is None else started + time_budget_s
+
+        start_rn = AdjPenPlacementAlgorithmBestOf.get_or_create(self._initial_algorithm,
+                                                                self._penalty).compute_placement(pnetwork, to_place)
+        network = CompactPlacementNetwork.from_placement_network(start_rn)
+        start_engine = AdjPenEfficiencyEngine(network.copy(), self._penalty)
+        reporter.report(start_engine.get_total_efficiency(), lambda: start_engine.write_to_network().apply_to(start_rn),
+                        force=True)
+        seeds = np.random.SeedSequence(self._seed).spawn(self._restarts)
+
+        if self._pool.get_workers() <= 1 or self._restarts <= 1:
+            results = [_anneal(network.copy(), self._penalty, seed, deadline, self._max_moves) for seed in seeds]
+        else:
+            executor = self._pool.get_executor()
+            futures = [executor.submit(_anneal, network, self._penalty, seed, deadline, self._max_moves)
+                       for seed in seeds]
+            results = [future.result() for future in futures]
+
+        self._restart_efficiencies = [efficiency for efficiency, _, _ in results]
+        efficiency, type_ids, rates = results[int(np.argmax(self._restart_efficiencies))]
+
+        print(f"AdjPenPlacementAlgorithmAnnealing: {len(results)} restarts, best efficiency {efficiency:.4f} "
+              f"in {time.time() - started:.2f}s")
+
+        network.get_type_ids()[:] = type_ids
+        network.get_independent_rates()[:] = np.where(type_ids != CompactPlacementNetwork.NO_TYPE, rates, np.nan)
+        result_rn = AdjPenEfficiencyEngine(network, self._penalty).write_to_network().apply_to(start_rn)
+        reporter.report(efficiency, lambda: result_rn, force=True)
+        return result_rn
+
+    def close(self) -> None:
+        self._pool.shutdown()
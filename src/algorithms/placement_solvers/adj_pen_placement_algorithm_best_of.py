@@ -0,0 +1,45 @@
+from typing import List, Optional
+
+from algorithms.placement_solvers import IPlacementAlgorithm
+from algorithms.placement_solvers.adj_pen_placement_algorithm_greedy import AdjPenPlacementAlgorithmGreedy
+from algorithms.placement_solvers.adj_pen_placement_algorithm_dsatur import AdjPenPlacementAlgorithmDSatur
+from algorithms.placement_efficiency import AdjPenEfficiencyEngine
+
+from models import PlacementNetwork, PlacementObject, CompactPlacementNetwork
+
+class AdjPenPlacementAlgorithmBestOf(IPlacementAlgorithm):
+    # Runs every algorithm and keeps the most efficient placement, the first one on ties
+    def __init__(self, algorithms : List[IPlacementAlgorithm], penalty : float = 0.5):
+        if not algorithms:
+            raise ValueError("At least one placement algorithm is required.")
+
+        self._algorithms = algorithms
+        self._penalty = penalty
+
+    @classmethod
+    def get_or_create(cls, algorithm : Optional[IPlacementAlgorithm], penalty : float) -> IPlacementAlgorithm:
+        # Solvers that start from (or fall back to) another placement default to the better
+        # of DSatur and greedy: DSatur wins on sparse or partly filled networks, greedy on
+        # some dense full ones
+        return algorithm if algorithm is not None \
+            else cls([AdjPenPlacementAlgorithmDSatur(penalty), AdjPenPlacementAlgorithmGreedy(penalty)], penalty)
+
+    def get_algorithms(self) -> List[IPlacementAlgorithm]:
+        return self._algorithms
+
+    def get_penalty(self) -> float:
+        return self._penalty
+
+    def set_penalty(self, penalty : float) -> None:
+        self._penalty = penalty
+
+    def compute_placement(self, pnetwork : PlacementNetwork,
+                          to_place : List[PlacementObject]) -> PlacementNetwork:
+        best_rn, best_efficiency = None, None
+        for algorithm in self._algorithms:
+            result_rn = algorithm.compute_placement(pnetwork, to_place)
+            efficiency = AdjPenEfficiencyEngine(CompactPlacementNetwork.from_placement_network(result_rn),
+                                                self._penalty).get_total_efficiency()
+            if best_efficiency is None or efficiency > best_efficiency:
+                best_rn, best_efficiency = result_rn, efficiency
+        return best_rn
@@ -0,0 +1,102 @@
+from typing import List
+import heapq
+
+import numpy as np
+
+from algorithms.placement_solvers import IPlacementAlgorithm
+
+from models import PlacementNetwork, PlacementObject, CompactPlacementNetwork
+
+class AdjPenPlacementAlgorithmDSatur(IPlacementAlgorithm):
+    # Equitable-coloring view of the penalty model: points are visited by saturation
+    # (distinct object types among placed neighbours, then degree) from a lazy heap, so
+    # the most constrained points are placed while they still have a conflict-free type.
+    # Each point takes the type losing the least efficiency (its own penalty plus the
+    # penalty it puts on untouched neighbours), preferring the largest remaining quota;
+    # empty slots are spent only where every remaining type would conflict.
+    # Every saturation increase pushes a fresh heap entry and leaves the old one to be
+    # skipped as stale, so a placement costs O(deg log n) and a run O((n + m) log n).
+    # Like the tree DP, the placement starts from an empty network: objects already
+    # placed are replaced by to_place
+    def __init__(self, penalty : float = 0.5):
+        self._penalty = penalty
+
+    def get_penalty(self) -> float:
+        return self._penalty
+
+    def set_penalty(self, penalty : float) -> None:
+        self._penalty = penalty
+
+    def compute_placement(self, pnetwork : PlacementNetwork,
+                          to_place : List[PlacementObject]) -> PlacementNetwork:
+        network = CompactPlacementNetwork.from_placement_network(pnetwork)
+        count = network.get_node_count()
+        type_ids = network.get_type_ids()
+        independent_rates = network.get_independent_rates()
+        context_rates = network.get_context_rates()
+        indptr, indices = network.get_adjacency()
+        degrees = network.get_degrees()
+
+        type_ids[:] = CompactPlacementNetwork.NO_TYPE
+        independent_rates[:] = np.nan
+        context_rates[:] = np.nan
+
+        objects_to_place = self._construct_placement_objects_dict(to_place)
+        objects = list(objects_to_place)
+        object_type_ids = np.array([network.get_type_id(obj.get_name()) for obj in objects], dtype=np.int32)
+        object_rates = np.array([obj.get_independent_contribution_rate() for obj in objects], dtype=np.float64)
+        remaining = np.array([objects_to_place[obj] for obj in objects], dtype=np.int64)
+        empty_slots = count - int(remaining.sum())
+
+        # neighbour_type_counts[i, k]: placed neighbours of i holding objects[k]
+        neighbour_type_counts = np.zeros((count, len(objects)), dtype=np.int32)
+        object_index = np.full(count, -1, dtype=np.int64)
+        same_type_counts = np.zeros(count, dtype=np.int32)
+        saturation = np.zeros(count, dtype=np.int64)
+        visited = np.zeros(count, dtype=bool)
+
+        heap = [(0, -int(degree), node) for node, degree in enumerate(degrees.tolist())]
+        heapq.heapify(heap)
+
+        while heap and remaining.any():
+            key, _, node = heapq.heappop(heap)
+            if visited[node] or -key != saturation[node]:
+                continue
+            visited[node] = True
+
+            neighbours = indices[indptr[node]:indptr[node + 1]]
+            placed = neighbours[object_index[neighbours] >= 0]
+            untouched = placed[same_type_counts[placed] == 0]
+            imposed = np.bincount(object_index[untouched], weights=object_rates[object_index[untouched]],
+                                  minlength=len(objects))
+
+            conflicts = neighbour_type_counts[node] > 0
+            losses = np.where(conflicts, object_rates * self._penalty, 0.0) + self._penalty * imposed
+            losses = np.where(remaining > 0, losses, np.inf)
+
+            best_loss = losses.min()
+            if best_loss > 0 and empty_slots > 0:
+                empty_slots -= 1
+                continue
+
+            candidates = np.flatnonzero(losses == best_loss)
+            best = int(candidates[np.argmax(remaining[candidates])])
+
+            same = placed[object_index[placed] == best]
+            same_type_counts[same] += 1
+            same_type_counts[node] = len(same)
+            object_index[node] = best
+            remaining[best] -= 1
+
+            context_rate = objects[best].get_context_contribution_rate()
+            type_ids[node] = object_type_ids[best]
+            independent_rates[node] = object_rates[best]
+            context_rates[node] = np.nan if context_rate is None else context_rate
+
+            for neighbour in neighbours[~visited[neighbours]].tolist():
+                if neighbour_type_counts[neighbour, best] == 0:
+                    saturation[neighbour] += 1
+                    heapq.heappush(heap, (-int(saturation[neighbour]), -int(degrees[neighbour]), neighbour))
+                neighbour_type_counts[neighbour, best] += 1
+
+        return network.apply_to(pnetwork)
@@ -1,9 +1,10 @@
-from typing import List, Dict
-from copy import deepcopy
+from typing import List
+
+import numpy as np
 
 from algorithms.placement_solvers import IPlacementAlgorithm
 
-from models import PlacementNetwork, PlacementObject
+from models import PlacementNetwork, PlacementObject, CompactPlacementNetwork
 
 class AdjPenPlacementAlgorithmGreedy(IPlacementAlgorithm):
     def __init__(self, penalty: float = 0.5):
@@ -19,48 +20,44 @@ class AdjPenPlacementAlgorithmGreedy(IPlacementAlgorithm):
                           to_place : List[PlacementObject]) -> PlacementNetwork:
         penalty_multiplier = 1.0 - self._penalty
 
-        result_rn = deepcopy(pnetwork)
+        network = CompactPlacementNetwork.from_placement_network(pnetwork)
+        type_ids = network.get_type_ids()
+        independent_rates = network.get_independent_rates()
+        context_rates = network.get_context_rates()
+        indptr, indices = network.get_adjacency()
 
-        sorted_nodes = sorted(deepcopy(pnetwork.get_graph().nodes(data=False)),
-                              key=lambda node_id: pnetwork.get_graph().degree(node_id))
         objects_to_place = self._construct_placement_objects_dict(to_place)
-
-        for node_id in sorted_nodes:
-            adjacent_nodes = list(result_rn.get_graph().adj[node_id])
-            
-            max_context_contribution = -1
-            max_context_contribution_object = None
-            for object, count in objects_to_place.items():
-                if count == 0:
-                    continue
-
-                has_adjacent_same_type_object = any(
-                    ((object == result_rn.get_placement_point_data(adj_node_id).get_object()) if \
-                      result_rn.get_placement_point_data(adj_node_id).get_object() is not None else False) \
-                        for adj_node_id in adjacent_nodes
-                )
-
-                potential_context_contribution = object.get_independent_contribution_rate() * \
-                    (penalty_multiplier if has_adjacent_same_type_object else 1.0)
-                
-                if potential_context_contribution > max_context_contribution:
-                    max_context_contribution = potential_context_contribution
-                    max_context_contribution_object = object
-
-            result_rn.get_placement_point_data(node_id).set_object(
-                deepcopy(max_context_contribution_object)
-            )
-
-            objects_to_place[max_context_contribution_object] -= 1
-            if objects_to_place[max_context_contribution_object] == 0:
-                del objects_to_place[max_context_contribution_object]
-
-        return result_rn
-
-    def _construct_placement_objects_dict(self, to_place: List[PlacementObject]) -> Dict[PlacementObject, int]:
-        placement_objects_dict = {}
-        for obj in to_place:
-            if obj not in placement_objects_dict:
-                placement_objects_dict[obj] = 0
-            placement_objects_dict[obj] += 1
-        return placement_objects_dict
\ No newline at end of file
+        objects = list(objects_to_place)
+        object_type_ids = np.array([network.get_type_id(obj.get_name()) for obj in objects], dtype=np.int32)
+        object_rates = np.array([obj.get_independent_contribution_rate() for obj in objects], dtype=np.float64)
+        remaining = np.array([objects_to_place[obj] for obj in objects], dtype=np.int64)
+
+        # neighbour_type_counts[i, t]: neighbours of i currently holding type t (the last
+        # column counts empty neighbours), kept up to date on every assignment so the
+        # same-type check is a single lookup
+        type_count = len(network.get_type_names())
+        neighbour_type_counts = np.zeros((network.get_node_count(), type_count + 1), dtype=np.int32)
+        sources = np.repeat(np.arange(network.get_node_count()), np.diff(indptr))
+        np.add.at(neighbour_type_counts, (sources, type_ids[indices]), 1)
+
+        for node in np.argsort(network.get_degrees(), kind="stable").tolist():
+            has_adjacent_same_type_object = neighbour_type_counts[node, object_type_ids] > 0
+            potential_context_contribution = np.where(remaining > 0,
+                                                      object_rates * np.where(has_adjacent_same_type_object,
+                                                                              penalty_multiplier, 1.0),
+                                                      -np.inf)
+            best = int(np.argmax(potential_context_contribution))
+            if remaining[best] == 0:
+                break
+
+            neighbours = indices[indptr[node]:indptr[node + 1]]
+            neighbour_type_counts[neighbours, type_ids[node]] -= 1
+            neighbour_type_counts[neighbours, object_type_ids[best]] += 1
+
+            context_rate = objects[best].get_context_contribution_rate()
+            type_ids[node] = object_type_ids[best]
+            independent_rates[node] = object_rates[best]
+            context_rates[node] = np.nan if context_rate is None else context_rate
+            remaining[best] -= 1
+
+        return network.apply_to(pnetwork)
\ No newline at end of file
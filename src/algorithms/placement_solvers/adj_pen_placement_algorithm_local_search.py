@@ -0,0 +1,195 @@
+from typing import List, Optional, Tuple
+from collections import Counter
+import time
+
+import numpy as np
+
+from algorithms.placement_solvers import IPlacementAlgorithm, PlacementCallback, ImprovementReporter
+from algorithms.placement_solvers.adj_pen_placement_algorithm_best_of import AdjPenPlacementAlgorithmBestOf
+from algorithms.placement_efficiency import AdjPenEfficiencyEngine
+
+from models import PlacementNetwork, PlacementObject, CompactPlacementNetwork
+
+class AdjPenPlacementAlgorithmLocalSearch(IPlacementAlgorithm):
+    # Improves a start placement (the better of DSatur and greedy by default) with
+    # first-improvement moves of penalized points' objects, the only moves that can raise
+    # the efficiency: a swap with (or relocation to) one of the point's neighbours or of a
+    # random sample of points. A pass without improvement doubles the sample, so the
+    # search ends with a pass over every point, at a local optimum
+    IMPROVEMENT_EPS = 1e-12
+    # Points sampled per move in the first passes, besides the neighbours of the moved point
+    MOVE_CANDIDATES = 64
+
+    def __init__(self, penalty : float = 0.5,
+                 time_budget_s : Optional[float] = 5.0,
+                 initial_algorithm : Optional[IPlacementAlgorithm] = None,
+                 start_from_existing : bool = False,
+                 seed : Optional[int] = None):
+        self._penalty = penalty
+        self._time_budget_s = time_budget_s
+        self._initial_algorithm = initial_algorithm
+        self._start_from_existing = start_from_existing
+        self._seed = seed
+        self._trajectory : List[Tuple[float, float]] = []
+
+    def get_penalty(self) -> float:
+        return self._penalty
+
+    def set_penalty(self, penalty : float) -> None:
+        self._penalty = penalty
+
+    def get_time_budget(self) -> Optional[float]:
+        return self._time_budget_s
+
+    def set_time_budget(self, time_budget_s : Optional[float]) -> None:
+        self._time_budget_s = time_budget_s
+
+    def get_trajectory(self) -> List[Tuple[float, float]]:
+        # (seconds since start, total efficiency) at the start and after every improving move
+        return self._trajectory
+
+    def compute_placement(self, pnetwork : PlacementNetwork,
+                          to_place : List[PlacementObject]) -> PlacementNetwork:
+        return self._compute(pnetwork, to_place, self._time_budget_s, ImprovementReporter(None))
+
+    def compute_placement_anytime(self, pnetwork : PlacementNetwork,
+                                  to_place : List[PlacementObject],
+                                  on_improvement : PlacementCallback,
+                                  time_budget_s : Optional[float] = None) -> PlacementNetwork:
+        return self._compute(pnetwork, to_place, time_budget_s if time_budget_s is not None else self._time_budget_s,
+                             ImprovementReporter(on_improvement))
+
+    def _compute(self, pnetwork : PlacementNetwork, to_place : List[PlacementObject],
+                 time_budget_s : Optional[float], reporter : ImprovementReporter) -> PlacementNetwork:
+        started = time.perf_counter()
+        deadline = None if time_budget_s is None else started + time_budget_s
+
+        start_rn = pnetwork if self._can_start_from(pnetwork, to_place) \
+            else AdjPenPlacementAlgorithmBestOf.get_or_create(self._initial_algorithm,
+                                                              self._penalty).compute_placement(pnetwork, to_place)
+
+        engine = AdjPenEfficiencyEngine(CompactPlacementNetwork.from_placement_network(start_rn), self._penalty)
+        self._trajectory = [(time.perf_counter() - started, engine.get_total_efficiency())]
+        build = lambda: engine.write_to_network().apply_to(start_rn)
+        reporter.report(engine.get_total_efficiency(), build, force=True)
+
+        rng = np.random.default_rng(self._seed)
+        moves = 0
+        samples = self.MOVE_CANDIDATES
+        while deadline is None or time.perf_counter() < deadline:
+            improved = self._run_pass(engine, rng, deadline, samples)
+            if improved:
+                moves += improved
+                self._trajectory.append((time.perf_counter() - started, engine.get_total_efficiency()))
+                reporter.report(engine.get_total_efficiency(), build)
+            elif samples < len(engine.get_type_ids()):
+                samples *= 2
+            else:
+                break
+
+        print(f"AdjPenPlacementAlgorithmLocalSearch: {moves} moves, efficiency "
+              f"{self._trajectory[0][1]:.4f} -> {engine.get_total_efficiency():.4f} "
+              f"in {time.perf_counter() - started:.2f}s")
+
+        result_rn = build()
+        reporter.report(engine.get_total_efficiency(), lambda: result_rn, force=True)
+        return result_rn
+
+    def improve(self, engine : AdjPenEfficiencyEngine, nodes : Optional[np.ndarray] = None,
+                deadline : Optional[float] = None) -> int:
+        # Passes over an existing engine until a local optimum or the deadline; with nodes
+        # given, only moves out of those points are tried. Returns the number of moves
+        rng = np.random.default_rng(self._seed)
+        focus = None
+        if nodes is not None:
+            focus = np.zeros(len(engine.get_type_ids()), dtype=bool)
+            focus[nodes] = True
+
+        moves = 0
+        samples = self.MOVE_CANDIDATES
+        while deadline is None or time.perf_counter() < deadline:
+            improved = self._run_pass(engine, rng, deadline, samples, focus)
+            if improved:
+                moves += improved
+            elif samples < len(engine.get_type_ids()):
+                samples *= 2
+            else:
+                break
+        return moves
+
+    def _run_pass(self, engine : AdjPenEfficiencyEngine, rng : np.random.Generator,
+                  deadline : Optional[float], samples : int, focus : Optional[np.ndarray] = None) -> int:
+        type_ids = engine.get_type_ids()
+        improved = 0
+
+        penalized = np.flatnonzero((engine.get_same_type_counts() > 0) &
+                                   (type_ids != CompactPlacementNetwork.NO_TYPE))
+        if focus is not None:
+            penalized = penalized[focus[penalized]]
+        for i in rng.permutation(penalized).tolist():
+            if deadline is not None and time.perf_counter() >= deadline:
+                break
+            if engine.get_same_type_counts()[i] == 0:
+                continue
+
+            if self._try_moves(engine, rng, i, samples):
+                improved += 1
+
+        return improved
+
+    def _try_moves(self, engine : AdjPenEfficiencyEngine, rng : np.random.Generator, i : int, samples : int) -> bool:
+        # Swaps (or relocations to an empty point) of i's object with i's neighbours and
+        # `samples` random points, every point once samples reaches the point count, tried
+        # until one improves. Both halves of a swap are scored independently in O(deg) per
+        # candidate, which is exact unless the two points share a neighbour; i's own
+        # neighbours and the candidates with a positive estimate get the exact delta
+        type_ids = engine.get_type_ids()
+        rates = engine.get_rates()
+        indptr, indices = engine.get_network().get_adjacency()
+        count = len(type_ids)
+        type_i, rate_i = int(type_ids[i]), float(rates[i])
+
+        neighbours = indices[indptr[i]:indptr[i + 1]]
+        sampled = np.arange(count) if samples >= count else rng.integers(count, size=samples)
+        candidates = np.unique(np.concatenate((neighbours, sampled)))
+        candidates = candidates[type_ids[candidates] != type_i]
+        if len(candidates) == 0:
+            return False
+
+        # j receives i's object, i receives j's; the latter depends on j's object only
+        gains = engine.get_change_deltas(type_i, rate_i, candidates)
+        objects, inverse = np.unique(np.column_stack((type_ids[candidates], rates[candidates])), axis=0,
+                                     return_inverse=True)
+        gains += np.array([engine.get_change_delta(i, int(type_j), float(rate_j))
+                           for type_j, rate_j in objects])[inverse.ravel()]
+
+        adjacent = np.isin(candidates, neighbours)
+        order = np.argsort(-gains, kind="stable")
+        for j in candidates[order[(gains[order] > self.IMPROVEMENT_EPS) | adjacent[order]]].tolist():
+            if self._try_move(engine, i, j, type_i, rate_i, int(type_ids[j]), float(rates[j])):
+                return True
+        return False
+
+    def _try_move(self, engine : AdjPenEfficiencyEngine, i : int, j : int,
+                  type_i : int, rate_i : float, type_j : int, rate_j : float) -> bool:
+        # Swap (or relocation when j is empty) scored as two O(deg) deltas; the first
+        # change is applied tentatively so the second sees its effect on shared neighbours
+        first = engine.apply_change(i, type_j, rate_j)
+        second = engine.get_change_delta(j, type_i, rate_i)
+        if first + second > self.IMPROVEMENT_EPS:
+            engine.apply_change(j, type_i, rate_i)
+            return True
+
+        engine.apply_change(i, type_i, rate_i)
+        return False
+
+    def _can_start_from(self, pnetwork : PlacementNetwork, to_place : List[PlacementObject]) -> bool:
+        if not self._start_from_existing:
+            return False
+
+        placed = Counter()
+        for node_id in pnetwork.get_graph().nodes():
+            ppoint = pnetwork.get_placement_point_data(node_id)
+            if ppoint is not None and ppoint.get_object() is not None:
+                placed[ppoint.get_object().get_name()] += 1
+        return placed == Counter(obj.get_name() for obj in to_place)
@@ -0,0 +1,217 @@
+import time
+from typing import List, Optional, Tuple
+
+import numpy as np
+from scipy.sparse import csr_matrix
+from scipy.sparse.csgraph import connected_components, laplacian
+from scipy.sparse.linalg import ArpackError, ArpackNoConvergence, eigsh
+
+from algorithms.placement_solvers import IPlacementAlgorithm
+from algorithms.placement_solvers.adj_pen_placement_algorithm_dsatur import AdjPenPlacementAlgorithmDSatur
+from algorithms.placement_solvers.adj_pen_placement_algorithm_local_search import AdjPenPlacementAlgorithmLocalSearch
+from algorithms.placement_efficiency import AdjPenEfficiencyEngine
+
+from models import PlacementNetwork, PlacementObject, CompactPlacementNetwork
+
+from utils import SpawnProcessPool
+
+
+def _solve_region(region : CompactPlacementNetwork, algorithm : IPlacementAlgorithm,
+                  to_place : List[PlacementObject]) -> Tuple[np.ndarray, List[str], np.ndarray, np.ndarray]:
+    result = CompactPlacementNetwork.from_placement_network(
+        algorithm.compute_placement(region.to_placement_network(), to_place))
+    return result.get_node_ids(), result.get_type_names(), result.get_type_ids(), result.get_independent_rates()
+
+
+class AdjPenPlacementAlgorithmPartitioned(IPlacementAlgorithm):
+    # Splits the network into connected components and those into regions of at most
+    # region_size points by recursive spectral bisection (balanced halves with few cut
+    # links), allocates every type to the regions in proportion to their size and solves
+    # the regions with the inner algorithm in worker processes. Only the points on cut
+    # links are revisited afterwards, by the local search. With a seed (and a
+    # deterministic inner algorithm) the result does not depend on the worker count
+
+    # Shift-inverted Lanczos just below the zero eigenvalue of the Laplacian; the shift must
+    # stay under the Fiedler value of tree-like regions (~10 / n^2) to separate the two
+    FIEDLER_SHIFT = 1e-8
+
+    def __init__(self, penalty : float = 0.5,
+                 region_size : int = 5000,
+                 workers : Optional[int] = None,
+                 inner_algorithm : Optional[IPlacementAlgorithm] = None,
+                 boundary_time_budget_s : Optional[float] = 5.0,
+                 seed : Optional[int] = None):
+        self._penalty = penalty
+        self._region_size = region_size
+        self._pool = SpawnProcessPool(workers)
+        self._inner_algorithm = inner_algorithm
+        self._boundary_time_budget_s = boundary_time_budget_s
+        self._seed = seed
+
+    def get_penalty(self) -> float:
+        return self._penalty
+
+    def set_penalty(self, penalty : float) -> None:
+        self._penalty = penalty
+
+    def get_region_size(self) -> int:
+        return self._region_size
+
+    def set_region_size(self, region_size : int) -> None:
+        self._region_size = region_size
+
+    def get_workers(self) -> int:
+        return self._pool.get_workers()
+
+    def set_workers(self, workers : int) -> None:
+        self._pool.set_workers(workers)
+
+    def compute_placement(self, pnetwork : PlacementNetwork,
+                          to_place : List[PlacementObject]) -> PlacementNetwork:
+        started = time.perf_counter()
+
+        network = CompactPlacementNetwork.from_placement_network(pnetwork)
+        regions = self._get_regions(network)
+        if len(regions) <= 1 or len(to_place) > network.get_node_count():
+            return self._get_inner_algorithm().compute_placement(pnetwork, to_place)
+
+        objects_to_place = self._construct_placement_objects_dict(to_place)
+        objects = list(objects_to_place)
+        quotas = self._allocate_quotas(np.array([len(region) for region in regions]),
+                                       np.array([objects_to_place[obj] for obj in objects], dtype=np.int64))
+
+        algorithm = self._get_inner_algorithm()
+        tasks = [(network.get_subnetwork(region),
+                  [obj for obj, quota in zip(objects, region_quotas.tolist()) for _ in range(quota)])
+                 for region, region_quotas in zip(regions, quotas)]
+
+        if self._pool.get_workers() <= 1:
+            results = [_solve_region(region, algorithm, region_objects) for region, region_objects in tasks]
+        else:
+            executor = self._pool.get_executor()
+            futures = [executor.submit(_solve_region, region, algorithm, region_objects)
+                       for region, region_objects in tasks]
+            results = [future.result() for future in futures]
+
+        type_ids = network.get_type_ids()
+        independent_rates = network.get_independent_rates()
+        type_ids[:] = CompactPlacementNetwork.NO_TYPE
+        independent_rates[:] = np.nan
+        for node_ids, type_names, region_type_ids, region_rates in results:
+            # NO_TYPE (-1) picks the trailing entry
+            lookup = np.array([network.get_type_id(name) for name in type_names] +
+                              [CompactPlacementNetwork.NO_TYPE], dtype=np.int32)
+            rows = np.array([network.get_node_index(node_id) for node_id in node_ids.tolist()], dtype=np.int64)
+            type_ids[rows] = lookup[region_type_ids]
+            independent_rates[rows] = region_rates
+        solved = time.perf_counter()
+
+        engine = AdjPenEfficiencyEngine(network, self._penalty)
+        before = engine.get_total_efficiency()
+        boundary = self._get_boundary_nodes(network, regions)
+        deadline = None if self._boundary_time_budget_s is None else solved + self._boundary_time_budget_s
+        boundary_seed = int(np.random.SeedSequence(self._seed).generate_state(1)[0])
+        moves = AdjPenPlacementAlgorithmLocalSearch(self._penalty, seed=boundary_seed).improve(engine, boundary,
+                                                                                              deadline)
+
+        print(f"AdjPenPlacementAlgorithmPartitioned: {len(regions)} regions solved in {solved - started:.2f}s, "
+              f"{moves} boundary moves over {len(boundary)} points, efficiency {before:.4f} -> "
+              f"{engine.get_total_efficiency():.4f} in {time.perf_counter() - started:.2f}s")
+
+        return engine.write_to_network().apply_to(pnetwork)
+
+    def close(self) -> None:
+        self._pool.shutdown()
+
+    def _get_regions(self, network : CompactPlacementNetwork) -> List[np.ndarray]:
+        count = network.get_node_count()
+        indptr, indices = network.get_adjacency()
+        adjacency = csr_matrix((np.ones(len(indices)), indices, indptr), shape=(count, count))
+        return self._split(network, adjacency, np.arange(count))
+
+    def _split(self, network : CompactPlacementNetwork, adjacency : csr_matrix,
+               nodes : np.ndarray) -> List[np.ndarray]:
+        # Components above region_size are bisected, smaller ones are packed together
+        _, labels = connected_components(adjacency[nodes][:, nodes], directed=False)
+
+        by_component = np.argsort(labels, kind="stable")
+        components = np.split(nodes[by_component], np.flatnonzero(np.diff(labels[by_component])) + 1)
+
+        regions, packed = [], []
+        packed_size = 0
+        for component in sorted(components, key=len, reverse=True):
+            if len(component) > self._region_size:
+                regions.extend(self._bisect(network, adjacency, component))
+                continue
+            if packed_size + len(component) > self._region_size:
+                regions.append(np.concatenate(packed))
+                packed, packed_size = [], 0
+            packed.append(component)
+            packed_size += len(component)
+        if packed:
+            regions.append(np.concatenate(packed))
+
+        return regions
+
+    def _bisect(self, network : CompactPlacementNetwork, adjacency : csr_matrix,
+                nodes : np.ndarray) -> List[np.ndarray]:
+        # Splits a connected component at the median of its Fiedler vector, the spectral
+        # relaxation of the minimum balanced cut. Uneven part counts split in proportion,
+        # so every leaf ends up near region_size
+        parts = -(-len(nodes) // self._region_size)
+        left_parts = parts // 2
+        split = len(nodes) * left_parts // parts
+
+        order = np.argsort(self._get_split_values(network, adjacency, nodes), kind="stable")
+        return self._split(network, adjacency, nodes[order[:split]]) + \
+            self._split(network, adjacency, nodes[order[split:]])
+
+    def _get_split_values(self, network : CompactPlacementNetwork, adjacency : csr_matrix,
+                          nodes : np.ndarray) -> np.ndarray:
+        try:
+            # Fixed start vector, so the same network always gets the same regions
+            values, vectors = eigsh(laplacian(adjacency[nodes][:, nodes]).tocsc(), k=2, sigma=-self.FIEDLER_SHIFT,
+                                    which="LM", v0=np.random.default_rng(0).random(len(nodes)))
+            return vectors[:, int(np.argmax(values))]
+        except (ArpackError, ArpackNoConvergence, RuntimeError) as e:
+            print(f"AdjPenPlacementAlgorithmPartitioned: no Fiedler vector ({e}), splitting by coordinates")
+
+        lats = network.get_lats()[nodes]
+        lons = network.get_lons()[nodes] * np.cos(np.radians(np.mean(lats)))
+        return lons if np.ptp(lons) >= np.ptp(lats) else lats
+
+    def _allocate_quotas(self, sizes : np.ndarray, counts : np.ndarray) -> np.ndarray:
+        # Largest-remainder apportionment of every type by region size, then units moved
+        # out of regions holding more objects than points
+        shares = np.outer(sizes / sizes.sum(), counts)
+        quotas = np.floor(shares).astype(np.int64)
+        fractions = shares - quotas
+        for k in range(len(counts)):
+            missing = int(counts[k] - quotas[:, k].sum())
+            quotas[np.argsort(-fractions[:, k], kind="stable")[:missing], k] += 1
+
+        while True:
+            overflow = quotas.sum(axis=1) - sizes
+            over = np.flatnonzero(overflow > 0)
+            if len(over) == 0:
+                return quotas
+            source = int(over[0])
+            k = int(np.argmax(quotas[source]))
+            spare = np.flatnonzero(overflow < 0)
+            target = int(spare[np.argmax(fractions[spare, k])])
+            quotas[source, k] -= 1
+            quotas[target, k] += 1
+            fractions[target, k] = -np.inf
+
+    def _get_boundary_nodes(self, network : CompactPlacementNetwork, regions : List[np.ndarray]) -> np.ndarray:
+        region_of = np.empty(network.get_node_count(), dtype=np.int64)
+        for r, region in enumerate(regions):
+            region_of[region] = r
+        indptr, indices = network.get_adjacency()
+        sources = np.repeat(np.arange(network.get_node_count()), np.diff(indptr))
+        return np.unique(sources[region_of[sources] != region_of[indices]])
+
+    def _get_inner_algorithm(self) -> IPlacementAlgorithm:
+        if self._inner_algorithm is not None:
+            return self._inner_algorithm
+        return AdjPenPlacementAlgorithmDSatur(self._penalty)
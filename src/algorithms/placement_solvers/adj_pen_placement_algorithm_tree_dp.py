@@ -0,0 +1,331 @@
+from typing import List, Optional, Tuple
+import time
+
+import numpy as np
+from scipy.sparse import csr_matrix
+from scipy.sparse.csgraph import breadth_first_order, connected_components
+
+from algorithms.placement_solvers import IPlacementAlgorithm, PlacementCallback, ImprovementReporter
+from algorithms.placement_solvers.adj_pen_placement_algorithm_best_of import AdjPenPlacementAlgorithmBestOf
+from algorithms.placement_solvers.adj_pen_placement_algorithm_local_search import AdjPenPlacementAlgorithmLocalSearch
+from algorithms.placement_efficiency import AdjPenEfficiencyEngine
+
+from models import PlacementNetwork, PlacementObject, CompactPlacementNetwork
+
+class AdjPenPlacementAlgorithmTreeDP(IPlacementAlgorithm):
+    # Placement on tree-shaped (MST) networks. The object counts are relaxed with one
+    # Lagrange multiplier per type; for fixed multipliers a DP over the rooted forest,
+    # with states (type at node, parent has the same type), is exact in O(nodes * types).
+    # Subgradient steps on the multipliers tighten the dual bound, every relaxed solution
+    # is repaired to the exact counts, and a zero gap between the best repaired placement
+    # and the dual bound proves it optimal. Networks with cycles go to the fallback solver
+    OPTIMALITY_GAP = 1e-6
+
+    def __init__(self, penalty : float = 0.5,
+                 max_iterations : int = 100,
+                 time_budget_s : Optional[float] = 5.0,
+                 polish : bool = True,
+                 fallback_algorithm : Optional[IPlacementAlgorithm] = None):
+        self._penalty = penalty
+        self._max_iterations = max_iterations
+        self._time_budget_s = time_budget_s
+        self._polish = polish
+        self._fallback_algorithm = fallback_algorithm
+        self._bounds : Tuple[float, float] = (np.nan, np.nan)
+
+    def get_penalty(self) -> float:
+        return self._penalty
+
+    def set_penalty(self, penalty : float) -> None:
+        self._penalty = penalty
+
+    def get_time_budget(self) -> Optional[float]:
+        return self._time_budget_s
+
+    def set_time_budget(self, time_budget_s : Optional[float]) -> None:
+        self._time_budget_s = time_budget_s
+
+    def get_bounds(self) -> Tuple[float, float]:
+        # (best placement found, dual upper bound) of the last tree run
+        return self._bounds
+
+    def compute_placement(self, pnetwork : PlacementNetwork,
+                          to_place : List[PlacementObject]) -> PlacementNetwork:
+        return self._compute(pnetwork, to_place, self._time_budget_s, None)
+
+    def compute_placement_anytime(self, pnetwork : PlacementNetwork,
+                                  to_place : List[PlacementObject],
+                                  on_improvement : PlacementCallback,
+                                  time_budget_s : Optional[float] = None) -> PlacementNetwork:
+        return self._compute(pnetwork, to_place, time_budget_s if time_budget_s is not None else self._time_budget_s,
+                             on_improvement)
+
+    def _compute(self, pnetwork : PlacementNetwork, to_place : List[PlacementObject],
+                 time_budget_s : Optional[float], on_improvement : Optional[PlacementCallback]) -> PlacementNetwork:
+        started = time.perf_counter()
+        deadline = None if time_budget_s is None else started + time_budget_s
+
+        network = CompactPlacementNetwork.from_placement_network(pnetwork)
+        count = network.get_node_count()
+        indptr, indices = network.get_adjacency()
+
+        components, labels = connected_components(csr_matrix((np.ones(len(indices)), indices, indptr),
+                                                             shape=(count, count)), directed=False)
+        if network.get_edge_count() != count - components or len(to_place) > count:
+            print("AdjPenPlacementAlgorithmTreeDP: network is not a forest or the objects do not fit, "
+                  "using the fallback solver")
+            fallback_algorithm = AdjPenPlacementAlgorithmBestOf.get_or_create(self._fallback_algorithm, self._penalty)
+            if on_improvement is None:
+                return fallback_algorithm.compute_placement(pnetwork, to_place)
+            return fallback_algorithm.compute_placement_anytime(pnetwork, to_place, on_improvement, time_budget_s)
+
+        objects_to_place = self._construct_placement_objects_dict(to_place)
+        objects = list(objects_to_place)
+
+        # Columns are the object types plus one for an empty point, so the counts
+        # always add up to the number of points
+        type_ids = np.array([network.get_type_id(obj.get_name()) for obj in objects] +
+                            [CompactPlacementNetwork.NO_TYPE], dtype=np.int32)
+        rates = np.array([obj.get_independent_contribution_rate() for obj in objects] + [0.0], dtype=np.float64)
+        targets = np.array([objects_to_place[obj] for obj in objects] + [count - len(to_place)], dtype=np.int64)
+
+        parents, levels = self._get_rooted_levels(indptr, indices, labels, components)
+        reporter = ImprovementReporter(on_improvement)
+
+        multipliers = np.zeros(len(type_ids), dtype=np.float64)
+        best_primal, best_dual = -np.inf, np.inf
+        best_type_ids = np.full(count, CompactPlacementNetwork.NO_TYPE, dtype=np.int32)
+        step_scale, stalled = 2.0, 0
+
+        for _ in range(self._max_iterations if objects else 0):
+            assignment, relaxed = self._solve_relaxed(rates, multipliers, parents, levels)
+            dual = relaxed + float(multipliers @ targets)
+            if dual < best_dual - self.OPTIMALITY_GAP:
+                best_dual, stalled = dual, 0
+            else:
+                stalled += 1
+                if stalled >= 5:
+                    step_scale, stalled = step_scale / 2.0, 0
+
+            engine = self._repair(network, type_ids[assignment], rates[assignment], type_ids, rates, targets)
+            if engine.get_total_efficiency() > best_primal:
+                best_primal = engine.get_total_efficiency()
+                best_type_ids = engine.get_type_ids().copy()
+                reporter.report(best_primal, lambda: engine.write_to_network().apply_to(pnetwork),
+                                force=reporter.get_reported_efficiency() == -np.inf)
+
+            if best_dual - best_primal <= self.OPTIMALITY_GAP * max(1.0, abs(best_dual)):
+                break
+            if deadline is not None and time.perf_counter() >= deadline:
+                break
+
+            subgradient = np.bincount(assignment, minlength=len(type_ids)) - targets
+            norm = float(subgradient @ subgradient)
+            if norm == 0:
+                break
+            multipliers += step_scale * (dual - best_primal) / norm * subgradient
+
+        rate_by_type = dict(zip(type_ids.tolist(), rates.tolist()))
+        network.get_type_ids()[:] = best_type_ids
+        network.get_independent_rates()[:] = [rate_by_type[type_id] if type_id != CompactPlacementNetwork.NO_TYPE
+                                              else np.nan for type_id in best_type_ids.tolist()]
+        engine = AdjPenEfficiencyEngine(network, self._penalty)
+        self._bounds = (engine.get_total_efficiency(), best_dual if objects else 0.0)
+
+        print(f"AdjPenPlacementAlgorithmTreeDP: efficiency {self._bounds[0]:.4f}, "
+              f"dual bound {self._bounds[1]:.4f} in {time.perf_counter() - started:.2f}s")
+
+        result_rn = engine.write_to_network().apply_to(pnetwork)
+        reporter.report(self._bounds[0], lambda: result_rn, force=True)
+
+        if self._polish and self._bounds[1] - self._bounds[0] > self.OPTIMALITY_GAP * max(1.0, abs(self._bounds[1])):
+            remaining = None if deadline is None else max(deadline - time.perf_counter(), 0.0)
+            polisher = AdjPenPlacementAlgorithmLocalSearch(self._penalty, time_budget_s=remaining,
+                                                           start_from_existing=True)
+            result_rn = polisher.compute_placement(result_rn, to_place) if on_improvement is None \
+                else polisher.compute_placement_anytime(result_rn, to_place, reporter)
+        return result_rn
+
+    def _get_rooted_levels(self, indptr : np.ndarray, indices : np.ndarray, labels : np.ndarray,
+                           components : int) -> Tuple[np.ndarray, List[np.ndarray]]:
+        # Roots every tree of the forest at its center through a virtual node, which keeps
+        # the number of levels (and DP steps) minimal; returns parent indices (-1 for
+        # roots) and the points grouped by depth
+        count = len(labels)
+        representatives = self._get_tree_centers(indptr, indices, labels, components)
+        sources = np.concatenate([np.repeat(np.arange(count), np.diff(indptr)),
+                                  np.full(components, count), representatives])
+        targets = np.concatenate([indices, representatives, np.full(components, count)])
+        graph = csr_matrix((np.ones(len(sources)), (sources, targets)), shape=(count + 1, count + 1))
+
+        order, predecessors = breadth_first_order(graph, count, directed=False, return_predecessors=True)
+        parents = np.where(predecessors[:count] == count, -1, predecessors[:count])
+
+        depths = np.zeros(count + 1, dtype=np.int64)
+        for node in order[1:].tolist():
+            depths[node] = depths[predecessors[node]] + 1
+        depths = depths[:count] - 1
+
+        by_depth = np.argsort(depths, kind="stable")
+        starts = np.searchsorted(depths[by_depth], np.arange(1, depths.max() + 2))
+        return parents, np.split(by_depth, starts[:-1])
+
+    def _get_tree_centers(self, indptr : np.ndarray, indices : np.ndarray, labels : np.ndarray,
+                          components : int) -> np.ndarray:
+        # Peels the leaves of all trees at once until at most two points of each are left
+        degrees = np.diff(indptr)
+        alive = np.ones(len(labels), dtype=bool)
+        alive_counts = np.bincount(labels, minlength=components)
+
+        while True:
+            leaves = np.flatnonzero(alive & (degrees <= 1) & (alive_counts[labels] > 2))
+            if len(leaves) == 0:
+                break
+            alive[leaves] = False
+            alive_counts -= np.bincount(labels[leaves], minlength=components)
+            lengths = indptr[leaves + 1] - indptr[leaves]
+            offsets = np.repeat(indptr[leaves] - (np.cumsum(lengths) - lengths), lengths)
+            np.subtract.at(degrees, indices[offsets + np.arange(int(lengths.sum()))], 1)
+
+        remaining = np.flatnonzero(alive)
+        return remaining[np.unique(labels[remaining], return_index=True)[1]]
+
+    def _solve_relaxed(self, rates : np.ndarray, multipliers : np.ndarray,
+                       parents : np.ndarray, levels : List[np.ndarray]) -> Tuple[np.ndarray, float]:
+        # g0[v, t] / g1[v, t]: best value of v's subtree with v holding column t while
+        # v's parent holds another type / the same type. The last column (empty) never
+        # penalizes and is never penalized
+        count, columns = len(parents), len(rates)
+        empty = columns - 1
+        penalty_multiplier = 1.0 - self._penalty
+        free = rates - multipliers
+        penalized = rates * penalty_multiplier - multipliers
+
+        # Per node and column of the node: sum over children of their best value with a
+        # different type, sum of the best with any type, and the smallest loss of forcing
+        # one child to the same type (inf when there is no child to force)
+        different_sums = np.zeros((count, columns))
+        any_sums = np.zeros((count, columns))
+        force_gaps = np.full((count, columns), np.inf)
+        g0 = np.empty((count, columns))
+        g1 = np.empty((count, columns))
+        rows = np.arange(count)
+
+        for level in reversed(levels):
+            without_same = different_sums[level]
+            with_same = any_sums[level] - np.maximum(force_gaps[level], 0.0)
+            g0[level] = np.maximum(without_same + free, with_same + penalized)
+            g1[level] = np.maximum(without_same, with_same) + penalized
+
+            children = level[parents[level] >= 0]
+            if len(children) == 0:
+                continue
+            different, _ = self._get_best_different(g0[children], None)
+            same = g1[children]
+            same[:, empty] = -np.inf
+
+            level_parents = parents[children]
+            np.add.at(different_sums, level_parents, different)
+            np.add.at(any_sums, level_parents, np.maximum(same, different))
+            np.minimum.at(force_gaps, level_parents, different - same)
+
+        # Top-down reconstruction following the branches the maxima were taken from
+        assignment = np.empty(count, dtype=np.int64)
+        parent_same = np.zeros(count, dtype=bool)
+        with_same_branch = np.zeros(count, dtype=bool)
+
+        roots = levels[0]
+        assignment[roots] = np.argmax(g0[roots], axis=1)
+        relaxed = float(g0[roots, assignment[roots]].sum())
+
+        for depth, level in enumerate(levels):
+            if depth > 0:
+                level_parents = parents[level]
+                parent_types = assignment[level_parents]
+                different, choices = self._get_best_different(g0[level], parent_types)
+                different = different[rows[:len(level)], parent_types]
+                same = np.where(parent_types != empty, g1[level, parent_types], -np.inf)
+
+                take_same = with_same_branch[level_parents] & (same >= different)
+                satisfied = np.zeros(count, dtype=bool)
+                satisfied[level_parents[take_same]] = True
+                forced = np.flatnonzero(with_same_branch[level_parents] & ~satisfied[level_parents])
+                if len(forced):
+                    forced = forced[np.lexsort(((different - same)[forced], level_parents[forced]))]
+                    forced = forced[np.unique(level_parents[forced], return_index=True)[1]]
+                    take_same[forced] = True
+
+                assignment[level] = np.where(take_same, parent_types, choices)
+                parent_same[level] = take_same
+
+            types = assignment[level]
+            without_same = different_sums[level, types]
+            with_same = any_sums[level, types] - np.maximum(force_gaps[level, types], 0.0)
+            with_same_branch[level] = (types != empty) & \
+                np.where(parent_same[level], with_same >= without_same,
+                         with_same + penalized[types] >= without_same + free[types])
+
+        return assignment, relaxed
+
+    def _get_best_different(self, values : np.ndarray, excluded : Optional[np.ndarray]
+                            ) -> Tuple[np.ndarray, Optional[np.ndarray]]:
+        # For every row and column t, the best value over columns other than t (any column
+        # for the empty one); with excluded given, also the arg of that best per row
+        rows = np.arange(len(values))
+        empty = values.shape[1] - 1
+        top = np.argmax(values, axis=1)
+        first = values[rows, top]
+        rest = values.copy()
+        rest[rows, top] = -np.inf
+        second = rest.max(axis=1)
+
+        result = np.repeat(first[:, None], values.shape[1], axis=1)
+        result[rows, top] = second
+        result[:, empty] = first
+        if excluded is None:
+            return result, None
+
+        masked = values.copy()
+        restricted = excluded != empty
+        masked[rows[restricted], excluded[restricted]] = -np.inf
+        return result, np.argmax(masked, axis=1)
+
+    def _repair(self, network : CompactPlacementNetwork, assigned_types : np.ndarray, assigned_rates : np.ndarray,
+                type_ids : np.ndarray, rates : np.ndarray, targets : np.ndarray) -> AdjPenEfficiencyEngine:
+        # Moves points from over-represented to under-represented types, best single-change
+        # deltas first. Points moved together are never adjacent, so their deltas add up
+        network.get_type_ids()[:] = assigned_types
+        network.get_independent_rates()[:] = np.where(assigned_types != CompactPlacementNetwork.NO_TYPE,
+                                                      assigned_rates, np.nan)
+        engine = AdjPenEfficiencyEngine(network, self._penalty)
+        indptr, indices = network.get_adjacency()
+        sources = np.repeat(np.arange(len(assigned_types)), np.diff(indptr))
+
+        while True:
+            current = engine.get_type_ids()
+            counts = np.array([np.count_nonzero(current == type_id) for type_id in type_ids.tolist()])
+            surplus = counts - targets
+            if not surplus.any():
+                return engine
+
+            over = np.isin(current, type_ids[surplus > 0])
+            best_gain, best_move = -np.inf, None
+            for k in np.flatnonzero(surplus < 0).tolist():
+                deltas = np.where(over, engine.get_change_deltas(int(type_ids[k]), float(rates[k])), -np.inf)
+                i = int(np.argmax(deltas))
+                if deltas[i] > best_gain:
+                    best_gain, best_move = deltas[i], (i, k, deltas)
+
+            i, k, deltas = best_move
+            source = int(np.flatnonzero(type_ids == current[i])[0])
+            candidates = np.flatnonzero(current == current[i])
+            chosen = candidates[np.argsort(-deltas[candidates], kind="stable")][:min(surplus[source], -surplus[k])]
+
+            ranks = np.full(len(current), -1, dtype=np.int64)
+            ranks[chosen] = np.arange(len(chosen))
+            conflicts = (ranks[sources] >= 0) & (ranks[indices] >= 0)
+            losers = np.where(ranks[sources[conflicts]] > ranks[indices[conflicts]],
+                              sources[conflicts], indices[conflicts])
+            ranks[losers] = -1
+
+            engine.apply_changes(np.flatnonzero(ranks >= 0), int(type_ids[k]), float(rates[k]))
@@ -1,10 +1,35 @@
 from abc import ABC, abstractmethod
-from typing import List
+from typing import Callable, Dict, List, Optional
 
 from models import PlacementNetwork, PlacementObject
 
+# Receives a placement and its total efficiency (None when the solver does not know it)
+PlacementCallback = Callable[[PlacementNetwork, Optional[float]], None]
+
 class IPlacementAlgorithm(ABC):
     @abstractmethod
     def compute_placement(self, pnetwork : PlacementNetwork,
                           to_place : List[PlacementObject]) -> PlacementNetwork:
         pass
+
+    def compute_placement_anytime(self, pnetwork : PlacementNetwork,
+                                  to_place : List[PlacementObject],
+                                  on_improvement : PlacementCallback,
+                                  time_budget_s : Optional[float] = None) -> PlacementNetwork:
+        # Anytime mode: on_improvement gets better placements while the solver runs and
+        # time_budget_s (when given) replaces the solver's own budget. Solvers without
+        # interim results report only the final placement
+        result_rn = self.compute_placement(pnetwork, to_place)
+        on_improvement(result_rn, None)
+        return result_rn
+
+    @staticmethod
+    def _construct_placement_objects_dict(to_place : List[PlacementObject]) -> Dict[PlacementObject, int]:
+        # Object counts in first-seen order
+        placement_objects_dict = {}
+        for obj in to_place:
+            if obj not in placement_objects_dict:
+                placement_objects_dict[obj] = 0
+            placement_objects_dict[obj] += 1
+        return placement_objects_dict
+
@@ -0,0 +1,40 @@
+import time
+from typing import Callable, Optional
+
+from models import PlacementNetwork
+
+from algorithms.placement_solvers.i_placement_algorithm import PlacementCallback
+
+class ImprovementReporter:
+    # Forwards strictly better placements to an anytime callback, at most once per
+    # interval unless forced; placements are built only for the reports that go out.
+    # Calling the reporter itself forwards a ready placement, so it can be handed on
+    # to a nested solver as its callback
+    REPORT_INTERVAL_S = 0.5
+
+    def __init__(self, callback : Optional[PlacementCallback], interval_s : float = REPORT_INTERVAL_S):
+        self._callback = callback
+        self._interval_s = interval_s
+        self._reported_efficiency = -float("inf")
+        self._reported_at = -float("inf")
+
+    def get_reported_efficiency(self) -> float:
+        return self._reported_efficiency
+
+    def report(self, efficiency : float, build : Callable[[], PlacementNetwork], force : bool = False) -> None:
+        if self._callback is None or efficiency <= self._reported_efficiency:
+            return
+        now = time.perf_counter()
+        if not force and now - self._reported_at < self._interval_s:
+            return
+
+        self._reported_efficiency = efficiency
+        self._reported_at = now
+        self._callback(build(), efficiency)
+
+    def __call__(self, placement_network : PlacementNetwork, efficiency : Optional[float]) -> None:
+        if efficiency is None:
+            if self._callback is not None:
+                self._callback(placement_network, None)
+            return
+        self.report(efficiency, lambda: placement_network, force=True)
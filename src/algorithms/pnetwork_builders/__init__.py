@@ -1,2 +1,5 @@
 from .i_plink_builder import IPLinkBuilder
-from .mst_plink_builder import MSTPLinkBuilder
\ No newline at end of file
+from .plink_density_sweep import PLinkDensitySweep
+from .mst_plink_builder import MSTPLinkBuilder
+from .delaunay_plink_builder import DelaunayPLinkBuilder
+from .incremental_mst_plink_builder import IncrementalMSTPLinkBuilder
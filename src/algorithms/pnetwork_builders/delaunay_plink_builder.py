@@ -0,0 +1,163 @@
+from typing import List, Optional, Tuple
+
+import numpy as np
+from scipy.spatial import Delaunay, QhullError, cKDTree
+
+from models import PlacementNetwork
+
+from utils import GraphUtils, DisjointSet
+
+from algorithms.distance_resolvers import IDistanceResolver
+from algorithms.distance_resolvers import GeodeticDistanceResolver
+from algorithms.pnetwork_builders import IPLinkBuilder
+
+class DelaunayPLinkBuilder(IPLinkBuilder):
+    EARTH_RADIUS_M = 6_371_008.8
+
+    def __init__(self,
+                 distance_resolver : IDistanceResolver = GeodeticDistanceResolver(),
+                 required_density : Optional[float] = None,
+                 k_nearest : int = 0) -> None:
+        self._distance_resolver = distance_resolver
+        self._required_density = required_density
+        self._k_nearest = k_nearest
+
+    def get_distance_resolver(self) -> IDistanceResolver:
+        return self._distance_resolver
+    
+    def set_distance_resolver(self, resolver : IDistanceResolver) -> None:
+        self._distance_resolver = resolver
+
+    def get_required_density(self) -> Optional[float]:
+        return self._required_density
+    
+    def set_required_density(self, density : Optional[float]) -> None:
+        self._required_density = density
+
+    def get_k_nearest(self) -> int:
+        return self._k_nearest
+
+    def set_k_nearest(self, k_nearest : int) -> None:
+        self._k_nearest = k_nearest
+
+    def compute_placement_point_links(self,
+                                      pnetwork : PlacementNetwork) -> PlacementNetwork:
+        result_rn = pnetwork.snapshot()
+        graph = result_rn.get_mutable_graph()
+        initial_edges_count = graph.number_of_edges()
+
+        nodes = list(pnetwork.get_graph().nodes())
+        if len(nodes) < 2:
+            return result_rn
+
+        required_edges = GraphUtils.get_edges_count_from_density(len(nodes), self._required_density) \
+            if self._required_density is not None else 0
+
+        try:
+            coordinates = self._get_coordinates(pnetwork, nodes)
+            sources, targets = self._get_candidate_edges(coordinates, required_edges)
+            weights = self._distance_resolver.get_pairwise_distances(
+                [coordinates[i] for i in sources], [coordinates[j] for j in targets]
+            )
+        except Exception as e:
+            print(f"Error creating candidate weighted graph: {e}")
+            return None
+
+        print(f"DelaunayPLinkBuilder: {len(sources)} candidate edges for {len(nodes)} nodes")
+
+        order = np.argsort(weights, kind="stable")
+
+        disjoint_set = DisjointSet(len(nodes))
+        in_tree = np.zeros(len(order), dtype=bool)
+        for k in order:
+            if disjoint_set.union(int(sources[k]), int(targets[k])):
+                in_tree[k] = True
+                if disjoint_set.get_components_count() == 1:
+                    break
+
+        for k in np.flatnonzero(in_tree):
+            u, v = nodes[sources[k]], nodes[targets[k]]
+            if not graph.has_edge(u, v):
+                graph.add_edge(u, v, weight=float(weights[k]), type="MST")
+
+        if self._required_density is not None:
+            for k in order:
+                if graph.number_of_edges() - initial_edges_count >= required_edges:
+                    break
+
+                u, v = nodes[sources[k]], nodes[targets[k]]
+                if not in_tree[k] and not graph.has_edge(u, v):
+                    graph.add_edge(u, v, weight=float(weights[k]), type="Розширене MST")
+
+            if graph.number_of_edges() - initial_edges_count < required_edges:
+                print(f"DelaunayPLinkBuilder: candidate graph holds only "
+                      f"{graph.number_of_edges() - initial_edges_count} of {required_edges} required edges")
+
+        return result_rn
+
+    def _get_candidate_edges(self,
+                             coordinates : List[Tuple[float, float, Optional[float]]],
+                             min_edges : int = 0) -> Tuple[np.ndarray, np.ndarray]:
+        xy = self._project(coordinates)
+        node_count = len(xy)
+
+        sources, targets = [], []
+        if node_count <= 3:
+            u, v = np.triu_indices(node_count, k=1)
+            sources.append(u)
+            targets.append(v)
+        else:
+            try:
+                triangulation = Delaunay(xy)
+                simplices = triangulation.simplices
+                for a, b in ((0, 1), (1, 2), (0, 2)):
+                    sources.append(simplices[:, a])
+                    targets.append(simplices[:, b])
+                # Duplicate points are left out of the triangulation, link them to their twin
+                if len(triangulation.coplanar):
+                    sources.append(triangulation.coplanar[:, 0])
+                    targets.append(triangulation.coplanar[:, 2])
+            except QhullError:
+                # Collinear points, the spanning tree is the chain along the line
+                centered = xy - xy.mean(axis=0)
+                _, _, axes = np.linalg.svd(centered, full_matrices=False)
+                chain = np.argsort(centered @ axes[0], kind="stable")
+                sources.append(chain[:-1])
+                targets.append(chain[1:])
+
+        # Dense targets need more candidates than a triangulation has, n * k / 2 neighbour pairs cover them
+        k_nearest = self._k_nearest
+        if min_edges > len(self._get_unique_edge_keys(sources, targets, node_count)):
+            k_nearest = max(k_nearest, int(np.ceil(2 * min_edges / node_count)) + 1)
+
+        if k_nearest > 0:
+            k = min(k_nearest + 1, node_count)
+            _, neighbours = cKDTree(xy).query(xy, k=k)
+            sources.append(np.repeat(np.arange(node_count), k - 1))
+            targets.append(neighbours[:, 1:].ravel())
+
+        keys = self._get_unique_edge_keys(sources, targets, node_count)
+        return keys // node_count, keys % node_count
+
+    @staticmethod
+    def _get_unique_edge_keys(sources : List[np.ndarray], targets : List[np.ndarray],
+                              node_count : int) -> np.ndarray:
+        sources = np.concatenate(sources).astype(np.int64)
+        targets = np.concatenate(targets).astype(np.int64)
+
+        low, high = np.minimum(sources, targets), np.maximum(sources, targets)
+        return np.unique(low[low != high] * node_count + high[low != high])
+
+    @classmethod
+    def _project(cls, coordinates : List[Tuple[float, float, Optional[float]]]) -> np.ndarray:
+        # Local equirectangular projection, the planar MST then matches the geodetic one
+        # up to the projection distortion, which k_nearest candidates can compensate.
+        # Longitudes are centred on their circular mean and wrapped, so point sets across
+        # the antimeridian stay contiguous
+        lons = np.radians(np.array([c[0] for c in coordinates], dtype=np.float64))
+        lats = np.radians(np.array([c[1] for c in coordinates], dtype=np.float64))
+        center_lon = np.arctan2(np.sin(lons).mean(), np.cos(lons).mean())
+        d_lons = (lons - center_lon + np.pi) % (2 * np.pi) - np.pi
+        cos_lat = np.cos(lats.mean())
+        return np.column_stack((d_lons * cls.EARTH_RADIUS_M * cos_lat,
+                                lats * cls.EARTH_RADIUS_M))
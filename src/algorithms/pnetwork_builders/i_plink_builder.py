@@ -1,8 +1,21 @@
 from abc import ABC, abstractmethod
+from typing import Iterable, List, Optional, Tuple
 
-from models import PlacementNetwork
+from models import PlacementNetwork, PlacementPoint
 
 class IPLinkBuilder(ABC):
     @abstractmethod
     def compute_placement_point_links(self, pnetwork : PlacementNetwork) -> PlacementNetwork:
         pass
+
+    @staticmethod
+    def _get_coordinates(pnetwork : PlacementNetwork,
+                         nodes : Iterable) -> List[Tuple[float, float, Optional[float]]]:
+        coordinates = []
+        for node_id in nodes:
+            ppoint : PlacementPoint = pnetwork.get_placement_point_data(node_id)
+            if not ppoint:
+                raise ValueError(f"Placement point data not found for node {node_id}.")
+            lon, lat, _ = ppoint.get_coordinates()
+            coordinates.append((lon, lat, None))
+        return coordinates
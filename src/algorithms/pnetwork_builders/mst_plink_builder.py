@@ -1,15 +1,16 @@
-from typing import Optional
-from copy import deepcopy
+from typing import Iterable, List, Optional, Sequence, Tuple
 
 import networkx as nx
+import numpy as np
 
-from models import PlacementNetwork, PlacementPoint
+from models import PlacementNetwork
 
-from utils import GraphUtils
+from utils import GraphUtils, DisjointSet
 
 from algorithms.distance_resolvers import IDistanceResolver
 from algorithms.distance_resolvers import GeodeticDistanceResolver
 from algorithms.pnetwork_builders import IPLinkBuilder
+from algorithms.pnetwork_builders.plink_density_sweep import PLinkDensitySweep
 
 class MSTPLinkBuilder(IPLinkBuilder):
     def __init__(self,
@@ -32,66 +33,174 @@ class MSTPLinkBuilder(IPLinkBuilder):
 
     def compute_placement_point_links(self,
                                       pnetwork : PlacementNetwork) -> PlacementNetwork:
-        result_rn = deepcopy(pnetwork)
-        
-        initial_graph = deepcopy(pnetwork.get_graph())
-        initial_edges = deepcopy(initial_graph.edges(data=True))
+        sweep = self.compute_placement_point_links_sweep(pnetwork, [self._required_density])
+        if sweep is None:
+            return None
+
+        return sweep.get_placement_network(self._required_density)
+
+    def compute_placement_point_links_sweep(self,
+                                            pnetwork : PlacementNetwork,
+                                            densities : Sequence[Optional[float]]) -> Optional[PLinkDensitySweep]:
+        # Distances and the MST are computed once; every density then takes a prefix
+        # of the same extension sequence, sized for the largest requested density
+        swept_densities = [density for density in densities if density is not None]
+        max_density = max(swept_densities) if swept_densities else None
 
-        initial_graph.remove_edges_from(initial_edges)
+        nodes = list(pnetwork.get_graph().nodes())
+        required_edges = None
+        if max_density is not None:
+            required_edges = GraphUtils.get_edges_count_from_density(len(nodes), max_density)
 
         try:
-            complete_graph = self._create_complete_weighted_graph(pnetwork)
+            links = self._compute_links_lazily(pnetwork, nodes, required_edges)
         except Exception as e:
-            print(f"Error creating complete weighted graph: {e}")
+            print(f"Error computing lazy MST links: {e}")
             return None
 
-        minimum_spanning_edges = nx.minimum_spanning_edges(complete_graph, data=True)
+        if links is None:
+            try:
+                links = self._compute_links(pnetwork, nodes, required_edges)
+            except Exception as e:
+                print(f"Error creating complete weighted graph: {e}")
+                return None
 
-        def _add_type_to_edge(edge, type):
-            edge[2]['type'] = type
-            return edge
-        
-        result_rn.get_graph().add_edges_from([_add_type_to_edge(edge, "MST") for edge in minimum_spanning_edges if edge not in initial_edges])
+        tree_edges, extension_edges, added_tree_edges = links
 
-        if self._required_density is not None:
-            initial_edges_count = len(initial_edges)
-            required_edges = GraphUtils.get_edges_count_from_density(pnetwork.get_graph().number_of_nodes(),
-                                                                     self._required_density)
-            
-            for u, v, _ in sorted(complete_graph.edges(data=True), key=lambda x: x[2]['weight']):
+        return PLinkDensitySweep(pnetwork.snapshot(), tree_edges, extension_edges, added_tree_edges, max_density)
 
-                if len(result_rn.get_graph().edges()) - initial_edges_count >= required_edges:
-                    break
+    def _compute_links(self, pnetwork : PlacementNetwork, nodes : List[int], required_edges : Optional[int]
+                       ) -> Tuple[List[Tuple[int, int, float]], List[Tuple[int, int, float]], int]:
+        graph = pnetwork.get_graph()
 
-                if not result_rn.get_graph().has_edge(u, v):
-                    result_rn.get_graph().add_edge(u, v, type="Розширене MST")
+        distances = self._get_distance_matrix(pnetwork, nodes)
+        complete_graph = self._create_complete_weighted_graph(nodes, distances)
 
-        return result_rn
-    
-    def _create_complete_weighted_graph(self, pnetwork : PlacementNetwork) -> nx.Graph:
-        complete_graph = nx.complete_graph(pnetwork.get_graph().nodes())
+        tree_edges = [(u, v, data['weight'])
+                      for u, v, data in nx.minimum_spanning_edges(complete_graph, data=True)]
+        added_tree_edges = sum(1 for u, v, _ in tree_edges if not graph.has_edge(u, v))
+
+        extension_edges = []
+        if required_edges is not None:
+            taken_edges = list(graph.edges()) + [(u, v) for u, v, _ in tree_edges]
+            extension_edges = self._get_shortest_free_edges(nodes, distances, taken_edges,
+                                                            required_edges - added_tree_edges)
+
+        return tree_edges, extension_edges, added_tree_edges
 
-        for u, v in complete_graph.edges():
-            u_ppoint : PlacementPoint = pnetwork.get_placement_point_data(u)
-            v_ppoint : PlacementPoint = pnetwork.get_placement_point_data(v)
+    def _compute_links_lazily(self, pnetwork : PlacementNetwork, nodes : List[int], required_edges : Optional[int]
+                              ) -> Optional[Tuple[List[Tuple[int, int, float]], List[Tuple[int, int, float]], int]]:
+        # Kruskal in rounds over a growing radius: each round resolves every pair whose
+        # lower bound is within the radius in one batch, with searches stopped at the
+        # radius. The pairs found within it are exactly the complete-graph edges up to the
+        # radius, so Kruskal over them is a prefix of the full one. The radius doubles
+        # until the tree spans and enough extension edges lie inside it
+        if len(nodes) < 2:
+            return None
+
+        coordinates = self._get_coordinates(pnetwork, nodes)
+        lower_bounds = self._distance_resolver.get_lower_bound_matrix(coordinates, coordinates)
+        if lower_bounds is None:
+            return None
 
-            if u_ppoint and v_ppoint:
-                u_lon, u_lat, _ = u_ppoint.get_coordinates()
-                v_lon, v_lat, _ = v_ppoint.get_coordinates()
+        rows, columns = np.triu_indices(len(nodes), k=1)
+        bounds = lower_bounds[rows, columns]
+        distances = np.full(len(bounds), np.nan)
+
+        # Every point needs at least its nearest neighbour, so no smaller radius can span
+        nearest = np.where(np.eye(len(nodes), dtype=bool), np.inf, lower_bounds).min(axis=1)
+        radius = max(float(nearest.max()), float(bounds[bounds > 0].min(initial=np.inf)))
+        resolved, rounds = 0, 0
+
+        while True:
+            rounds += 1
+            pending = np.flatnonzero(np.isnan(distances) & (bounds <= radius))
+            if len(pending):
+                found = np.asarray(self._distance_resolver.get_pairwise_distances_within(
+                    [coordinates[i] for i in rows[pending]], [coordinates[j] for j in columns[pending]], radius),
+                    dtype=np.float64)
+                # Pairs beyond the radius are asked again in a later round
+                distances[pending] = np.where(np.isinf(found) & np.isfinite(radius), np.nan, found)
+                resolved += len(pending)
+
+            links = self._run_kruskal(pnetwork, nodes, rows, columns, distances, radius, required_edges)
+            if links is not None:
+                break
+            radius = radius * 2 if radius < bounds.max() else np.inf
+
+        print(f"MSTPLinkBuilder: resolved {resolved} of {len(bounds)} distances lazily in {rounds} rounds")
+
+        return links
+
+    @staticmethod
+    def _run_kruskal(pnetwork : PlacementNetwork, nodes : List[int], rows : np.ndarray, columns : np.ndarray,
+                     distances : np.ndarray, radius : float, required_edges : Optional[int]
+                     ) -> Optional[Tuple[List[Tuple[int, int, float]], List[Tuple[int, int, float]], int]]:
+        # None while the edges within the radius do not span all points or hold too few
+        # extension edges; an infinite radius knows every edge and always returns
+        graph = pnetwork.get_graph()
+        known = np.flatnonzero(distances <= radius)
+        order = known[np.argsort(distances[known], kind="stable")]
+
+        components = DisjointSet(len(nodes))
+        tree_edges, candidate_edges = [], []
+        added_tree_edges = 0
+
+        for k in order.tolist():
+            i, j = int(rows[k]), int(columns[k])
+            u, v = nodes[i], nodes[j]
+            if components.union(i, j):
+                tree_edges.append((u, v, float(distances[k])))
+                if not graph.has_edge(u, v):
+                    added_tree_edges += 1
+            elif required_edges is not None and not graph.has_edge(u, v):
+                candidate_edges.append((u, v, float(distances[k])))
+
+            if components.get_components_count() == 1:
+                missing_edges = 0 if required_edges is None else max(required_edges - added_tree_edges, 0)
+                if len(candidate_edges) >= missing_edges:
+                    return tree_edges, candidate_edges[:missing_edges], added_tree_edges
+
+        if np.isinf(radius):
+            return tree_edges, candidate_edges, added_tree_edges
+        return None
+
+    def _get_distance_matrix(self, pnetwork : PlacementNetwork, nodes : List[int]) -> np.ndarray:
+        coordinates = self._get_coordinates(pnetwork, nodes)
 
-                try:
-                    distance = self._distance_resolver.get_distance_in_meters(
-                        u_lon, u_lat,
-                        v_lon, v_lat
-                    )
-                except Exception as e:
-                    raise ValueError(f"Distance calculation failed for nodes {u} and {v}: {e}") from e
+        try:
+            return self._distance_resolver.get_distance_matrix(coordinates, coordinates)
+        except Exception as e:
+            raise ValueError(f"Distance matrix calculation failed: {e}") from e
 
-                print(f"Distance between {u} and {v}: {distance} m")
+    def _create_complete_weighted_graph(self, nodes : List[int], distances : np.ndarray) -> nx.Graph:
+        complete_graph = nx.complete_graph(nodes)
 
-                complete_graph.add_edge(u, v, weight=distance)
-            else:
-                raise ValueError(f"Placement point data not found for nodes {u} or {v}.")
+        for i, j in zip(*np.triu_indices(len(nodes), k=1)):
+            complete_graph.add_edge(nodes[i], nodes[j], weight=float(distances[i, j]))
 
         return complete_graph
-        
\ No newline at end of file
+
+    @staticmethod
+    def _get_shortest_free_edges(nodes : List[int], distances : np.ndarray,
+                                 taken_edges : Iterable[Tuple[int, int]], count : int) -> List[Tuple[int, int, float]]:
+        # Top-k selection over the upper triangle: argpartition is O(m), only the
+        # selected k edges get sorted, and taken edges are masked once
+        if count <= 0:
+            return []
+
+        rows, columns = np.triu_indices(len(nodes), k=1)
+        weights = distances[rows, columns]
+
+        index = {node: i for i, node in enumerate(nodes)}
+        taken = np.zeros((len(nodes), len(nodes)), dtype=bool)
+        for u, v in taken_edges:
+            i, j = index[u], index[v]
+            taken[min(i, j), max(i, j)] = True
+
+        free = np.flatnonzero(~taken[rows, columns])
+        if count < len(free):
+            free = free[np.argpartition(weights[free], count - 1)[:count]]
+        free = free[np.argsort(weights[free], kind="stable")]
+
+        return [(nodes[rows[k]], nodes[columns[k]], float(weights[k])) for k in free]
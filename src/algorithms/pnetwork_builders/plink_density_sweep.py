@@ -0,0 +1,50 @@
+from typing import Any, Dict, List, Optional, Tuple
+
+from models import PlacementNetwork
+
+from utils import GraphUtils
+
+class PLinkDensitySweep:
+    # Links for any density up to the covered one: the MST plus a prefix of a single
+    # extension sequence sorted by weight, so the edge sets are nested by density
+    def __init__(self,
+                 pnetwork : PlacementNetwork,
+                 tree_edges : List[Tuple[int, int, float]],
+                 extension_edges : List[Tuple[int, int, float]],
+                 added_tree_edges : int,
+                 max_density : Optional[float]) -> None:
+        self._pnetwork = pnetwork
+        self._tree_edges = tree_edges
+        self._extension_edges = extension_edges
+        self._added_tree_edges = added_tree_edges
+        self._max_density = max_density
+
+    def get_max_density(self) -> Optional[float]:
+        return self._max_density
+
+    def covers(self, density : Optional[float]) -> bool:
+        if density is None:
+            return True
+        if self._get_missing_edges(density) <= len(self._extension_edges):
+            return True
+        return self._max_density is not None and density <= self._max_density
+
+    def get_links(self, density : Optional[float]) -> List[Tuple[int, int, Dict[str, Any]]]:
+        if not self.covers(density):
+            raise ValueError(f"Density {density} exceeds the swept maximum {self._max_density}.")
+
+        links = [(u, v, {'weight': weight, 'type': "MST"}) for u, v, weight in self._tree_edges]
+        if density is not None:
+            links.extend((u, v, {'weight': weight, 'type': "Розширене MST"})
+                         for u, v, weight in self._extension_edges[:self._get_missing_edges(density)])
+        return links
+
+    def get_placement_network(self, density : Optional[float]) -> PlacementNetwork:
+        result_rn = self._pnetwork.snapshot()
+        result_rn.get_mutable_graph().add_edges_from(self.get_links(density))
+        return result_rn
+
+    def _get_missing_edges(self, density : float) -> int:
+        required_edges = GraphUtils.get_edges_count_from_density(self._pnetwork.get_graph().number_of_nodes(),
+                                                                 density)
+        return max(required_edges - self._added_tree_edges, 0)
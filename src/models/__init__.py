@@ -1,3 +1,4 @@
 from .placement_object import PlacementObject
 from .placement_point import PlacementPoint, PlacementPointID
-from .placement_network import PlacementNetwork
\ No newline at end of file
+from .placement_network import PlacementNetwork
+from .compact_placement_network import CompactPlacementNetwork, CompactPlacementPoint
\ No newline at end of file
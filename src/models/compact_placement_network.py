@@ -0,0 +1,253 @@
+from typing import Dict, List, Optional, Tuple
+
+import networkx as nx
+import numpy as np
+
+from models import PlacementObject, PlacementPoint, PlacementPointID, PlacementNetwork
+
+class CompactPlacementPoint(object):
+    # Light view of one row of a CompactPlacementNetwork with the PlacementPoint getters
+    __slots__ = ("_network", "_index")
+
+    def __init__(self, network : 'CompactPlacementNetwork', index : int) -> None:
+        self._network = network
+        self._index = index
+
+    def get_id(self) -> PlacementPointID:
+        return PlacementPointID(int(self._network.get_node_ids()[self._index]))
+
+    def get_object(self) -> Optional[PlacementObject]:
+        return self._network.get_object(self._index)
+
+    def set_object(self, object : Optional[PlacementObject]) -> None:
+        self._network.set_object(self._index, object)
+
+    def get_coordinates(self) -> tuple[float, float, Optional[float]]:
+        return self._network.get_coordinates(self._index)
+
+    def __eq__(self, other : 'CompactPlacementPoint | PlacementPoint') -> bool:
+        if isinstance(other, (CompactPlacementPoint, PlacementPoint)):
+            return self.get_id() == other.get_id()
+        raise ValueError
+
+    def __ne__(self, other : 'CompactPlacementPoint | PlacementPoint') -> bool:
+        return not self.__eq__(other)
+
+    def __hash__(self) -> int:
+        return hash(self.get_id())
+
+
+class CompactPlacementNetwork:
+    # Columnar placement network: one array per attribute and CSR adjacency instead of
+    # a networkx graph with per-node attribute dicts. Object types are interned as int32
+    # ids (NO_TYPE for empty points); missing altitudes and context rates are NaN
+    NO_TYPE = -1
+
+    def __init__(self,
+                 node_ids : np.ndarray,
+                 lons : np.ndarray, lats : np.ndarray, alts : np.ndarray,
+                 indptr : np.ndarray, indices : np.ndarray,
+                 type_names : Optional[List[str]] = None,
+                 type_ids : Optional[np.ndarray] = None,
+                 independent_rates : Optional[np.ndarray] = None,
+                 context_rates : Optional[np.ndarray] = None) -> None:
+        count = len(node_ids)
+
+        self._node_ids = np.asarray(node_ids, dtype=np.int64)
+        self._lons = np.asarray(lons, dtype=np.float64)
+        self._lats = np.asarray(lats, dtype=np.float64)
+        self._alts = np.asarray(alts, dtype=np.float64)
+        self._indptr = np.asarray(indptr, dtype=np.int64)
+        self._indices = np.asarray(indices, dtype=np.int32)
+
+        self._type_names : List[str] = list(type_names) if type_names is not None else []
+        self._type_index : Dict[str, int] = {name: i for i, name in enumerate(self._type_names)}
+        self._type_ids = np.asarray(type_ids, dtype=np.int32) if type_ids is not None \
+            else np.full(count, self.NO_TYPE, dtype=np.int32)
+        self._independent_rates = np.asarray(independent_rates, dtype=np.float64) if independent_rates is not None \
+            else np.full(count, np.nan, dtype=np.float64)
+        self._context_rates = np.asarray(context_rates, dtype=np.float64) if context_rates is not None \
+            else np.full(count, np.nan, dtype=np.float64)
+
+        self._node_index : Optional[Dict[int, int]] = None
+
+    @classmethod
+    def from_placement_network(cls, pnetwork : PlacementNetwork) -> 'CompactPlacementNetwork':
+        graph = pnetwork.get_graph()
+        nodes = list(graph.nodes())
+        count = len(nodes)
+        index = {node: i for i, node in enumerate(nodes)}
+
+        lons = np.empty(count, dtype=np.float64)
+        lats = np.empty(count, dtype=np.float64)
+        alts = np.full(count, np.nan, dtype=np.float64)
+        for i, node_id in enumerate(nodes):
+            ppoint = pnetwork.get_placement_point_data(node_id)
+            if not ppoint:
+                raise ValueError(f"Placement point data not found for node {node_id}.")
+            lon, lat, alt = ppoint.get_coordinates()
+            lons[i], lats[i] = lon, lat
+            if alt is not None:
+                alts[i] = alt
+
+        edges = np.array([(index[u], index[v]) for u, v in graph.edges() if u != v],
+                         dtype=np.int64).reshape(-1, 2)
+        indptr, indices = cls._build_adjacency(count, edges[:, 0], edges[:, 1])
+
+        result = cls(np.array(nodes, dtype=np.int64), lons, lats, alts, indptr, indices)
+        for i, node_id in enumerate(nodes):
+            result.set_object(i, pnetwork.get_placement_point_data(node_id).get_object())
+
+        return result
+
+    def apply_to(self, pnetwork : PlacementNetwork) -> PlacementNetwork:
+        # Snapshot of pnetwork (links and their attributes included) carrying the
+        # objects and rates held in this network's arrays
+        result_rn = pnetwork.snapshot()
+        for i, node_id in enumerate(self._node_ids.tolist()):
+            ppoint = result_rn.get_placement_point_data(node_id)
+            lon, lat, alt = ppoint.get_coordinates() if ppoint else self.get_coordinates(i)
+            result_rn.set_placement_point_data(node_id, PlacementPoint(PlacementPointID(node_id), lon, lat, alt,
+                                                                       self.get_object(i)))
+        return result_rn
+
+    def to_placement_network(self) -> PlacementNetwork:
+        # Plain PlacementNetwork over the same points and links (links carry no attributes)
+        graph = nx.Graph()
+        graph.add_nodes_from(self._node_ids.tolist())
+        sources = np.repeat(np.arange(self.get_node_count()), np.diff(self._indptr))
+        forward = sources < self._indices
+        graph.add_edges_from(zip(self._node_ids[sources[forward]].tolist(),
+                                 self._node_ids[self._indices[forward]].tolist()))
+
+        result_rn = PlacementNetwork(graph)
+        for i, node_id in enumerate(self._node_ids.tolist()):
+            lon, lat, alt = self.get_coordinates(i)
+            result_rn.set_placement_point_data(node_id, PlacementPoint(PlacementPointID(node_id), lon, lat, alt,
+                                                                       self.get_object(i)))
+        return result_rn
+
+    def get_subnetwork(self, indices : np.ndarray) -> 'CompactPlacementNetwork':
+        # Induced subnetwork over the given rows, in their order; type ids keep their meaning
+        indices = np.asarray(indices, dtype=np.int64)
+        positions = np.full(self.get_node_count(), -1, dtype=np.int64)
+        positions[indices] = np.arange(len(indices))
+
+        sources = np.repeat(np.arange(self.get_node_count()), np.diff(self._indptr))
+        kept = (sources < self._indices) & (positions[sources] >= 0) & (positions[self._indices] >= 0)
+        indptr, adjacency = self._build_adjacency(len(indices), positions[sources[kept]],
+                                                  positions[self._indices[kept]])
+
+        return CompactPlacementNetwork(self._node_ids[indices], self._lons[indices], self._lats[indices],
+                                       self._alts[indices], indptr, adjacency,
+                                       list(self._type_names), self._type_ids[indices],
+                                       self._independent_rates[indices], self._context_rates[indices])
+
+    @staticmethod
+    def _build_adjacency(count : int, sources : np.ndarray, targets : np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        rows = np.concatenate([sources, targets])
+        columns = np.concatenate([targets, sources])
+        order = np.lexsort((columns, rows))
+
+        indptr = np.zeros(count + 1, dtype=np.int64)
+        np.cumsum(np.bincount(rows, minlength=count), out=indptr[1:])
+
+        return indptr, columns[order].astype(np.int32)
+
+    def get_node_count(self) -> int:
+        return len(self._node_ids)
+
+    def get_node_ids(self) -> np.ndarray:
+        return self._node_ids
+
+    def get_node_index(self, node_id : int) -> int:
+        return self._get_node_indices()[node_id]
+
+    def _get_node_indices(self) -> Dict[int, int]:
+        if self._node_index is None:
+            self._node_index = {node: i for i, node in enumerate(self._node_ids.tolist())}
+        return self._node_index
+
+    def get_lons(self) -> np.ndarray:
+        return self._lons
+
+    def get_lats(self) -> np.ndarray:
+        return self._lats
+
+    def get_alts(self) -> np.ndarray:
+        return self._alts
+
+    def get_adjacency(self) -> Tuple[np.ndarray, np.ndarray]:
+        return self._indptr, self._indices
+
+    def get_degrees(self) -> np.ndarray:
+        return np.diff(self._indptr)
+
+    def get_neighbour_indices(self, index : int) -> np.ndarray:
+        return self._indices[self._indptr[index]:self._indptr[index + 1]]
+
+    def get_edge_count(self) -> int:
+        return len(self._indices) // 2
+
+    def get_type_names(self) -> List[str]:
+        return self._type_names
+
+    def get_type_id(self, name : str) -> int:
+        if name not in self._type_index:
+            self._type_index[name] = len(self._type_names)
+            self._type_names.append(name)
+        return self._type_index[name]
+
+    def get_type_ids(self) -> np.ndarray:
+        return self._type_ids
+
+    def get_independent_rates(self) -> np.ndarray:
+        return self._independent_rates
+
+    def get_context_rates(self) -> np.ndarray:
+        return self._context_rates
+
+    def get_coordinates(self, index : int) -> tuple[float, float, Optional[float]]:
+        alt = self._alts[index]
+        return float(self._lons[index]), float(self._lats[index]), None if np.isnan(alt) else float(alt)
+
+    def get_object(self, index : int) -> Optional[PlacementObject]:
+        type_id = self._type_ids[index]
+        if type_id == self.NO_TYPE:
+            return None
+        context_rate = self._context_rates[index]
+        return PlacementObject(self._type_names[type_id], float(self._independent_rates[index]),
+                               None if np.isnan(context_rate) else float(context_rate))
+
+    def set_object(self, index : int, object : Optional[PlacementObject]) -> None:
+        if object is None:
+            self._type_ids[index] = self.NO_TYPE
+            self._independent_rates[index] = np.nan
+            self._context_rates[index] = np.nan
+            return
+
+        context_rate = object.get_context_contribution_rate()
+        self._type_ids[index] = self.get_type_id(object.get_name())
+        self._independent_rates[index] = object.get_independent_contribution_rate()
+        self._context_rates[index] = np.nan if context_rate is None else context_rate
+
+    def get_placement_point_data(self, node_id : int) -> Optional[CompactPlacementPoint]:
+        index = self._get_node_indices().get(node_id, None)
+        return CompactPlacementPoint(self, index) if index is not None else None
+
+    def set_placement_point_data(self, node_id : int, data : PlacementPoint) -> None:
+        index = self._get_node_indices().get(node_id, None)
+        if index is None:
+            raise ValueError(f"Node {node_id} not found in the network.")
+
+        lon, lat, alt = data.get_coordinates()
+        self._lons[index], self._lats[index] = lon, lat
+        self._alts[index] = np.nan if alt is None else alt
+        self.set_object(index, data.get_object())
+
+    def copy(self) -> 'CompactPlacementNetwork':
+        # Node ids and adjacency are immutable and shared; per-node columns are copied
+        return CompactPlacementNetwork(self._node_ids, self._lons.copy(), self._lats.copy(), self._alts.copy(),
+                                       self._indptr, self._indices,
+                                       list(self._type_names), self._type_ids.copy(),
+                                       self._independent_rates.copy(), self._context_rates.copy())
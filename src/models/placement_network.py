@@ -1,4 +1,4 @@
-from typing import Optional
+from typing import Dict, Optional
 
 import networkx as nx
 
@@ -8,12 +8,38 @@ class PlacementNetwork:
     def __init__(self, graph : nx.Graph, placement_point_data_key : str = "ppdata"):
         self._graph = graph
         self._placement_point_data_key = placement_point_data_key
+        self._overlay : Dict[PlacementPointID, PlacementPoint] = {}
+        self._shared = False
+
+    def snapshot(self) -> 'PlacementNetwork':
+        # Copy-on-write copy: the graph is shared as a read-only view and placement
+        # point writes go to a small overlay; get_mutable_graph() copies the structure
+        # only when a stage actually edits it. The view shares the node attribute dicts,
+        # so this network turns copy-on-write as well and its later writes stay out of
+        # the snapshot. Placement points are shared too, so they are replaced through
+        # set_placement_point_data, never modified in place
+        snapshot = PlacementNetwork(self._graph.copy(as_view=True), self._placement_point_data_key)
+        snapshot._overlay = dict(self._overlay)
+        snapshot._shared = True
+        self._shared = True
+        return snapshot
 
     def get_graph(self) -> nx.Graph:
         return self._graph
+
+    def get_mutable_graph(self) -> nx.Graph:
+        if self._shared:
+            self._graph = self._graph.copy()
+            for node_id, data in self._overlay.items():
+                self._graph.nodes[node_id][self._placement_point_data_key] = data
+            self._overlay.clear()
+            self._shared = False
+        return self._graph
     
     def set_graph(self, graph : nx.Graph) -> None:
         self._graph = graph
+        self._overlay.clear()
+        self._shared = False
     
     def get_placement_point_data_key(self) -> str:
         return self._placement_point_data_key
@@ -22,12 +48,17 @@ class PlacementNetwork:
         self._placement_point_data_key = key
 
     def get_placement_point_data(self, node_id : PlacementPointID) -> Optional[PlacementPoint]:
+        if node_id in self._overlay:
+            return self._overlay[node_id]
         if node_id in self._graph:
             return self._graph.nodes[node_id].get(self._placement_point_data_key, None)
         return None
 
     def set_placement_point_data(self, node_id : PlacementPointID, data : PlacementPoint) -> None:
-        if node_id in self._graph:
-            self._graph.nodes[node_id][self._placement_point_data_key] = data
+        if node_id not in self._graph:
+            raise ValueError(f"Node {node_id} not found in the graph.")
+
+        if self._shared:
+            self._overlay[node_id] = data
         else:
-            raise ValueError(f"Node {node_id} not found in the graph.")
\ No newline at end of file
+            self._graph.nodes[node_id][self._placement_point_data_key] = data
\ No newline at end of file
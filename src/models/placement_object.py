@@ -1,6 +1,8 @@
 from typing import Optional
 
 class PlacementObject:
+    __slots__ = ("_unique_name", "_independent_contribution_rate", "_context_contribution_rate")
+
     def __init__(self, unique_name : str,
                  independent_contribution_rate : float,
                  context_contribution_rate : Optional[float] = None) -> None:
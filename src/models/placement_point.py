@@ -4,6 +4,8 @@ from models import PlacementObject
 
 
 class PlacementPointID(object):
+    __slots__ = ("_value",)
+
     UNDERLYING_TYPE = int
 
     def __init__(self, value : UNDERLYING_TYPE) -> None:
@@ -25,6 +27,8 @@ class PlacementPointID(object):
 
 
 class PlacementPoint(object):
+    __slots__ = ("_object", "_id", "_longitude", "_latitude", "_altitude")
+
     def __init__(self, id : PlacementPointID, 
                  longitude : float, latitude : float, altitude : Optional[float] = None,
                  object : PlacementObject | None = None) -> None:
@@ -189,6 +189,12 @@ class MainLayout(BoxLayout):
         self.slider=Slider(min=0,max=1,value=0.5,step=0.01,size_hint_y=None,height=40)
         self.slider.bind(value=lambda s,v: self.d_label.setter('text')(self.d_label,f"Щільність понад MST: {v:.2f}"))
         self._vm.bind(minimum_density=self.slider.setter('min'))
+
+        def _on_density_slider_released(instance, touch):
+            if touch.grab_current is instance:
+                self._vm.switch_mst_density(instance.value)
+
+        self.slider.bind(on_touch_up=_on_density_slider_released)
         sidebar.add_widget(self.d_label)
         sidebar.add_widget(self.d_label_extra)
         sidebar.add_widget(self.slider)
@@ -204,10 +210,12 @@ class MainLayout(BoxLayout):
 
         geo_btn  = ToggleButton(text='Географічна відстань',   group='dist', allow_no_selection=False)
         road_btn = ToggleButton(text='Відстань за дорогами', group='dist', allow_no_selection=False)
+        haversine_btn = ToggleButton(text='Наближена відстань', group='dist', allow_no_selection=False)
 
         def _update_distance_resolver_type(*_):
             geo_btn.state = 'down' if self._vm.distance_resolver_type == DistanceResolverType.GEODETIC else 'normal'
             road_btn.state = 'down' if self._vm.distance_resolver_type == DistanceResolverType.ROADNETWORK else 'normal'
+            haversine_btn.state = 'down' if self._vm.distance_resolver_type == DistanceResolverType.HAVERSINE else 'normal'
         _update_distance_resolver_type()
 
         vm.bind(distance_resolver_type=_update_distance_resolver_type)
@@ -218,8 +226,10 @@ class MainLayout(BoxLayout):
 
         geo_btn.bind(state=lambda _, value: _set_dr_on_activated(DistanceResolverType.GEODETIC, value))
         road_btn.bind(state=lambda _, value: _set_dr_on_activated(DistanceResolverType.ROADNETWORK, value))
+        haversine_btn.bind(state=lambda _, value: _set_dr_on_activated(DistanceResolverType.HAVERSINE, value))
         switch_box.add_widget(geo_btn)
         switch_box.add_widget(road_btn)
+        switch_box.add_widget(haversine_btn)
         sidebar.add_widget(switch_box)
 
         graph_manager_box = BoxLayout(size_hint_y=None, height=40)
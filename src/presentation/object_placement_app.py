@@ -56,6 +56,7 @@ class ObjectPlacementApp(App):
         print("ObjectPlacementApp: on_stop event")
         t = self._autosave(self._vm, self._state_service)
         t.join()
+        self._vm.close()
 
     def export_state(self, destination_path: str | Path) -> None:
         state = deepcopy(AppState.from_vm(self._vm))
@@ -1,6 +1,5 @@
 from functools import wraps, partial
 from enum import Enum
-from copy import deepcopy
 
 import networkx
 
@@ -9,12 +8,18 @@ from kivy.properties import ObjectProperty, AliasProperty, BooleanProperty, Nume
 
 from utils import GraphUtils
 
-from algorithms.distance_resolvers import DistanceResolverType, GeodeticDistanceResolver, RoadNetworkDistanceResolver
-from algorithms.pnetwork_builders import MSTPLinkBuilder
-from algorithms.placement_solvers import AdjPenPlacementAlgorithmGreedy
+from algorithms.distance_resolvers import DistanceResolverType, GeodeticDistanceResolver, RoadNetworkDistanceResolver, \
+    HaversineDistanceResolver
+from algorithms.pnetwork_builders import MSTPLinkBuilder, IncrementalMSTPLinkBuilder
+from algorithms.placement_solvers import AdjPenPlacementAlgorithmGreedy, AdjPenPlacementAlgorithmLocalSearch, \
+    AdjPenPlacementAlgorithmTreeDP
 from algorithms.placement_efficiency import PEffAdjPenDeterminator
 
 from road_network.road_network_provider import RoadNetworkProvider
+from road_network.road_network_store import RoadNetworkStore
+from road_network.road_network_tile_cache import RoadNetworkTileCache
+from road_network.road_distance_cache import RoadDistanceCache
+from road_network.parallel_shortest_paths import ParallelShortestPaths
 
 from presentation.utils.types_conversion import DomainTypeConverter
 
@@ -49,20 +54,39 @@ class PlacementGraphVM(EventDispatcher):
 
     _overall_placement_efficiency = NumericProperty(None, min=0.0, allownone=True)
 
+    # Upper bound on links kept by a density sweep; smaller networks are swept up to
+    # the complete graph so that any slider position is served from the cache
+    MST_SWEEP_MAX_EDGES = 250_000
+
+    # Wall-clock budget of a placement request; better placements are shown as they come
+    PLACEMENT_TIME_BUDGET_S = 10.0
+
     def __init__(self):
         self._id_generator = IDGenerator()
         self._color_generator = UniqueColorGenerator()
 
         self._scheduler = UIBackgroundScheduler()
 
-        self._mstp_link_builder = MSTPLinkBuilder()
+        self._mstp_link_builder = IncrementalMSTPLinkBuilder()
+        self._mst_sweep = None
+        self._mst_sweep_key = None
         self._geodedic_dr = GeodeticDistanceResolver()
-        self._road_network_dr = RoadNetworkDistanceResolver()
-
-        self._rn_rpovider = RoadNetworkProvider()
+        self._haversine_dr = HaversineDistanceResolver()
+        self._rn_store = RoadNetworkStore()
+        self._rn_tile_cache = RoadNetworkTileCache(store=self._rn_store)
+        self._road_network_dr = RoadNetworkDistanceResolver(tile_cache=self._rn_tile_cache,
+                                                             distance_cache=RoadDistanceCache(),
+                                                             landmark_count=16,
+                                                             landmark_dir=self._rn_store.get_store_dir() / "landmarks",
+                                                             parallel_shortest_paths=ParallelShortestPaths())
+
+        self._rn_rpovider = RoadNetworkProvider(tile_cache=self._rn_tile_cache)
         self._rn_should_be_updated = True
 
-        self._adj_pen_placement_algorithm = AdjPenPlacementAlgorithmGreedy()
+        # MST-shaped networks are solved by the tree DP, denser ones by the local search
+        self._adj_pen_fallback_algorithm = AdjPenPlacementAlgorithmLocalSearch(time_budget_s=5.0)
+        self._adj_pen_placement_algorithm = AdjPenPlacementAlgorithmTreeDP(
+            time_budget_s=5.0, fallback_algorithm=self._adj_pen_fallback_algorithm)
         self._p_eff_adj_pen_determinator = PEffAdjPenDeterminator()
 
         self._placement_graph = networkx.Graph()
@@ -332,14 +356,36 @@ class PlacementGraphVM(EventDispatcher):
         self._adjacent_st_penalty = penalty
         return True
     
+    def close(self):
+        # Stops the road search workers and writes the buffered road distance cache updates to disk
+        self._road_network_dr.close()
+
     @blockable
-    @synchronized_request(name="Обчислення MST")
     def compute_mst_links(self, required_density_over_mst=None):
+        if self._mst_sweep_key == self._get_mst_sweep_key() \
+           and self._mst_sweep.covers(required_density_over_mst):
+            return self._apply_mst_links(required_density_over_mst)
+
+        return self._compute_mst_links_sweep(required_density_over_mst)
+
+    @blockable
+    def switch_mst_density(self, required_density_over_mst):
+        if self._mst_sweep_key != self._get_mst_sweep_key():
+            return False
+
+        return self.compute_mst_links(required_density_over_mst)
+
+    @synchronized_request(name="Обчислення MST")
+    def _compute_mst_links_sweep(self, required_density_over_mst=None):
         edges_to_remove = [edge for edge in self._placement_graph.edges(data=True) if edge[2].get('type', None) != 'Доданий вручну']
-        _graph = deepcopy(self._placement_graph)
+        _graph = self._placement_graph.copy()
         _graph.remove_edges_from(edges_to_remove)
 
-        self._mstp_link_builder.set_required_density(required_density_over_mst)
+        sweep_key = self._get_mst_sweep_key()
+        sweep_densities = [required_density_over_mst]
+        if not isinstance(self._mstp_link_builder.get_distance_resolver(), RoadNetworkDistanceResolver) \
+           and GraphUtils.get_edges_count_from_density(_graph.number_of_nodes(), 1.0) <= self.MST_SWEEP_MAX_EDGES:
+            sweep_densities.append(1.0)
 
         def _request():
             if self._rn_should_be_updated \
@@ -357,14 +403,18 @@ class PlacementGraphVM(EventDispatcher):
                     road_network, coords, radius
                 )
             
-            return self._mstp_link_builder.compute_placement_point_links(
-                DomainTypeConverter.convert_graph_to_placement_network(_graph)
+            return self._mstp_link_builder.compute_placement_point_links_sweep(
+                DomainTypeConverter.convert_graph_to_placement_network(_graph), sweep_densities
             )
 
         @PlacementGraphVM.synchronized_response_handler(name="Обчислення MST")
-        def _on_compute_placement_point_links_completed(self, placement_network):
+        def _on_compute_placement_point_links_completed(self, sweep):
+            if sweep is None:
+                return False
             try:
-                self._update_graph(placement_network)
+                self._mst_sweep = sweep
+                self._mst_sweep_key = sweep_key
+                self._apply_mst_links(required_density_over_mst)
             except Exception as _:
                 return False
             return True
@@ -381,6 +431,7 @@ class PlacementGraphVM(EventDispatcher):
             return False
 
         self._adj_pen_placement_algorithm.set_penalty(self._adjacent_st_penalty)
+        self._adj_pen_fallback_algorithm.set_penalty(self._adjacent_st_penalty)
 
         @PlacementGraphVM.synchronized_response_handler(name="Обчислення розміщення")
         def _on_compute_placement_completed(self, placement_network):
@@ -390,13 +441,25 @@ class PlacementGraphVM(EventDispatcher):
                 return False
             return True
 
-        self._scheduler.schedule(partial(self._adj_pen_placement_algorithm.compute_placement,
+        def _on_placement_improved(self, placement_network, total_efficiency):
+            # Interim result of the running request: shown with the solver's efficiency
+            # instead of starting an efficiency computation
+            if not self._incoming_request_blocked or self._status['operation'] != "Обчислення розміщення":
+                return
+            self.unbind(graph=self._eff_on_graph_change_lm)
+            self._update_graph(placement_network)
+            self.bind(graph=self._eff_on_graph_change_lm)
+            self._overall_placement_efficiency = total_efficiency
+
+        self._scheduler.schedule(partial(self._adj_pen_placement_algorithm.compute_placement_anytime,
                                          DomainTypeConverter.convert_graph_to_placement_network(
                                              self._placement_graph
                                          ),
                                          DomainTypeConverter.convert_placement_objects_dict(
                                              self._placement_object_types
-                                         )),
+                                         ),
+                                         partial(self._scheduler.post, partial(_on_placement_improved, self)),
+                                         self.PLACEMENT_TIME_BUDGET_S),
                                  callback=partial(_on_compute_placement_completed, self))
         
         return True
@@ -441,11 +504,29 @@ class PlacementGraphVM(EventDispatcher):
                     for object_type in self._placement_object_types])
     
     def _on_distance_resolver_type_changed(self):
-        self._mstp_link_builder.set_distance_resolver(
-            self._geodedic_dr if self._distance_resolver_type == DistanceResolverType.GEODETIC
-            else self._road_network_dr if self._distance_resolver_type == DistanceResolverType.ROADNETWORK
+        resolver = self._geodedic_dr if self._distance_resolver_type == DistanceResolverType.GEODETIC \
+            else self._road_network_dr if self._distance_resolver_type == DistanceResolverType.ROADNETWORK \
+            else self._haversine_dr if self._distance_resolver_type == DistanceResolverType.HAVERSINE \
             else MSTPLinkBuilder.get_distance_resolver()
-        )
+        # The road search workers and their shared graph are not needed until road mode is back
+        if self._mstp_link_builder.get_distance_resolver() is self._road_network_dr and resolver is not self._road_network_dr:
+            self._road_network_dr.close()
+        self._mstp_link_builder.set_distance_resolver(resolver)
+
+    def _get_mst_sweep_key(self):
+        # Everything a density sweep depends on: resolver, point positions and manual links
+        return (self._distance_resolver_type,
+                frozenset((node_id, data['lat'], data['lon']) for node_id, data in self._placement_graph.nodes(data=True)),
+                frozenset(frozenset((u, v)) for u, v, data in self._placement_graph.edges(data=True)
+                          if data.get('type', None) == 'Доданий вручну'))
+
+    @notify_graph_change
+    def _apply_mst_links(self, required_density_over_mst):
+        edges_to_remove = [(u, v) for u, v, data in self._placement_graph.edges(data=True)
+                           if data.get('type', None) != 'Доданий вручну']
+        self._placement_graph.remove_edges_from(edges_to_remove)
+        self._placement_graph.add_edges_from(self._mst_sweep.get_links(required_density_over_mst))
+        return True
 
     def _set_status(self, status, message, type=None, operation=None):
         self._status['status'] = status
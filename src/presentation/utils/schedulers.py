@@ -10,3 +10,7 @@ class UIBackgroundScheduler:
             Clock.schedule_once(lambda _: callback(result))
 
         threading.Thread(target=_worker, daemon=True).start()
+
+    def post(self, func, *args, **kwargs):
+        # Runs func on the UI thread; safe to call from a scheduled background function
+        Clock.schedule_once(lambda _: func(*args, **kwargs))
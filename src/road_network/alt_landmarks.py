@@ -0,0 +1,165 @@
+import heapq
+from pathlib import Path
+from typing import Optional
+
+import numpy as np
+from scipy.sparse.csgraph import dijkstra
+
+from road_network.compact_road_graph import CompactRoadGraph
+
+
+class AltLandmarks:
+    # Landmark distances are float32, shrinking the bound keeps it admissible after rounding
+    BOUND_SCALE = 1.0 - 1e-5
+    BOUNDS_MATCH_TOLERANCE = 1e-6
+
+    # Long queries are cheaper in the compiled Dijkstra capped by the landmark upper bound
+    SETTLED_NODES_BUDGET = 200
+
+    def __init__(self, graph : CompactRoadGraph, landmarks : np.ndarray,
+                 from_landmarks : np.ndarray, to_landmarks : np.ndarray) -> None:
+        self._graph = graph
+        self._landmarks = landmarks
+        # Shape (node_count, landmark_count), one contiguous row per node
+        self._from_landmarks = from_landmarks
+        self._to_landmarks = to_landmarks
+
+        adjacency = graph.get_adjacency()
+        self._indptr = adjacency.indptr.tolist()
+        self._targets = adjacency.indices.tolist()
+        self._lengths = adjacency.data.astype(np.float64).tolist()
+
+    @classmethod
+    def build(cls, graph : CompactRoadGraph, landmark_count : int = 16) -> 'AltLandmarks':
+        node_count = graph.get_node_count()
+        if node_count == 0:
+            raise ValueError("Road network has no nodes")
+
+        adjacency = graph.get_adjacency()
+        landmark_count = min(landmark_count, node_count)
+
+        # Farthest-point selection on the undirected graph spreads landmarks to the periphery
+        landmarks = [int(np.argmin(graph.get_lons() + graph.get_lats()))]
+        min_dist = dijkstra(adjacency, directed=False, indices=landmarks[0])
+        while len(landmarks) < landmark_count:
+            reachable = np.where(np.isfinite(min_dist), min_dist, -1.0)
+            candidate = int(np.argmax(reachable))
+            if reachable[candidate] <= 0.0:
+                candidate = int(np.flatnonzero(np.isinf(min_dist))[0]) if np.isinf(min_dist).any() else -1
+            if candidate < 0:
+                break
+            landmarks.append(candidate)
+            min_dist = np.minimum(min_dist, dijkstra(adjacency, directed=False, indices=candidate))
+
+        landmarks = np.array(landmarks, dtype=np.int32)
+        from_landmarks = dijkstra(adjacency, directed=True, indices=landmarks).T.astype(np.float32)
+        to_landmarks = dijkstra(adjacency.transpose().tocsr(), directed=True,
+                                indices=landmarks).T.astype(np.float32)
+
+        print(f"AltLandmarks: built {len(landmarks)} landmarks for {node_count} nodes")
+        return cls(graph, landmarks, np.ascontiguousarray(from_landmarks),
+                   np.ascontiguousarray(to_landmarks))
+
+    @classmethod
+    def load_or_build(cls, graph : CompactRoadGraph, landmark_dir : Optional[Path | str] = None,
+                      landmark_count : int = 16) -> 'AltLandmarks':
+        if landmark_dir is None:
+            return cls.build(graph, landmark_count)
+
+        path = Path(landmark_dir) / f"{graph.get_fingerprint()}.alt.npz"
+        if path.exists():
+            try:
+                with np.load(path, allow_pickle=False) as data:
+                    if len(data["landmarks"]) >= min(landmark_count, graph.get_node_count()):
+                        return cls(graph, data["landmarks"], data["from_landmarks"], data["to_landmarks"])
+            except Exception as e:
+                print(f"AltLandmarks: failed to load {path}: {e}")
+
+        landmarks = cls.build(graph, landmark_count)
+        landmarks.save(path)
+        return landmarks
+
+    def save(self, path : Path | str) -> None:
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(path, "wb") as f:
+            np.savez_compressed(f,
+                                landmarks=self._landmarks,
+                                from_landmarks=self._from_landmarks,
+                                to_landmarks=self._to_landmarks)
+
+    def get_graph(self) -> CompactRoadGraph:
+        return self._graph
+
+    def get_landmark_count(self) -> int:
+        return len(self._landmarks)
+
+    def get_lower_bound(self, source : int, target : int) -> float:
+        bound = self._bound_function(target)
+        return bound(source)
+
+    def get_upper_bound(self, source : int, target : int) -> float:
+        # d(s,L) + d(L,t) for the best landmark
+        return float(np.min(self._to_landmarks[source].astype(np.float64) + self._from_landmarks[target]))
+
+    def get_distance(self, source : int, target : int) -> float:
+        if source == target:
+            return 0.0
+
+        bound = self._bound_function(target)
+        lower = bound(source)
+        if lower == float("inf"):
+            return float("inf")
+
+        upper = self.get_upper_bound(source, target)
+        if upper - lower / self.BOUND_SCALE <= self.BOUNDS_MATCH_TOLERANCE * upper:
+            return upper
+
+        indptr, targets, lengths = self._indptr, self._targets, self._lengths
+
+        dist = {source: 0.0}
+        bounds = {}
+        closed = set()
+        queue = [(lower, source)]
+
+        while queue:
+            _, node = heapq.heappop(queue)
+            if node == target:
+                return dist[node]
+            if node in closed:
+                continue
+            closed.add(node)
+            if len(closed) > self.SETTLED_NODES_BUDGET:
+                return float(dijkstra(self._graph.get_adjacency(), directed=True, indices=source,
+                                      limit=upper * (1.0 + self.BOUNDS_MATCH_TOLERANCE),
+                                      min_only=True)[target])
+
+            node_dist = dist[node]
+            for k in range(indptr[node], indptr[node + 1]):
+                neighbour = targets[k]
+                if neighbour in closed:
+                    continue
+                candidate = node_dist + lengths[k]
+                if candidate < dist.get(neighbour, float("inf")):
+                    dist[neighbour] = candidate
+                    if neighbour not in bounds:
+                        bounds[neighbour] = bound(neighbour)
+                    if bounds[neighbour] != float("inf"):
+                        heapq.heappush(queue, (candidate + bounds[neighbour], neighbour))
+
+        return float("inf")
+
+    def _bound_function(self, target : int):
+        from_target = self._from_landmarks[target].astype(np.float64)
+        to_target = self._to_landmarks[target].astype(np.float64)
+        from_landmarks, to_landmarks = self._from_landmarks, self._to_landmarks
+        scale = self.BOUND_SCALE
+
+        def _bound(node : int) -> float:
+            with np.errstate(invalid="ignore"):
+                # d(L,t) - d(L,v) and d(v,L) - d(t,L), landmarks unrelated to both yield nan
+                bound = np.fmax(from_target - from_landmarks[node], to_landmarks[node] - to_target)
+            bound = np.nanmax(bound) if not np.isnan(bound).all() else 0.0
+            return max(float(bound), 0.0) * scale
+
+        return _bound
@@ -0,0 +1,179 @@
+import hashlib
+from pathlib import Path
+from typing import Optional, Sequence
+
+import numpy as np
+from networkx import MultiDiGraph, compose_all
+from scipy.sparse import csr_matrix
+from scipy.sparse.csgraph import dijkstra
+
+
+class CompactRoadGraph:
+    def __init__(self, node_ids : np.ndarray, lons : np.ndarray, lats : np.ndarray,
+                 adjacency : csr_matrix, source_graph : Optional[MultiDiGraph] = None) -> None:
+        if np.any(np.diff(node_ids) <= 0):
+            raise ValueError("Node ids must be unique and sorted in ascending order")
+
+        self._node_ids : np.ndarray = np.asarray(node_ids, dtype=np.int64)
+        self._lons : np.ndarray = np.asarray(lons, dtype=np.float64)
+        self._lats : np.ndarray = np.asarray(lats, dtype=np.float64)
+        self._adjacency : csr_matrix = adjacency
+        self._source_graph : Optional[MultiDiGraph] = source_graph
+        self._fingerprint : Optional[str] = None
+        self._reverse_adjacency : Optional[csr_matrix] = None
+
+    @classmethod
+    def from_networkx(cls, graph : MultiDiGraph, weight : str = "length",
+                      keep_source : bool = False) -> 'CompactRoadGraph':
+        node_ids = np.array(sorted(graph.nodes()), dtype=np.int64)
+        lons = np.fromiter((graph.nodes[n]["x"] for n in node_ids.tolist()), dtype=np.float64,
+                           count=len(node_ids))
+        lats = np.fromiter((graph.nodes[n]["y"] for n in node_ids.tolist()), dtype=np.float64,
+                           count=len(node_ids))
+
+        edges = [(u, v, data.get(weight, np.inf)) for u, v, data in graph.edges(data=True)]
+        sources = np.searchsorted(node_ids, np.fromiter((e[0] for e in edges), dtype=np.int64,
+                                                         count=len(edges)))
+        targets = np.searchsorted(node_ids, np.fromiter((e[1] for e in edges), dtype=np.int64,
+                                                         count=len(edges)))
+        lengths = np.fromiter((e[2] for e in edges), dtype=np.float64, count=len(edges))
+
+        return cls(node_ids, lons, lats,
+                   cls._build_adjacency(len(node_ids), sources, targets, lengths),
+                   graph if keep_source else None)
+
+    @classmethod
+    def empty(cls) -> 'CompactRoadGraph':
+        return cls(np.empty(0, dtype=np.int64), np.empty(0), np.empty(0),
+                   csr_matrix((0, 0), dtype=np.float32))
+
+    @classmethod
+    def compose(cls, graphs : Sequence['CompactRoadGraph']) -> 'CompactRoadGraph':
+        graphs = [g for g in graphs if g.get_node_count() > 0]
+        if not graphs:
+            return cls.empty()
+
+        all_ids = np.concatenate([g.get_node_ids() for g in graphs])
+        node_ids, first = np.unique(all_ids, return_index=True)
+        lons = np.concatenate([g.get_lons() for g in graphs])[first]
+        lats = np.concatenate([g.get_lats() for g in graphs])[first]
+
+        sources, targets, lengths = [], [], []
+        for g in graphs:
+            adjacency = g.get_adjacency()
+            rows = np.repeat(np.arange(g.get_node_count()), np.diff(adjacency.indptr))
+            sources.append(np.searchsorted(node_ids, g.get_node_ids()[rows]))
+            targets.append(np.searchsorted(node_ids, g.get_node_ids()[adjacency.indices]))
+            lengths.append(adjacency.data)
+
+        source_graphs = [g.get_source_graph() for g in graphs]
+        source_graph = compose_all(source_graphs) if all(sg is not None for sg in source_graphs) else None
+
+        return cls(node_ids, lons, lats,
+                   cls._build_adjacency(len(node_ids), np.concatenate(sources),
+                                        np.concatenate(targets), np.concatenate(lengths)),
+                   source_graph)
+
+    @classmethod
+    def load(cls, path : str | Path) -> 'CompactRoadGraph':
+        with np.load(Path(path), allow_pickle=False) as data:
+            node_count = len(data["node_ids"])
+            adjacency = csr_matrix((data["lengths"], data["targets"], data["indptr"]),
+                                   shape=(node_count, node_count))
+            return cls(data["node_ids"], data["lons"], data["lats"], adjacency)
+
+    def save(self, path : str | Path) -> None:
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(path, "wb") as f:
+            np.savez_compressed(f,
+                                node_ids=self._node_ids,
+                                lons=self._lons,
+                                lats=self._lats,
+                                indptr=self._adjacency.indptr,
+                                targets=self._adjacency.indices,
+                                lengths=self._adjacency.data)
+
+    def get_subgraph(self, node_indices : Sequence[int]) -> 'CompactRoadGraph':
+        node_indices = np.unique(np.asarray(node_indices, dtype=np.int64))
+        adjacency = self._adjacency[node_indices][:, node_indices].tocsr()
+        adjacency.sort_indices()
+        return CompactRoadGraph(self._node_ids[node_indices],
+                                self._lons[node_indices],
+                                self._lats[node_indices],
+                                adjacency)
+
+    def get_neighbour_indices(self, node_indices : Sequence[int]) -> np.ndarray:
+        if self._reverse_adjacency is None:
+            self._reverse_adjacency = self._adjacency.transpose().tocsr()
+        node_indices = np.asarray(node_indices, dtype=np.int64)
+        return np.unique(np.concatenate((self._adjacency[node_indices].indices,
+                                         self._reverse_adjacency[node_indices].indices)))
+
+    def get_bounds(self) -> tuple[float, float, float, float]:
+        return (float(self._lons.min()), float(self._lats.min()),
+                float(self._lons.max()), float(self._lats.max()))
+
+    @staticmethod
+    def _build_adjacency(node_count : int, sources : np.ndarray, targets : np.ndarray,
+                         lengths : np.ndarray) -> csr_matrix:
+        # Parallel edges collapse to the shortest one, self-loops never shorten a path
+        keep = sources != targets
+        sources, targets, lengths = sources[keep], targets[keep], lengths[keep]
+
+        order = np.lexsort((lengths, targets, sources))
+        sources, targets, lengths = sources[order], targets[order], lengths[order]
+
+        first = np.ones(len(sources), dtype=bool)
+        first[1:] = (sources[1:] != sources[:-1]) | (targets[1:] != targets[:-1])
+        sources, targets, lengths = sources[first], targets[first], lengths[first]
+
+        indptr = np.zeros(node_count + 1, dtype=np.int32)
+        np.add.at(indptr, sources + 1, 1)
+        np.cumsum(indptr, out=indptr)
+
+        return csr_matrix((lengths.astype(np.float32), targets.astype(np.int32), indptr),
+                          shape=(node_count, node_count))
+
+    def get_node_count(self) -> int:
+        return len(self._node_ids)
+
+    def get_edge_count(self) -> int:
+        return self._adjacency.nnz
+
+    def get_node_ids(self) -> np.ndarray:
+        return self._node_ids
+
+    def get_lons(self) -> np.ndarray:
+        return self._lons
+
+    def get_lats(self) -> np.ndarray:
+        return self._lats
+
+    def get_adjacency(self) -> csr_matrix:
+        return self._adjacency
+
+    def get_source_graph(self) -> Optional[MultiDiGraph]:
+        return self._source_graph
+
+    def get_fingerprint(self) -> str:
+        if self._fingerprint is None:
+            digest = hashlib.sha1()
+            for array in (self._node_ids, self._adjacency.indptr,
+                          self._adjacency.indices, self._adjacency.data):
+                digest.update(np.ascontiguousarray(array).tobytes())
+            self._fingerprint = digest.hexdigest()
+        return self._fingerprint
+
+    def get_node_indices(self, node_ids : Sequence[int]) -> np.ndarray:
+        node_ids = np.asarray(node_ids, dtype=np.int64)
+        indices = np.searchsorted(self._node_ids, node_ids)
+        if np.any(indices >= len(self._node_ids)) or \
+           np.any(self._node_ids[np.minimum(indices, len(self._node_ids) - 1)] != node_ids):
+            raise ValueError("Node not found in the road network")
+        return indices
+
+    def get_shortest_path_lengths(self, source_indices : Sequence[int], limit : float = np.inf) -> np.ndarray:
+        # Searches stop at limit, nodes further away come back as inf
+        return dijkstra(self._adjacency, directed=True,
+                        indices=np.asarray(source_indices, dtype=np.int32), limit=limit)
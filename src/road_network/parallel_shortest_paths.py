@@ -0,0 +1,100 @@
+import os
+import shutil
+import tempfile
+import threading
+from pathlib import Path
+from typing import Dict, Optional, Sequence
+
+import numpy as np
+from scipy.sparse import csr_matrix
+from scipy.sparse.csgraph import dijkstra
+
+from road_network.compact_road_graph import CompactRoadGraph
+
+from utils import SpawnProcessPool
+
+
+_worker_graphs: Dict[str, csr_matrix] = {}
+
+
+def _load_shared_graph(graph_dir: str) -> csr_matrix:
+    if graph_dir not in _worker_graphs:
+        # Memory-mapped arrays share the page cache between all workers
+        indptr = np.load(os.path.join(graph_dir, "indptr.npy"), mmap_mode="r")
+        targets = np.load(os.path.join(graph_dir, "targets.npy"), mmap_mode="r")
+        lengths = np.load(os.path.join(graph_dir, "lengths.npy"), mmap_mode="r")
+        node_count = len(indptr) - 1
+        _worker_graphs.clear()
+        _worker_graphs[graph_dir] = csr_matrix((lengths, targets, indptr), shape=(node_count, node_count))
+    return _worker_graphs[graph_dir]
+
+
+def _compute_rows(graph_dir: str, source_indices: np.ndarray, target_indices: np.ndarray,
+                  limit: float = np.inf) -> np.ndarray:
+    adjacency = _load_shared_graph(graph_dir)
+    return dijkstra(adjacency, directed=True, indices=source_indices, limit=limit)[:, target_indices]
+
+
+class ParallelShortestPaths:
+    # Below this many searches the pool start-up costs more than it saves
+    MIN_PARALLEL_SOURCES = 64
+
+    def __init__(self, workers: Optional[int] = None):
+        self._pool = SpawnProcessPool(workers)
+        self._lock = threading.Lock()
+        self._shared_dir: Optional[Path] = None
+        self._shared_fingerprint: Optional[str] = None
+
+    def get_workers(self) -> int:
+        return self._pool.get_workers()
+
+    def set_workers(self, workers: int) -> None:
+        self._pool.set_workers(workers)
+
+    def get_shortest_path_lengths(self, graph: CompactRoadGraph,
+                                  source_indices: Sequence[int],
+                                  target_indices: Sequence[int],
+                                  limit: float = np.inf) -> np.ndarray:
+        source_indices = np.asarray(source_indices, dtype=np.int32)
+        target_indices = np.asarray(target_indices, dtype=np.int32)
+
+        workers = self._pool.get_workers()
+        if workers <= 1 or len(source_indices) < self.MIN_PARALLEL_SOURCES:
+            return graph.get_shortest_path_lengths(source_indices, limit)[:, target_indices]
+
+        with self._lock:
+            graph_dir = str(self._share_graph(graph))
+        executor = self._pool.get_executor()
+
+        chunks = np.array_split(source_indices, min(len(source_indices), workers * 4))
+        futures = [executor.submit(_compute_rows, graph_dir, chunk, target_indices, limit)
+                   for chunk in chunks if len(chunk)]
+        return np.vstack([future.result() for future in futures])
+
+    def close(self) -> None:
+        self._pool.shutdown()
+        with self._lock:
+            self._remove_shared_graph()
+
+    def _share_graph(self, graph: CompactRoadGraph) -> Path:
+        if self._shared_dir is not None and self._shared_fingerprint == graph.get_fingerprint():
+            return self._shared_dir
+
+        self._remove_shared_graph()
+
+        shared_dir = Path(tempfile.mkdtemp(prefix="road_graph_"))
+        adjacency = graph.get_adjacency()
+        np.save(shared_dir / "indptr.npy", adjacency.indptr)
+        np.save(shared_dir / "targets.npy", adjacency.indices)
+        # csgraph works on float64, storing it so avoids a per-call conversion copy in the workers
+        np.save(shared_dir / "lengths.npy", adjacency.data.astype(np.float64))
+
+        self._shared_dir = shared_dir
+        self._shared_fingerprint = graph.get_fingerprint()
+        return shared_dir
+
+    def _remove_shared_graph(self) -> None:
+        if self._shared_dir is not None:
+            shutil.rmtree(self._shared_dir, ignore_errors=True)
+            self._shared_dir = None
+            self._shared_fingerprint = None
@@ -0,0 +1,204 @@
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Dict, Iterable, Optional, Sequence, Tuple
+
+import numpy as np
+
+from utils import AppPaths
+
+
+class RoadDistanceCache:
+    IN_MEMORY = ":memory:"
+
+    # 1e-5 deg is ~1.1 m of latitude
+    QUANTIZATION_DEG = 1e-5
+
+    # Writes stay in the open transaction (visible to this connection) and LRU touches
+    # are buffered; both reach the database once per batch, on flush() or close()
+    COMMIT_BATCH_ROWS = 4096
+    COMMIT_INTERVAL_S = 5.0
+
+    def __init__(self, cache_path: Path | str | None = None, max_entries: int = 2_000_000):
+        if cache_path is None:
+            cache_path = AppPaths.get_entry_dir() / "state" / "road_distances.sqlite"
+
+        if str(cache_path) != self.IN_MEMORY:
+            Path(cache_path).parent.mkdir(parents=True, exist_ok=True)
+
+        self._max_entries = max_entries
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(str(cache_path), check_same_thread=False)
+        self._connection.executescript("""
+            CREATE TABLE IF NOT EXISTS distances (
+                fingerprint TEXT NOT NULL,
+                o_lon INTEGER NOT NULL, o_lat INTEGER NOT NULL,
+                d_lon INTEGER NOT NULL, d_lat INTEGER NOT NULL,
+                distance REAL NOT NULL,
+                last_used INTEGER NOT NULL,
+                PRIMARY KEY (fingerprint, o_lon, o_lat, d_lon, d_lat)
+            ) WITHOUT ROWID;
+            CREATE INDEX IF NOT EXISTS distances_last_used ON distances (last_used);
+        """)
+
+        self._clock = self._connection.execute(
+            "SELECT COALESCE(MAX(last_used), 0) FROM distances").fetchone()[0]
+        self._entries = self._connection.execute("SELECT COUNT(*) FROM distances").fetchone()[0]
+        self._hits = 0
+        self._misses = 0
+
+        self._pending_touches: Dict[Tuple, int] = {}
+        self._pending_origin_touches: Dict[Tuple, int] = {}
+        self._uncommitted_rows = 0
+        self._last_commit = time.monotonic()
+
+    def get_max_entries(self) -> int:
+        return self._max_entries
+
+    def set_max_entries(self, max_entries: int) -> None:
+        self._max_entries = max_entries
+        with self._lock:
+            self._evict()
+
+    def get_stats(self) -> Dict[str, int]:
+        return {"hits": self._hits, "misses": self._misses, "entries": self._entries}
+
+    def get(self, fingerprint: str,
+            origin: Tuple[float, float], dest: Tuple[float, float]) -> Optional[float]:
+        key = (fingerprint, *self._quantize(origin), *self._quantize(dest))
+
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT distance FROM distances "
+                "WHERE fingerprint=? AND o_lon=? AND o_lat=? AND d_lon=? AND d_lat=?", key).fetchone()
+
+            if row is None:
+                self._misses += 1
+                return None
+
+            self._hits += 1
+            self._clock += 1
+            self._pending_touches[key] = self._clock
+            self._flush_if_due()
+            return row[0]
+
+    def get_matrix(self, fingerprint: str,
+                   origins: Sequence[Tuple[float, float]],
+                   destinations: Sequence[Tuple[float, float]]) -> np.ndarray:
+        matrix = np.full((len(origins), len(destinations)), np.nan, dtype=np.float64)
+        dest_keys = [self._quantize(d) for d in destinations]
+
+        with self._lock:
+            self._clock += 1
+            rows_by_origin = {}
+            for i, origin in enumerate(origins):
+                o_key = self._quantize(origin)
+                if o_key not in rows_by_origin:
+                    rows_by_origin[o_key] = dict(
+                        ((d_lon, d_lat), distance) for d_lon, d_lat, distance in self._connection.execute(
+                            "SELECT d_lon, d_lat, distance FROM distances "
+                            "WHERE fingerprint=? AND o_lon=? AND o_lat=?", (fingerprint, *o_key)))
+                    if rows_by_origin[o_key]:
+                        self._pending_origin_touches[(fingerprint, *o_key)] = self._clock
+
+                row = rows_by_origin[o_key]
+                for j, d_key in enumerate(dest_keys):
+                    distance = row.get(d_key)
+                    if distance is not None:
+                        matrix[i, j] = distance
+
+            self._flush_if_due()
+
+        hits = int(np.count_nonzero(~np.isnan(matrix)))
+        self._hits += hits
+        self._misses += matrix.size - hits
+        return matrix
+
+    def put(self, fingerprint: str,
+            entries: Iterable[Tuple[Tuple[float, float], Tuple[float, float], float]]) -> None:
+        with self._lock:
+            self._clock += 1
+            rows = [(fingerprint, *self._quantize(origin), *self._quantize(dest), float(distance), self._clock)
+                    for origin, dest, distance in entries]
+            if not rows:
+                return
+
+            # Distances of a graph fingerprint never change, so known keys are kept as they are
+            inserted = self._connection.executemany(
+                "INSERT OR IGNORE INTO distances "
+                "(fingerprint, o_lon, o_lat, d_lon, d_lat, distance, last_used) VALUES (?, ?, ?, ?, ?, ?, ?)",
+                rows).rowcount
+            self._entries += inserted
+            self._uncommitted_rows += inserted
+            if inserted < len(rows):
+                self._pending_touches.update((row[:5], self._clock) for row in rows)
+
+            self._evict()
+            self._flush_if_due()
+
+    def flush(self) -> None:
+        with self._lock:
+            self._flush()
+
+    def close(self) -> None:
+        with self._lock:
+            self._flush()
+            self._connection.close()
+
+    def clear(self) -> None:
+        with self._lock:
+            self._pending_touches.clear()
+            self._pending_origin_touches.clear()
+            self._connection.execute("DELETE FROM distances")
+            self._connection.commit()
+            self._uncommitted_rows = 0
+            self._last_commit = time.monotonic()
+            self._entries = 0
+            self._hits = 0
+            self._misses = 0
+
+    def _flush_if_due(self) -> None:
+        pending = self._uncommitted_rows + len(self._pending_touches) + len(self._pending_origin_touches)
+        if pending >= self.COMMIT_BATCH_ROWS or \
+                pending and time.monotonic() - self._last_commit >= self.COMMIT_INTERVAL_S:
+            self._flush()
+
+    def _flush(self) -> None:
+        self._write_touches()
+        self._connection.commit()
+        self._uncommitted_rows = 0
+        self._last_commit = time.monotonic()
+
+    def _write_touches(self) -> None:
+        if self._pending_touches:
+            self._connection.executemany(
+                "UPDATE distances SET last_used=? "
+                "WHERE fingerprint=? AND o_lon=? AND o_lat=? AND d_lon=? AND d_lat=?",
+                [(clock, *key) for key, clock in self._pending_touches.items()])
+            self._pending_touches.clear()
+        if self._pending_origin_touches:
+            self._connection.executemany(
+                "UPDATE distances SET last_used=? WHERE fingerprint=? AND o_lon=? AND o_lat=?",
+                [(clock, *key) for key, clock in self._pending_origin_touches.items()])
+            self._pending_origin_touches.clear()
+
+    def _evict(self) -> None:
+        if self._entries <= self._max_entries:
+            return
+
+        # Evict a little more than needed so puts don't evict on every call
+        self._write_touches()
+        to_remove = self._entries - int(self._max_entries * 0.9)
+        removed = self._connection.execute(
+            "DELETE FROM distances WHERE (fingerprint, o_lon, o_lat, d_lon, d_lat) IN ("
+            "SELECT fingerprint, o_lon, o_lat, d_lon, d_lat FROM distances ORDER BY last_used LIMIT ?)",
+            (to_remove,)).rowcount
+        self._entries -= removed
+        self._flush()
+        print(f"RoadDistanceCache: evicted {removed} least recently used distances")
+
+    @classmethod
+    def _quantize(cls, point: Tuple[float, float]) -> Tuple[int, int]:
+        return (int(round(point[0] / cls.QUANTIZATION_DEG)),
+                int(round(point[1] / cls.QUANTIZATION_DEG)))
@@ -1,18 +1,21 @@
-import osmnx as ox
 import numpy as np
 import miniball
-from networkx import Graph, MultiDiGraph
+from networkx import Graph
 from typing import Tuple
 from math import sqrt
 
+from road_network.compact_road_graph import CompactRoadGraph
+from road_network.road_network_tile_cache import RoadNetworkTileCache
+
 
 class RoadNetworkProvider:
-    def __init__(self):
+    def __init__(self, tile_cache: RoadNetworkTileCache | None = None):
         self._cache_center: Tuple[float, float] | None = None
         self._cache_radius_m: float | None = None
-        self._cache_network: MultiDiGraph | None = None
+        self._cache_network: CompactRoadGraph | None = None
+        self._tile_cache = tile_cache if tile_cache is not None else RoadNetworkTileCache()
 
-    def get_road_network_coverage(self, graph: Graph, buffer_km: float) -> MultiDiGraph:
+    def get_road_network_coverage(self, graph: Graph, buffer_km: float) -> CompactRoadGraph:
             if graph.number_of_nodes() == 0:
                 raise ValueError("Input graph has no nodes")
 
@@ -31,9 +34,6 @@ class RoadNetworkProvider:
             radius_with_buffer_deg = radius_deg + (buffer_km / 111.0)
             radius_m = radius_with_buffer_deg * 111000
 
-            if radius_m > 35000 / 2:
-                 raise ValueError("Distance is too large, consider using a different method.")
-
             center = (float(tuple(center)[0]), float(tuple(center)[1]))
 
             if self._cache_center and self._cache_radius_m and self._cache_network:
@@ -45,16 +45,10 @@ class RoadNetworkProvider:
                     print("RoadNetworkProvider: returning cached road network.")
                     return self._cache_network, self._cache_center, self._cache_radius_m / 1_000.0
 
-            network = ox.graph_from_point(center,
-                                          dist=radius_m,
-                                          network_type='drive',
-                                          simplify=True,
-                                          truncate_by_edge=True)
+            network = self._tile_cache.get_coverage(center, radius_m)
             
             self._cache_center = center
             self._cache_radius_m = radius_m
             self._cache_network = network
 
-            print(center)
-            print(radius_m / 1000)
             return network, center, radius_m / 1000
\ No newline at end of file
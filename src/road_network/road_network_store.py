@@ -0,0 +1,139 @@
+import threading
+from math import cos, radians
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+import osmnx as ox
+
+from road_network.compact_road_graph import CompactRoadGraph
+from road_network.road_node_snapper import RoadNodeSnapper
+
+from utils import AppPaths
+
+
+class RoadNetworkStore:
+    EXTRACT_SUFFIXES = (".osm", ".osm.bz2", ".osm.pbf")
+    ARTIFACT_SUFFIX = ".npz"
+
+    # Mirrors the osmnx "drive" network filter used for Overpass queries
+    EXCLUDED_HIGHWAYS = {"abandoned", "bridleway", "bus_guideway", "construction", "corridor",
+                         "cycleway", "elevator", "escalator", "footway", "no", "path", "pedestrian",
+                         "planned", "platform", "proposed", "raceway", "razed", "service", "steps",
+                         "track"}
+
+    def __init__(self, store_dir: Path | str | None = None):
+        if store_dir is None:
+            store_dir = AppPaths.get_entry_dir() / "road_networks"
+
+        self._store_dir = Path(store_dir)
+        self._lock = threading.Lock()
+        self._loaded: Dict[Path, Tuple[CompactRoadGraph, RoadNodeSnapper]] = {}
+
+    def get_store_dir(self) -> Path:
+        return self._store_dir
+
+    def ingest(self, extract_path: Path | str) -> Path:
+        extract_path = Path(extract_path)
+        name = extract_path.name
+        suffix = next((s for s in self.EXTRACT_SUFFIXES if name.endswith(s)), None)
+        if suffix is None:
+            raise ValueError(f"Unsupported road network extract: {extract_path}")
+        if suffix == ".osm.pbf":
+            raise ValueError(f"PBF extracts are not supported, convert {extract_path} to .osm "
+                             f"(e.g. 'osmium cat {name} -o {name[:-len(suffix)]}.osm')")
+
+        artifact_path = self._store_dir / (name[:-len(suffix)] + self.ARTIFACT_SUFFIX)
+
+        graph = ox.graph_from_xml(extract_path, simplify=False, retain_all=True)
+        graph.remove_edges_from([(u, v, k) for u, v, k, data in graph.edges(keys=True, data=True)
+                                 if not self._is_drivable(data)])
+        graph.remove_nodes_from([n for n in list(graph.nodes()) if graph.degree(n) == 0])
+        if graph.number_of_nodes() == 0:
+            raise ValueError(f"Road network extract {extract_path} has no nodes")
+
+        CompactRoadGraph.from_networkx(ox.simplify_graph(graph)).save(artifact_path)
+        print(f"RoadNetworkStore: ingested {extract_path} → {artifact_path}")
+
+        with self._lock:
+            self._loaded.pop(artifact_path, None)
+        return artifact_path
+
+    def ingest_pending(self) -> None:
+        if not self._store_dir.exists():
+            return
+
+        for extract_path in sorted(self._store_dir.iterdir()):
+            name = extract_path.name
+            suffix = next((s for s in self.EXTRACT_SUFFIXES if name.endswith(s)), None)
+            if suffix is None:
+                continue
+
+            artifact_path = self._store_dir / (name[:-len(suffix)] + self.ARTIFACT_SUFFIX)
+            if artifact_path.exists() and artifact_path.stat().st_mtime >= extract_path.stat().st_mtime:
+                continue
+
+            try:
+                self.ingest(extract_path)
+            except Exception as e:
+                print(f"RoadNetworkStore: ingest of {extract_path} failed: {e}")
+
+    def get_coverage(self, center: Tuple[float, float], radius_m: float) -> Optional[CompactRoadGraph]:
+        lat, lon = center
+        d_lat = radius_m / 111_320.0
+        d_lon = radius_m / (111_320.0 * max(cos(radians(lat)), 1e-6))
+
+        self.ingest_pending()
+
+        for artifact_path in self._get_artifact_paths():
+            graph, snapper = self._load(artifact_path)
+            min_lon, min_lat, max_lon, max_lat = graph.get_bounds()
+            if min_lon <= lon - d_lon and lon + d_lon <= max_lon and \
+               min_lat <= lat - d_lat and lat + d_lat <= max_lat:
+                print(f"RoadNetworkStore: serving coverage from {artifact_path.name}")
+                return graph.get_subgraph(snapper.query_radius(lon, lat, radius_m))
+
+        return None
+
+    @classmethod
+    def _is_drivable(cls, edge_data: dict) -> bool:
+        highway = edge_data.get("highway")
+        highways = highway if isinstance(highway, list) else [highway]
+        return all(h is not None and h not in cls.EXCLUDED_HIGHWAYS for h in highways) \
+            and edge_data.get("area") != "yes" \
+            and edge_data.get("motor_vehicle") != "no" \
+            and edge_data.get("motorcar") != "no"
+
+    def get_bbox_coverage(self, west: float, south: float,
+                          east: float, north: float) -> Optional[CompactRoadGraph]:
+        self.ingest_pending()
+
+        parts = []
+        for artifact_path in self._get_artifact_paths():
+            graph, _ = self._load(artifact_path)
+            min_lon, min_lat, max_lon, max_lat = graph.get_bounds()
+            if max_lon < west or east < min_lon or max_lat < south or north < min_lat:
+                continue
+
+            lons, lats = graph.get_lons(), graph.get_lats()
+            inside = np.flatnonzero((west <= lons) & (lons <= east) & (south <= lats) & (lats <= north))
+            if len(inside) == 0:
+                continue
+            # Keep edges crossing the box together with their outer nodes, like truncate_by_edge
+            parts.append(graph.get_subgraph(np.union1d(inside, graph.get_neighbour_indices(inside))))
+
+        if not parts:
+            return None
+        return CompactRoadGraph.compose(parts)
+
+    def _get_artifact_paths(self) -> list[Path]:
+        if not self._store_dir.exists():
+            return []
+        return sorted(self._store_dir.glob("*" + self.ARTIFACT_SUFFIX))
+
+    def _load(self, artifact_path: Path) -> Tuple[CompactRoadGraph, RoadNodeSnapper]:
+        with self._lock:
+            if artifact_path not in self._loaded:
+                graph = CompactRoadGraph.load(artifact_path)
+                self._loaded[artifact_path] = (graph, RoadNodeSnapper.from_graph(graph))
+            return self._loaded[artifact_path]
@@ -0,0 +1,114 @@
+import threading
+from collections import OrderedDict
+from math import cos, floor, radians
+from typing import List, Optional, Tuple
+
+import osmnx as ox
+
+from road_network.compact_road_graph import CompactRoadGraph
+from road_network.road_network_store import RoadNetworkStore
+
+
+class RoadNetworkTileCache:
+    def __init__(self, tile_size_deg: float = 0.1, max_tiles: int = 400,
+                 store: Optional[RoadNetworkStore] = None,
+                 keep_source_graph: bool = False):
+        self._tile_size_deg = tile_size_deg
+        self._max_tiles = max_tiles
+        self._store = store
+        self._keep_source_graph = keep_source_graph
+
+        self._lock = threading.Lock()
+        self._tiles: "OrderedDict[Tuple[int, int], CompactRoadGraph]" = OrderedDict()
+
+    def get_tile_size_deg(self) -> float:
+        return self._tile_size_deg
+
+    def get_max_tiles(self) -> int:
+        return self._max_tiles
+
+    def set_max_tiles(self, max_tiles: int) -> None:
+        with self._lock:
+            self._max_tiles = max_tiles
+            self._evict()
+
+    def get_keep_source_graph(self) -> bool:
+        return self._keep_source_graph
+
+    def set_keep_source_graph(self, keep_source_graph: bool) -> None:
+        with self._lock:
+            if keep_source_graph != self._keep_source_graph:
+                # Loaded tiles were converted with the other setting
+                self._tiles.clear()
+            self._keep_source_graph = keep_source_graph
+
+    def get_loaded_tile_count(self) -> int:
+        return len(self._tiles)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._tiles.clear()
+
+    def get_coverage(self, center: Tuple[float, float], radius_m: float) -> CompactRoadGraph:
+        lat, lon = center
+        d_lat = radius_m / 111_320.0
+        d_lon = radius_m / (111_320.0 * max(cos(radians(lat)), 1e-6))
+
+        keys = self._get_tile_keys(lon - d_lon, lat - d_lat, lon + d_lon, lat + d_lat)
+        if len(keys) > self._max_tiles:
+            # Tiles stream through the cache: the stitched coverage holds all of them, the cache
+            # keeps only the most recent ones for the next request
+            print(f"RoadNetworkTileCache: coverage needs {len(keys)} tiles, "
+                  f"only the last {self._max_tiles} stay cached")
+
+        tiles = [self._get_tile(key) for key in keys]
+        coverage = CompactRoadGraph.compose(tiles)
+        print(f"RoadNetworkTileCache: stitched {len(keys)} tiles into {coverage.get_node_count()} nodes, "
+              f"{len(self._tiles)} tiles cached")
+        return coverage
+
+    def _get_tile_keys(self, west: float, south: float, east: float, north: float) -> List[Tuple[int, int]]:
+        size = self._tile_size_deg
+        return [(x, y)
+                for x in range(floor(west / size), floor(east / size) + 1)
+                for y in range(floor(south / size), floor(north / size) + 1)]
+
+    def _get_tile(self, key: Tuple[int, int]) -> CompactRoadGraph:
+        with self._lock:
+            if key in self._tiles:
+                self._tiles.move_to_end(key)
+                return self._tiles[key]
+
+        tile = self._load_tile(key)
+
+        with self._lock:
+            self._tiles[key] = tile
+            self._tiles.move_to_end(key)
+            self._evict()
+        return tile
+
+    def _load_tile(self, key: Tuple[int, int]) -> CompactRoadGraph:
+        size = self._tile_size_deg
+        west, south = key[0] * size, key[1] * size
+        east, north = west + size, south + size
+
+        tile = self._store.get_bbox_coverage(west, south, east, north) if self._store else None
+        if tile is not None:
+            return tile
+
+        # Unsimplified tiles keep the boundary nodes shared by neighbouring tiles, so they stitch
+        try:
+            graph = ox.graph_from_bbox((west, south, east, north),
+                                       network_type="drive",
+                                       simplify=False,
+                                       truncate_by_edge=True)
+        except ox._errors.InsufficientResponseError:
+            print(f"RoadNetworkTileCache: tile {key} has no roads")
+            return CompactRoadGraph.empty()
+
+        return CompactRoadGraph.from_networkx(graph, keep_source=self._keep_source_graph)
+
+    def _evict(self) -> None:
+        while len(self._tiles) > self._max_tiles:
+            key, _ = self._tiles.popitem(last=False)
+            print(f"RoadNetworkTileCache: evicted tile {key}")
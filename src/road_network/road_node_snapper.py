@@ -0,0 +1,46 @@
+from typing import Sequence, Tuple
+
+import numpy as np
+from scipy.spatial import cKDTree
+
+from road_network.compact_road_graph import CompactRoadGraph
+
+
+class RoadNodeSnapper:
+    EARTH_RADIUS_M = 6_371_008.8
+
+    def __init__(self, node_ids : np.ndarray, lons : np.ndarray, lats : np.ndarray) -> None:
+        if len(node_ids) == 0:
+            raise ValueError("Road network has no nodes")
+
+        self._node_ids = np.asarray(node_ids)
+        # Unit-sphere coordinates keep chord order equal to great-circle order
+        self._tree = cKDTree(self._to_unit_vectors(np.asarray(lons, dtype=np.float64),
+                                                   np.asarray(lats, dtype=np.float64)))
+
+    @classmethod
+    def from_graph(cls, graph : CompactRoadGraph) -> 'RoadNodeSnapper':
+        # Snaps to node indices of the compact graph, not to OSM ids
+        return cls(np.arange(graph.get_node_count()), graph.get_lons(), graph.get_lats())
+
+    def get_node_count(self) -> int:
+        return len(self._node_ids)
+
+    def snap(self, lons : Sequence[float], lats : Sequence[float]) -> Tuple[np.ndarray, np.ndarray]:
+        chords, idx = self._tree.query(self._to_unit_vectors(np.asarray(lons, dtype=np.float64),
+                                                              np.asarray(lats, dtype=np.float64)))
+        offsets_m = 2 * self.EARTH_RADIUS_M * np.arcsin(np.clip(chords / 2, 0.0, 1.0))
+        return self._node_ids[idx], offsets_m
+
+    def query_radius(self, lon : float, lat : float, radius_m : float) -> np.ndarray:
+        chord = 2 * np.sin(min(radius_m / self.EARTH_RADIUS_M, np.pi) / 2)
+        center = self._to_unit_vectors(np.array([lon], dtype=np.float64),
+                                       np.array([lat], dtype=np.float64))[0]
+        return self._node_ids[np.asarray(self._tree.query_ball_point(center, chord), dtype=np.int64)]
+
+    @staticmethod
+    def _to_unit_vectors(lons : np.ndarray, lats : np.ndarray) -> np.ndarray:
+        lon_r = np.radians(lons)
+        lat_r = np.radians(lats)
+        cos_lat = np.cos(lat_r)
+        return np.column_stack((cos_lat * np.cos(lon_r), cos_lat * np.sin(lon_r), np.sin(lat_r)))
@@ -1 +1,4 @@
-from .graph_utils import GraphUtils
\ No newline at end of file
+from .graph_utils import GraphUtils
+from .disjoint_set import DisjointSet
+from .spawn_process_pool import SpawnProcessPool
+from .app_paths import AppPaths
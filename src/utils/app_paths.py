@@ -0,0 +1,15 @@
+import sys
+from pathlib import Path
+
+
+class AppPaths:
+    @staticmethod
+    def get_entry_dir() -> Path:
+        # Directory of the frozen executable or of the entry script. Interactive sessions,
+        # python -c and embedded interpreters have no entry script and use the working directory
+        if getattr(sys, "frozen", False):
+            return Path(sys.executable).resolve().parent
+        entry_file = getattr(sys.modules.get("__main__"), "__file__", None)
+        if entry_file is None:
+            return Path.cwd()
+        return Path(entry_file).resolve().parent
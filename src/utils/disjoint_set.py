@@ -0,0 +1,31 @@
+class DisjointSet:
+    def __init__(self, size : int):
+        self._parent = list(range(size))
+        self._rank = [0] * size
+        self._components = size
+
+    def get_components_count(self) -> int:
+        return self._components
+
+    def find(self, item : int) -> int:
+        parent = self._parent
+        root = item
+        while parent[root] != root:
+            root = parent[root]
+        while parent[item] != root:
+            parent[item], item = root, parent[item]
+        return root
+
+    def union(self, a : int, b : int) -> bool:
+        root_a, root_b = self.find(a), self.find(b)
+        if root_a == root_b:
+            return False
+
+        if self._rank[root_a] < self._rank[root_b]:
+            root_a, root_b = root_b, root_a
+        self._parent[root_b] = root_a
+        if self._rank[root_a] == self._rank[root_b]:
+            self._rank[root_a] += 1
+
+        self._components -= 1
+        return True
@@ -0,0 +1,38 @@
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from typing import Optional
+
+
+class SpawnProcessPool:
+    # Process pool started on first use and restarted after a worker count change.
+    # Spawned workers never inherit the UI threads of the parent process
+    def __init__(self, workers : Optional[int] = None):
+        self._workers = workers if workers is not None else (os.cpu_count() or 1)
+        self._lock = threading.Lock()
+        self._executor : Optional[ProcessPoolExecutor] = None
+
+    def get_workers(self) -> int:
+        return self._workers
+
+    def set_workers(self, workers : int) -> None:
+        with self._lock:
+            self._workers = workers
+            self._shutdown()
+
+    def get_executor(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                self._executor = ProcessPoolExecutor(max_workers=self._workers,
+                                                     mp_context=multiprocessing.get_context("spawn"))
+            return self._executor
+
+    def shutdown(self) -> None:
+        with self._lock:
+            self._shutdown()
+
+    def _shutdown(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
@@ -0,0 +1,9 @@
+import networkx as nx
+import pytest
+
+from tests.helpers import make_grid_road_graph
+
+
+@pytest.fixture
+def grid_road_graph() -> nx.MultiDiGraph:
+    return make_grid_road_graph()
@@ -0,0 +1,62 @@
+import random
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import networkx as nx
+import numpy as np
+
+from algorithms.placement_efficiency import PEffAdjPenDeterminator
+from models import PlacementNetwork, PlacementObject, PlacementPoint, PlacementPointID
+
+
+def make_grid_road_graph(size : int = 12, seed : int = 1) -> nx.MultiDiGraph:
+    # osmnx-shaped grid: x/y node coordinates, edge lengths a little above the
+    # great-circle distance and some one-way streets
+    rng = random.Random(seed)
+    graph = nx.MultiDiGraph(crs="epsg:4326")
+    for row in range(size):
+        for column in range(size):
+            graph.add_node(row * size + column, x=30.5 + column * 0.002, y=50.4 + row * 0.002)
+
+    for row in range(size):
+        for column in range(size):
+            for d_row, d_column, length in ((0, 1, 142.0), (1, 0, 222.0)):
+                if row + d_row < size and column + d_column < size:
+                    u, v = row * size + column, (row + d_row) * size + column + d_column
+                    length *= rng.uniform(1.0, 1.3)
+                    graph.add_edge(u, v, length=length)
+                    if rng.random() < 0.9:
+                        graph.add_edge(v, u, length=length)
+    return graph
+
+
+def make_placement_network(graph : nx.Graph, coordinates : Sequence[Tuple[float, float]]) -> PlacementNetwork:
+    pnetwork = PlacementNetwork(graph)
+    for node in graph.nodes():
+        lon, lat = coordinates[node]
+        pnetwork.set_placement_point_data(node, PlacementPoint(PlacementPointID(node), float(lon), float(lat)))
+    return pnetwork
+
+
+def get_placed_names(pnetwork : PlacementNetwork) -> Dict[int, Optional[str]]:
+    placed = {}
+    for node in pnetwork.get_graph().nodes():
+        obj = pnetwork.get_placement_point_data(node).get_object()
+        placed[node] = None if obj is None else obj.get_name()
+    return placed
+
+
+def make_random_problem(count : int, edge_count : int, seed : int,
+                        rates : Sequence[float] = (5.0, 3.0, 2.0, 1.0),
+                        shares : Sequence[float] = (0.4, 0.3, 0.2, 0.1),
+                        object_count : Optional[int] = None) -> Tuple[PlacementNetwork, List[PlacementObject]]:
+    # Random links over random points and a random mix of object types, one object per
+    # point unless object_count says otherwise
+    rng = np.random.default_rng(seed)
+    graph = nx.gnm_random_graph(count, edge_count, seed=seed)
+    pnetwork = make_placement_network(graph, 30.0 + rng.random((count, 2)))
+    kinds = rng.choice(len(rates), count if object_count is None else object_count, p=shares)
+    return pnetwork, [PlacementObject(f"t{kind}", float(rates[kind])) for kind in kinds]
+
+
+def get_efficiency(pnetwork : PlacementNetwork, penalty : float) -> float:
+    return PEffAdjPenDeterminator(penalty).calculate_placement_efficiency(pnetwork)[1]
@@ -0,0 +1,121 @@
+import networkx as nx
+import numpy as np
+import pytest
+
+from algorithms.placement_efficiency import AdjPenEfficiencyEngine
+from models import CompactPlacementNetwork, PlacementObject
+
+from tests.helpers import make_placement_network
+
+PENALTY = 0.4
+OBJECTS = [PlacementObject("a", 3.0), PlacementObject("b", 2.0), PlacementObject("c", 1.5)]
+
+
+def make_network(seed : int) -> CompactPlacementNetwork:
+    rng = np.random.default_rng(seed)
+    graph = nx.gnm_random_graph(40, 90, seed=seed)
+    pnetwork = make_placement_network(graph, 30.0 + rng.random((40, 2)))
+    for node in graph.nodes():
+        k = int(rng.integers(len(OBJECTS) + 1))
+        if k < len(OBJECTS):
+            pnetwork.get_placement_point_data(node).set_object(OBJECTS[k])
+    return CompactPlacementNetwork.from_placement_network(pnetwork)
+
+
+def get_naive_efficiency(network : CompactPlacementNetwork, type_ids : np.ndarray, rates : np.ndarray) -> float:
+    total = 0.0
+    for node in range(network.get_node_count()):
+        if type_ids[node] == CompactPlacementNetwork.NO_TYPE:
+            continue
+        same = np.any(type_ids[network.get_neighbour_indices(node)] == type_ids[node])
+        total += rates[node] * (1 - PENALTY if same else 1.0)
+    return total
+
+
+def get_changes(network : CompactPlacementNetwork):
+    # Every object type and the empty point, with the rate a solver would pass
+    return [(network.get_type_id(obj.get_name()), obj.get_independent_contribution_rate()) for obj in OBJECTS] + \
+        [(CompactPlacementNetwork.NO_TYPE, 0.0)]
+
+
+@pytest.mark.parametrize("seed", [0, 1, 2])
+def test_total_matches_naive_evaluation(seed):
+    network = make_network(seed)
+    engine = AdjPenEfficiencyEngine(network, PENALTY)
+
+    assert engine.get_total_efficiency() == pytest.approx(
+        get_naive_efficiency(network, engine.get_type_ids(), engine.get_rates()))
+    assert engine.get_contributions().sum() == pytest.approx(engine.get_total_efficiency())
+
+
+@pytest.mark.parametrize("seed", [0, 1, 2])
+def test_change_deltas_match_recompute(seed):
+    network = make_network(seed)
+    engine = AdjPenEfficiencyEngine(network, PENALTY)
+
+    for type_id, rate in get_changes(network):
+        deltas = engine.get_change_deltas(type_id, rate)
+        for node in range(network.get_node_count()):
+            type_ids, rates = engine.get_type_ids().copy(), engine.get_rates().copy()
+            type_ids[node], rates[node] = type_id, rate
+            expected = get_naive_efficiency(network, type_ids, rates) - engine.get_total_efficiency()
+
+            assert engine.get_change_delta(node, type_id, rate) == pytest.approx(expected, abs=1e-9)
+            assert deltas[node] == pytest.approx(expected, abs=1e-9)
+
+
+@pytest.mark.parametrize("seed", [0, 1])
+def test_change_deltas_for_some_nodes(seed):
+    network = make_network(seed)
+    engine = AdjPenEfficiencyEngine(network, PENALTY)
+    nodes = np.random.default_rng(seed).choice(network.get_node_count(), 15, replace=False)
+
+    for type_id, rate in get_changes(network):
+        np.testing.assert_allclose(engine.get_change_deltas(type_id, rate, nodes),
+                                   engine.get_change_deltas(type_id, rate)[nodes], atol=1e-12)
+
+
+def test_applied_changes_keep_state_consistent():
+    network = make_network(3)
+    engine = AdjPenEfficiencyEngine(network, PENALTY)
+    rng = np.random.default_rng(3)
+    changes = get_changes(network)
+
+    for _ in range(300):
+        type_id, rate = changes[int(rng.integers(len(changes)))]
+        before = engine.get_total_efficiency()
+        delta = engine.apply_change(int(rng.integers(network.get_node_count())), type_id, rate)
+        assert engine.get_total_efficiency() == pytest.approx(before + delta)
+
+    total = engine.get_total_efficiency()
+    same_type_counts = engine.get_same_type_counts().copy()
+    contributions = engine.get_contributions().copy()
+
+    assert engine.recompute() == pytest.approx(total)
+    np.testing.assert_array_equal(engine.get_same_type_counts(), same_type_counts)
+    np.testing.assert_allclose(engine.get_contributions(), contributions)
+
+
+def test_bulk_changes_match_single_changes():
+    network = make_network(4)
+    bulk = AdjPenEfficiencyEngine(network, PENALTY)
+    single = AdjPenEfficiencyEngine(network, PENALTY)
+    type_id, rate = get_changes(network)[1]
+    nodes = np.array([1, 5, 6, 20, 33])
+
+    delta = bulk.apply_changes(nodes, type_id, rate)
+    expected = sum(single.apply_change(int(node), type_id, rate) for node in nodes)
+
+    assert delta == pytest.approx(expected)
+    assert bulk.get_total_efficiency() == pytest.approx(single.get_total_efficiency())
+
+
+def test_write_to_network_round_trips():
+    network = make_network(5)
+    engine = AdjPenEfficiencyEngine(network, PENALTY)
+    engine.apply_change(0, *get_changes(network)[0])
+
+    written = engine.write_to_network()
+
+    assert AdjPenEfficiencyEngine(written, PENALTY).get_total_efficiency() == \
+        pytest.approx(engine.get_total_efficiency())
@@ -0,0 +1,66 @@
+from collections import Counter
+
+import pytest
+
+from algorithms.placement_solvers import AdjPenPlacementAlgorithmAnnealing, AdjPenPlacementAlgorithmBestOf, \
+    AdjPenPlacementAlgorithmDSatur, AdjPenPlacementAlgorithmGreedy
+
+from tests.helpers import get_efficiency, get_placed_names, make_random_problem
+
+PENALTY = 0.5
+
+
+def make_solver(**kwargs) -> AdjPenPlacementAlgorithmAnnealing:
+    return AdjPenPlacementAlgorithmAnnealing(PENALTY, time_budget_s=None, max_moves=2_000, restarts=2,
+                                             workers=1, seed=1, **kwargs)
+
+
+@pytest.mark.parametrize("edge_count, object_count", [(600, None), (1200, None), (1200, 240)])
+def test_never_ends_below_dsatur_or_greedy(edge_count, object_count):
+    pnetwork, to_place = make_random_problem(300, edge_count, seed=3, object_count=object_count)
+
+    efficiency = get_efficiency(make_solver().compute_placement(pnetwork, to_place), PENALTY)
+
+    for start in (AdjPenPlacementAlgorithmDSatur(PENALTY), AdjPenPlacementAlgorithmGreedy(PENALTY)):
+        assert efficiency >= get_efficiency(start.compute_placement(pnetwork, to_place), PENALTY)
+
+
+def test_never_ends_below_the_start_placement():
+    pnetwork, to_place = make_random_problem(300, 1200, seed=4)
+    initial_algorithm = AdjPenPlacementAlgorithmGreedy(PENALTY)
+    # Too few moves for the annealing to cool down and climb back above its start
+    solver = AdjPenPlacementAlgorithmAnnealing(PENALTY, time_budget_s=None, max_moves=50, restarts=2,
+                                               workers=1, seed=1, initial_algorithm=initial_algorithm)
+
+    efficiency = get_efficiency(solver.compute_placement(pnetwork, to_place), PENALTY)
+
+    assert efficiency >= get_efficiency(initial_algorithm.compute_placement(pnetwork, to_place), PENALTY)
+    assert max(solver.get_restart_efficiencies()) == pytest.approx(efficiency)
+
+
+def test_placement_keeps_object_counts():
+    pnetwork, to_place = make_random_problem(200, 600, seed=5, object_count=150)
+
+    result = make_solver().compute_placement(pnetwork, to_place)
+
+    placed = Counter(name for name in get_placed_names(result).values() if name is not None)
+    assert placed == Counter(obj.get_name() for obj in to_place)
+
+
+def test_seeded_move_limit_is_reproducible():
+    pnetwork, to_place = make_random_problem(200, 600, seed=6)
+
+    first = get_placed_names(make_solver().compute_placement(pnetwork, to_place))
+    second = get_placed_names(make_solver().compute_placement(pnetwork, to_place))
+
+    assert first == second
+
+
+def test_best_of_keeps_the_better_start():
+    pnetwork, to_place = make_random_problem(300, 1200, seed=7)
+    starts = [AdjPenPlacementAlgorithmDSatur(PENALTY), AdjPenPlacementAlgorithmGreedy(PENALTY)]
+
+    efficiency = get_efficiency(AdjPenPlacementAlgorithmBestOf(starts, PENALTY).compute_placement(pnetwork, to_place),
+                                PENALTY)
+
+    assert efficiency == max(get_efficiency(start.compute_placement(pnetwork, to_place), PENALTY) for start in starts)
@@ -0,0 +1,55 @@
+from collections import Counter
+
+import networkx as nx
+import numpy as np
+import pytest
+
+from algorithms.placement_solvers import AdjPenPlacementAlgorithmDSatur, AdjPenPlacementAlgorithmGreedy
+from models import PlacementObject
+
+from tests.helpers import get_efficiency, get_placed_names, make_placement_network, make_random_problem
+
+PENALTY = 0.5
+
+
+@pytest.mark.parametrize("object_count", [None, 150])
+def test_placement_keeps_object_counts(object_count):
+    pnetwork, to_place = make_random_problem(200, 600, seed=1, object_count=object_count)
+
+    result = AdjPenPlacementAlgorithmDSatur(PENALTY).compute_placement(pnetwork, to_place)
+
+    placed = Counter(name for name in get_placed_names(result).values() if name is not None)
+    assert placed == Counter(obj.get_name() for obj in to_place)
+
+
+def test_bipartite_grid_has_no_conflicts():
+    # A 6x6 grid splits into two colour classes of 18 points, exactly the two quotas
+    graph = nx.convert_node_labels_to_integers(nx.grid_2d_graph(6, 6))
+    pnetwork = make_placement_network(graph, 30.0 + np.random.default_rng(0).random((36, 2)))
+    to_place = [PlacementObject("a", 2.0)] * 18 + [PlacementObject("b", 1.0)] * 18
+
+    result = AdjPenPlacementAlgorithmDSatur(PENALTY).compute_placement(pnetwork, to_place)
+
+    placed = get_placed_names(result)
+    assert all(placed[u] != placed[v] for u, v in graph.edges())
+
+
+def test_objects_placed_before_are_replaced():
+    pnetwork, to_place = make_random_problem(60, 120, seed=2, object_count=40)
+    for node in pnetwork.get_graph().nodes():
+        pnetwork.get_placement_point_data(node).set_object(PlacementObject("old", 9.0))
+
+    result = AdjPenPlacementAlgorithmDSatur(PENALTY).compute_placement(pnetwork, to_place)
+
+    placed = Counter(name for name in get_placed_names(result).values() if name is not None)
+    assert placed == Counter(obj.get_name() for obj in to_place)
+
+
+@pytest.mark.parametrize("edge_count, object_count", [(600, None), (900, 200), (1200, 240)])
+def test_sparse_or_partly_filled_networks_beat_greedy(edge_count, object_count):
+    pnetwork, to_place = make_random_problem(300, edge_count, seed=3, object_count=object_count)
+
+    dsatur = get_efficiency(AdjPenPlacementAlgorithmDSatur(PENALTY).compute_placement(pnetwork, to_place), PENALTY)
+    greedy = get_efficiency(AdjPenPlacementAlgorithmGreedy(PENALTY).compute_placement(pnetwork, to_place), PENALTY)
+
+    assert dsatur > greedy
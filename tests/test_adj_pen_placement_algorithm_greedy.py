@@ -0,0 +1,76 @@
+from copy import deepcopy
+from typing import Dict, List, Optional
+
+import pytest
+
+from algorithms.placement_solvers import AdjPenPlacementAlgorithmGreedy
+from models import PlacementNetwork, PlacementObject
+
+from tests.helpers import get_placed_names, make_random_problem
+
+PENALTY = 0.5
+
+
+def baseline_greedy(pnetwork : PlacementNetwork, to_place : List[PlacementObject],
+                    penalty : float) -> Dict[int, Optional[str]]:
+    # The original object-by-object greedy: nodes by ascending degree, the first object
+    # in to_place order wins ties; it stops once every object is placed
+    objects_to_place = {}
+    for obj in to_place:
+        objects_to_place[obj] = objects_to_place.get(obj, 0) + 1
+
+    result = deepcopy(pnetwork)
+    graph = result.get_graph()
+    for node in sorted(graph.nodes(), key=graph.degree):
+        if not objects_to_place:
+            break
+
+        best_contribution, best_object = -1, None
+        for obj in objects_to_place:
+            has_adjacent_same_type_object = any(
+                result.get_placement_point_data(adj).get_object() is not None and
+                obj == result.get_placement_point_data(adj).get_object()
+                for adj in graph.adj[node]
+            )
+            contribution = obj.get_independent_contribution_rate() * \
+                ((1.0 - penalty) if has_adjacent_same_type_object else 1.0)
+            if contribution > best_contribution:
+                best_contribution, best_object = contribution, obj
+
+        result.get_placement_point_data(node).set_object(best_object)
+        objects_to_place[best_object] -= 1
+        if objects_to_place[best_object] == 0:
+            del objects_to_place[best_object]
+
+    return get_placed_names(result)
+
+
+@pytest.mark.parametrize("seed", [1, 2, 3])
+@pytest.mark.parametrize("edge_count, object_count", [(300, None), (600, None), (600, 150), (900, 260)])
+def test_matches_baseline_greedy(seed, edge_count, object_count):
+    pnetwork, to_place = make_random_problem(200, edge_count, seed=seed, object_count=object_count)
+
+    result = AdjPenPlacementAlgorithmGreedy(PENALTY).compute_placement(pnetwork, to_place)
+
+    assert get_placed_names(result) == baseline_greedy(pnetwork, to_place, PENALTY)
+
+
+def test_matches_baseline_greedy_around_objects_placed_before():
+    # Points the objects run out before keep what they held, and those objects count
+    # as same-type neighbours for the points that are filled
+    pnetwork, to_place = make_random_problem(120, 360, seed=4, object_count=80)
+    for node in range(0, 120, 3):
+        pnetwork.get_placement_point_data(node).set_object(PlacementObject("t0", 5.0))
+
+    result = AdjPenPlacementAlgorithmGreedy(PENALTY).compute_placement(pnetwork, to_place)
+
+    assert get_placed_names(result) == baseline_greedy(pnetwork, to_place, PENALTY)
+
+
+def test_input_network_is_left_unchanged():
+    pnetwork, to_place = make_random_problem(100, 250, seed=5)
+    before = get_placed_names(pnetwork)
+
+    AdjPenPlacementAlgorithmGreedy(PENALTY).compute_placement(pnetwork, to_place)
+
+    assert get_placed_names(pnetwork) == before
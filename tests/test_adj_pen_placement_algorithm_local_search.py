@@ -0,0 +1,58 @@
+from collections import Counter
+
+import numpy as np
+import pytest
+
+from algorithms.placement_efficiency import AdjPenEfficiencyEngine
+from algorithms.placement_solvers import AdjPenPlacementAlgorithmBestOf, AdjPenPlacementAlgorithmLocalSearch
+from models import CompactPlacementNetwork
+
+from tests.helpers import get_efficiency, get_placed_names, make_random_problem
+
+PENALTY = 0.5
+
+
+def has_improving_swap(engine : AdjPenEfficiencyEngine) -> bool:
+    type_ids, rates = engine.get_type_ids(), engine.get_rates()
+    for i in np.flatnonzero((engine.get_same_type_counts() > 0) & (type_ids != CompactPlacementNetwork.NO_TYPE)):
+        for j in np.flatnonzero(type_ids != type_ids[i]):
+            type_i, rate_i = int(type_ids[i]), float(rates[i])
+            gain = engine.apply_change(i, int(type_ids[j]), float(rates[j])) + engine.get_change_delta(j, type_i, rate_i)
+            engine.apply_change(i, type_i, rate_i)
+            if gain > AdjPenPlacementAlgorithmLocalSearch.IMPROVEMENT_EPS:
+                return True
+    return False
+
+
+@pytest.mark.parametrize("edge_count, object_count", [(240, None), (480, None), (480, 90)])
+def test_ends_at_a_local_optimum_above_the_start(edge_count, object_count):
+    pnetwork, to_place = make_random_problem(120, edge_count, seed=1, object_count=object_count)
+    solver = AdjPenPlacementAlgorithmLocalSearch(PENALTY, time_budget_s=None, seed=2)
+
+    result = solver.compute_placement(pnetwork, to_place)
+
+    start = AdjPenPlacementAlgorithmBestOf.get_or_create(None, PENALTY).compute_placement(pnetwork, to_place)
+    assert get_efficiency(result, PENALTY) >= get_efficiency(start, PENALTY)
+    assert not has_improving_swap(AdjPenEfficiencyEngine(CompactPlacementNetwork.from_placement_network(result),
+                                                         PENALTY))
+
+
+def test_placement_keeps_object_counts():
+    pnetwork, to_place = make_random_problem(300, 1200, seed=3, object_count=250)
+
+    result = AdjPenPlacementAlgorithmLocalSearch(PENALTY, time_budget_s=None, seed=4).compute_placement(pnetwork,
+                                                                                                      to_place)
+
+    placed = Counter(name for name in get_placed_names(result).values() if name is not None)
+    assert placed == Counter(obj.get_name() for obj in to_place)
+
+
+def test_trajectory_only_improves():
+    pnetwork, to_place = make_random_problem(300, 1200, seed=5)
+    solver = AdjPenPlacementAlgorithmLocalSearch(PENALTY, time_budget_s=None, seed=6)
+
+    result = solver.compute_placement(pnetwork, to_place)
+
+    efficiencies = [efficiency for _, efficiency in solver.get_trajectory()]
+    assert all(later > earlier for earlier, later in zip(efficiencies, efficiencies[1:]))
+    assert efficiencies[-1] == pytest.approx(get_efficiency(result, PENALTY))
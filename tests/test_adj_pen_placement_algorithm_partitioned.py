@@ -0,0 +1,66 @@
+from collections import Counter
+
+import networkx as nx
+import numpy as np
+
+from algorithms.placement_solvers import AdjPenPlacementAlgorithmPartitioned
+from models import CompactPlacementNetwork, PlacementObject
+
+from tests.helpers import get_placed_names, make_placement_network
+
+
+def make_problem(count : int = 600, seed : int = 7):
+    # A tree with extra links, so the regions leave penalized points on the cuts
+    rng = np.random.default_rng(seed)
+    graph = nx.random_labeled_tree(count, seed=seed)
+    graph.add_edges_from((int(u), int(v)) for u, v in rng.integers(0, count, (count // 2, 2)) if u != v)
+    pnetwork = make_placement_network(graph, 30.0 + rng.random((count, 2)))
+    to_place = [PlacementObject(f"t{k}", [3.0, 2.0, 1.0][k]) for k in rng.choice(3, count - 50)]
+    return pnetwork, to_place
+
+
+def test_regions_follow_links_not_coordinates():
+    # Two dense clusters joined by one link, with coordinates that interleave them
+    graph = nx.disjoint_union(nx.complete_graph(30), nx.complete_graph(30))
+    graph.add_edge(0, 30)
+    coordinates = np.column_stack([np.arange(60) % 2 + 30.0, np.linspace(50.0, 50.1, 60)])
+    network = CompactPlacementNetwork.from_placement_network(make_placement_network(graph, coordinates))
+
+    solver = AdjPenPlacementAlgorithmPartitioned(region_size=30, workers=1)
+    regions = solver._get_regions(network)
+
+    assert sorted(sorted(network.get_node_ids()[region].tolist()) for region in regions) == \
+        [list(range(30)), list(range(30, 60))]
+    assert len(solver._get_boundary_nodes(network, regions)) == 2
+
+
+def test_regions_cover_every_point_once():
+    pnetwork, _ = make_problem()
+    network = CompactPlacementNetwork.from_placement_network(pnetwork)
+
+    regions = AdjPenPlacementAlgorithmPartitioned(region_size=100, workers=1)._get_regions(network)
+
+    assert all(len(region) <= 100 for region in regions)
+    assert sorted(np.concatenate(regions).tolist()) == list(range(network.get_node_count()))
+
+
+def test_placement_keeps_object_counts():
+    pnetwork, to_place = make_problem()
+    solver = AdjPenPlacementAlgorithmPartitioned(region_size=100, workers=1, seed=3)
+
+    result = solver.compute_placement(pnetwork, to_place)
+
+    placed = Counter(name for name in get_placed_names(result).values() if name is not None)
+    assert placed == Counter(obj.get_name() for obj in to_place)
+
+
+def test_seeded_result_does_not_depend_on_workers():
+    pnetwork, to_place = make_problem()
+    placements = []
+    for workers in (1, 2):
+        solver = AdjPenPlacementAlgorithmPartitioned(region_size=100, workers=workers, seed=3)
+        result = solver.compute_placement(pnetwork, to_place)
+        solver.close()
+        placements.append(get_placed_names(result))
+
+    assert placements[0] == placements[1]
@@ -0,0 +1,72 @@
+import itertools
+from collections import Counter
+
+import networkx as nx
+import numpy as np
+import pytest
+
+from algorithms.placement_efficiency import AdjPenEfficiencyEngine
+from algorithms.placement_solvers import AdjPenPlacementAlgorithmTreeDP
+from models import CompactPlacementNetwork, PlacementNetwork, PlacementObject
+
+from tests.helpers import get_placed_names, make_placement_network
+
+
+def get_efficiency(pnetwork : PlacementNetwork, penalty : float) -> float:
+    return AdjPenEfficiencyEngine(CompactPlacementNetwork.from_placement_network(pnetwork),
+                                  penalty).get_total_efficiency()
+
+
+def get_brute_force_efficiency(graph : nx.Graph, to_place, penalty : float) -> float:
+    nodes = list(graph.nodes())
+    rates = {obj.get_name(): obj.get_independent_contribution_rate() for obj in to_place}
+    labels = [obj.get_name() for obj in to_place] + [None] * (len(nodes) - len(to_place))
+
+    best = 0.0
+    for assignment in set(itertools.permutations(labels)):
+        placed = dict(zip(nodes, assignment))
+        efficiency = sum(rates[name] * (1 - penalty if any(placed[n] == name for n in graph.neighbors(node)) else 1)
+                         for node, name in placed.items() if name is not None)
+        best = max(best, efficiency)
+    return best
+
+
+def make_problem(seed : int):
+    rng = np.random.default_rng(seed)
+    count = int(rng.integers(2, 9))
+    graph = nx.random_labeled_tree(count, seed=seed)
+    if rng.random() < 0.3:
+        graph.remove_edge(*next(iter(graph.edges())))
+
+    type_count = int(rng.integers(1, 4))
+    rates = rng.integers(1, 6, type_count).astype(float)
+    to_place = [PlacementObject(f"t{k}", float(rates[k]))
+                for k in rng.integers(0, type_count, int(rng.integers(1, count + 1)))]
+    penalty = float(rng.choice([0.3, 0.5, 0.9]))
+    return graph, to_place, penalty
+
+
+@pytest.mark.parametrize("seed", range(30))
+def test_tree_dp_is_optimal_on_small_forests(seed):
+    graph, to_place, penalty = make_problem(seed)
+    pnetwork = make_placement_network(graph, {node: (30.0, 50.0) for node in graph.nodes()})
+    solver = AdjPenPlacementAlgorithmTreeDP(penalty, polish=False)
+
+    result = solver.compute_placement(pnetwork, to_place)
+
+    best = get_brute_force_efficiency(graph, to_place, penalty)
+    assert get_efficiency(result, penalty) == pytest.approx(best)
+    assert solver.get_bounds()[1] >= best - 1e-9
+    placed = Counter(name for name in get_placed_names(result).values() if name is not None)
+    assert placed == Counter(obj.get_name() for obj in to_place)
+
+
+def test_non_forests_use_the_fallback():
+    graph = nx.cycle_graph(6)
+    pnetwork = make_placement_network(graph, {node: (30.0, 50.0) for node in graph.nodes()})
+    to_place = [PlacementObject("a", 2.0)] * 3 + [PlacementObject("b", 1.0)] * 3
+
+    result = AdjPenPlacementAlgorithmTreeDP(0.5).compute_placement(pnetwork, to_place)
+
+    placed = Counter(name for name in get_placed_names(result).values() if name is not None)
+    assert placed == Counter({"a": 3, "b": 3})
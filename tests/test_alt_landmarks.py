@@ -0,0 +1,42 @@
+import numpy as np
+import pytest
+
+from road_network.alt_landmarks import AltLandmarks
+from road_network.compact_road_graph import CompactRoadGraph
+
+
+@pytest.fixture
+def compact_graph(grid_road_graph) -> CompactRoadGraph:
+    return CompactRoadGraph.from_networkx(grid_road_graph)
+
+
+def get_pairs(count : int, node_count : int, seed : int = 0):
+    rng = np.random.default_rng(seed)
+    return rng.integers(0, node_count, (count, 2)).tolist()
+
+
+@pytest.mark.parametrize("landmark_count", [1, 4, 8])
+def test_bounds_enclose_shortest_paths(compact_graph, landmark_count):
+    landmarks = AltLandmarks.build(compact_graph, landmark_count)
+    exact = compact_graph.get_shortest_path_lengths(np.arange(compact_graph.get_node_count()))
+
+    for source, target in get_pairs(300, compact_graph.get_node_count()):
+        assert landmarks.get_lower_bound(source, target) <= exact[source, target]
+        assert landmarks.get_upper_bound(source, target) >= exact[source, target] * (1 - 1e-6)
+
+
+def test_queries_match_dijkstra(compact_graph):
+    landmarks = AltLandmarks.build(compact_graph, 4)
+    exact = compact_graph.get_shortest_path_lengths(np.arange(compact_graph.get_node_count()))
+
+    for source, target in get_pairs(200, compact_graph.get_node_count(), seed=1):
+        assert landmarks.get_distance(source, target) == pytest.approx(exact[source, target], rel=1e-6)
+
+
+def test_saved_landmarks_load_for_the_same_graph(tmp_path, compact_graph):
+    built = AltLandmarks.load_or_build(compact_graph, tmp_path, 4)
+    loaded = AltLandmarks.load_or_build(compact_graph, tmp_path, 4)
+
+    assert loaded.get_landmark_count() == built.get_landmark_count()
+    for source, target in get_pairs(50, compact_graph.get_node_count(), seed=2):
+        assert loaded.get_lower_bound(source, target) == built.get_lower_bound(source, target)
@@ -0,0 +1,109 @@
+import networkx as nx
+import numpy as np
+import pytest
+
+from models import CompactPlacementNetwork, PlacementObject, PlacementPoint, PlacementPointID
+
+from tests.helpers import get_placed_names, make_placement_network
+
+OBJECTS = [PlacementObject("a", 3.0), PlacementObject("b", 2.0, 1.5)]
+
+
+def make_network(seed : int = 0):
+    # Non-contiguous node ids and a self-loop, which the columnar view drops
+    rng = np.random.default_rng(seed)
+    graph = nx.relabel_nodes(nx.gnm_random_graph(30, 60, seed=seed), {node: 10 * node + 7 for node in range(30)})
+    graph.add_edge(7, 7)
+    pnetwork = make_placement_network(graph, {node: (30.0 + rng.random(), 50.0 + rng.random()) for node in graph})
+    for node in list(graph.nodes())[::3]:
+        pnetwork.get_placement_point_data(node).set_object(OBJECTS[node % 2])
+    return pnetwork
+
+
+def test_columns_and_adjacency_follow_the_graph():
+    pnetwork = make_network()
+    network = CompactPlacementNetwork.from_placement_network(pnetwork)
+    graph = pnetwork.get_graph()
+
+    assert network.get_node_count() == graph.number_of_nodes()
+    assert network.get_edge_count() == graph.number_of_edges() - nx.number_of_selfloops(graph)
+    for index, node in enumerate(network.get_node_ids().tolist()):
+        neighbours = set(network.get_node_ids()[network.get_neighbour_indices(index)].tolist())
+        assert neighbours == set(graph.neighbors(node)) - {node}
+        assert network.get_node_index(node) == index
+
+        ppoint = pnetwork.get_placement_point_data(node)
+        assert network.get_coordinates(index) == ppoint.get_coordinates()
+        obj = ppoint.get_object()
+        assert (network.get_object(index) is None) == (obj is None)
+        if obj is not None:
+            assert network.get_type_names()[network.get_type_ids()[index]] == obj.get_name()
+            assert network.get_object(index).get_context_contribution_rate() == obj.get_context_contribution_rate()
+
+
+def test_apply_to_writes_objects_into_a_snapshot():
+    pnetwork = make_network()
+    before = get_placed_names(pnetwork)
+    network = CompactPlacementNetwork.from_placement_network(pnetwork)
+    for index in range(network.get_node_count()):
+        network.set_object(index, OBJECTS[index % 2] if index % 4 else None)
+
+    result = network.apply_to(pnetwork)
+
+    assert get_placed_names(pnetwork) == before
+    assert get_placed_names(result) == {node: None if index % 4 == 0 else OBJECTS[index % 2].get_name()
+                                        for index, node in enumerate(network.get_node_ids().tolist())}
+    assert set(result.get_graph().edges()) == set(pnetwork.get_graph().edges())
+
+
+def test_round_trip_through_a_plain_network():
+    network = CompactPlacementNetwork.from_placement_network(make_network())
+
+    again = CompactPlacementNetwork.from_placement_network(network.to_placement_network())
+
+    np.testing.assert_array_equal(again.get_node_ids(), network.get_node_ids())
+    np.testing.assert_array_equal(again.get_adjacency()[0], network.get_adjacency()[0])
+    np.testing.assert_array_equal(again.get_adjacency()[1], network.get_adjacency()[1])
+    for index in range(network.get_node_count()):
+        assert again.get_coordinates(index) == network.get_coordinates(index)
+        assert (again.get_object(index) is None) == (network.get_object(index) is None)
+
+
+def test_subnetwork_keeps_induced_links_and_type_ids():
+    network = CompactPlacementNetwork.from_placement_network(make_network())
+    rows = np.array([9, 2, 17, 4, 25, 11])
+
+    subnetwork = network.get_subnetwork(rows)
+
+    np.testing.assert_array_equal(subnetwork.get_node_ids(), network.get_node_ids()[rows])
+    np.testing.assert_array_equal(subnetwork.get_type_ids(), network.get_type_ids()[rows])
+    assert subnetwork.get_type_names() == network.get_type_names()
+    for position, row in enumerate(rows.tolist()):
+        expected = set(rows[np.isin(rows, network.get_neighbour_indices(row))].tolist())
+        assert set(rows[subnetwork.get_neighbour_indices(position)].tolist()) == expected
+
+
+def test_copy_shares_structure_but_not_columns():
+    network = CompactPlacementNetwork.from_placement_network(make_network())
+    type_ids, lons = network.get_type_ids().copy(), network.get_lons().copy()
+    copy = network.copy()
+
+    copy.set_object(0, None)
+    copy.set_object(1, OBJECTS[0])
+    copy.get_lons()[1] = 0.0
+
+    np.testing.assert_array_equal(network.get_type_ids(), type_ids)
+    np.testing.assert_array_equal(network.get_lons(), lons)
+    assert copy.get_adjacency()[1] is network.get_adjacency()[1]
+
+
+def test_set_placement_point_data_rejects_unknown_nodes():
+    network = CompactPlacementNetwork.from_placement_network(make_network())
+    node = int(network.get_node_ids()[3])
+
+    network.set_placement_point_data(node, PlacementPoint(PlacementPointID(node), 1.0, 2.0, 3.0, OBJECTS[0]))
+    assert network.get_coordinates(3) == (1.0, 2.0, 3.0)
+    assert network.get_placement_point_data(node).get_object().get_name() == "a"
+
+    with pytest.raises(ValueError):
+        network.set_placement_point_data(8, PlacementPoint(PlacementPointID(8), 1.0, 2.0))
@@ -0,0 +1,39 @@
+import networkx as nx
+import numpy as np
+import pytest
+
+from algorithms.distance_resolvers import GeodeticDistanceResolver
+from algorithms.pnetwork_builders import DelaunayPLinkBuilder, MSTPLinkBuilder
+from models import PlacementNetwork
+
+from tests.helpers import make_placement_network
+
+
+def make_points(count : int, seed : int, center_lon : float, center_lat : float, span_deg : float):
+    rng = np.random.default_rng(seed)
+    lons = center_lon + rng.uniform(-span_deg, span_deg, count)
+    lats = center_lat + rng.uniform(-span_deg, span_deg, count)
+    # Longitudes are wrapped into [-180, 180) like the coordinates of real placement points
+    return {node: (float((lon + 180.0) % 360.0 - 180.0), float(lat))
+            for node, (lon, lat) in enumerate(zip(lons, lats))}
+
+
+def get_tree_weight(builder, pnetwork : PlacementNetwork) -> float:
+    result = builder.compute_placement_point_links(pnetwork)
+    return sum(data['weight'] for _, _, data in result.get_graph().edges(data=True) if data['type'] == "MST")
+
+
+@pytest.mark.parametrize("center_lon", [30.5, 180.0, -180.0], ids=["city", "antimeridian-east", "antimeridian-west"])
+def test_delaunay_tree_matches_mst(center_lon):
+    points = make_points(150, seed=1, center_lon=center_lon, center_lat=50.4, span_deg=0.2)
+    pnetwork = make_placement_network(nx.empty_graph(len(points)), points)
+
+    weight = get_tree_weight(DelaunayPLinkBuilder(GeodeticDistanceResolver()), pnetwork)
+
+    assert weight == pytest.approx(get_tree_weight(MSTPLinkBuilder(GeodeticDistanceResolver()), pnetwork), rel=1e-9)
+
+
+def test_projection_is_contiguous_across_antimeridian():
+    xy = DelaunayPLinkBuilder._project([(179.99, 0.0, None), (-179.99, 0.0, None)])
+
+    assert abs(xy[0, 0] - xy[1, 0]) == pytest.approx(2_224.0, rel=1e-2)
@@ -0,0 +1,73 @@
+import numpy as np
+import pytest
+
+from algorithms.distance_resolvers import GeodeticDistanceResolver, HaversineDistanceResolver
+
+geopy_distance = pytest.importorskip("geopy.distance")
+
+
+def make_points(count : int, seed : int, max_lat : float = 85.0):
+    rng = np.random.default_rng(seed)
+    lons = rng.uniform(-180.0, 180.0, count)
+    lats = rng.uniform(-max_lat, max_lat, count)
+    return [(float(lon), float(lat), None) for lon, lat in zip(lons, lats)]
+
+
+def make_local_points(count : int, seed : int, center, span_deg : float):
+    rng = np.random.default_rng(seed)
+    lons = center[0] + rng.uniform(-span_deg, span_deg, count)
+    lats = np.clip(center[1] + rng.uniform(-span_deg, span_deg, count), -89.9, 89.9)
+    return [(float(lon), float(lat), None) for lon, lat in zip(lons, lats)]
+
+
+def get_geopy_matrix(origins, destinations) -> np.ndarray:
+    return np.array([[geopy_distance.geodesic((o_lat, o_lon), (d_lat, d_lon)).meters
+                      for d_lon, d_lat, _ in destinations]
+                     for o_lon, o_lat, _ in origins])
+
+
+@pytest.mark.parametrize("points", [
+    make_points(25, seed=1),
+    make_local_points(25, seed=2, center=(30.5, 50.4), span_deg=0.3),
+    make_local_points(25, seed=3, center=(0.0, 0.0), span_deg=20.0),
+], ids=["global", "city", "equator"])
+def test_vincenty_matrix_matches_geopy(points):
+    matrix = GeodeticDistanceResolver().get_distance_matrix(points, points)
+
+    # Vincenty and Karney's geodesics agree to well below a millimetre off the antipodes
+    np.testing.assert_allclose(matrix, get_geopy_matrix(points, points), rtol=1e-9, atol=1e-3)
+
+
+def test_vincenty_pairwise_and_altitude():
+    resolver = GeodeticDistanceResolver()
+    origins = make_points(30, seed=4)
+    destinations = make_points(30, seed=5)
+
+    pairwise = resolver.get_pairwise_distances(origins, destinations)
+    expected = [resolver.get_distance_in_meters(o_lon, o_lat, d_lon, d_lat)
+                for (o_lon, o_lat, _), (d_lon, d_lat, _) in zip(origins, destinations)]
+    np.testing.assert_allclose(pairwise, expected, rtol=1e-9, atol=1e-3)
+
+    raised = resolver.get_distance_matrix([(30.5, 50.4, 0.0)], [(30.51, 50.4, 300.0)])[0, 0]
+    flat = resolver.get_distance_in_meters(30.5, 50.4, 30.51, 50.4)
+    assert raised == pytest.approx(np.hypot(flat, 300.0))
+
+
+def test_vincenty_coincident_points():
+    points = make_points(5, seed=6)
+    np.testing.assert_array_equal(np.diag(GeodeticDistanceResolver().get_distance_matrix(points, points)), 0.0)
+
+
+@pytest.mark.parametrize("points", [
+    make_points(60, seed=7, max_lat=89.0),
+    make_local_points(60, seed=8, center=(30.5, 50.4), span_deg=0.05),
+    make_local_points(60, seed=9, center=(100.0, 88.0), span_deg=1.0),
+    make_local_points(60, seed=10, center=(10.0, 0.0), span_deg=1.0),
+], ids=["global", "city", "polar", "equator"])
+def test_haversine_error_bound(points):
+    haversine = HaversineDistanceResolver().get_distance_matrix(points, points)
+    geodesic = GeodeticDistanceResolver().get_distance_matrix(points, points)
+
+    off_diagonal = ~np.eye(len(points), dtype=bool)
+    relative_error = np.abs(haversine - geodesic)[off_diagonal] / geodesic[off_diagonal]
+    assert relative_error.max() <= HaversineDistanceResolver.MAX_RELATIVE_ERROR
@@ -0,0 +1,151 @@
+import networkx as nx
+import numpy as np
+import pytest
+
+from algorithms.distance_resolvers import GeodeticDistanceResolver, HaversineDistanceResolver, \
+    RoadNetworkDistanceResolver
+from algorithms.pnetwork_builders import IncrementalMSTPLinkBuilder, MSTPLinkBuilder
+from models import PlacementNetwork
+
+from tests.helpers import make_placement_network
+
+CENTER = (50.411, 30.511)
+
+
+class BoundedGeodeticDistanceResolver(GeodeticDistanceResolver):
+    # Exact distances plus admissible bounds: the haversine distance shrunk by its
+    # error bound. Counts the resolved pairs, so tests can tell the lazy path ran
+    def __init__(self):
+        self.lookups = 0
+
+    def get_pairwise_distances_within(self, origins, destinations, limit_m):
+        self.lookups += len(origins)
+        return super().get_pairwise_distances_within(origins, destinations, limit_m)
+
+    def get_lower_bound_matrix(self, origins, destinations):
+        return HaversineDistanceResolver().get_distance_matrix(origins, destinations) * \
+            (1 - HaversineDistanceResolver.MAX_RELATIVE_ERROR)
+
+
+class MatrixOnlyResolver(GeodeticDistanceResolver):
+    # Exposes only the full matrix of another resolver, which keeps builders off the lazy path
+    def __init__(self, resolver):
+        self._resolver = resolver
+
+    def get_distance_matrix(self, origins, destinations):
+        return self._resolver.get_distance_matrix(origins, destinations)
+
+
+def make_points(count : int, seed : int):
+    rng = np.random.default_rng(seed)
+    return {node: (30.5 + 0.1 * lon, 50.4 + 0.1 * lat) for node, (lon, lat) in enumerate(rng.random((count, 2)))}
+
+
+def get_links(builder : MSTPLinkBuilder, pnetwork : PlacementNetwork, density=None):
+    sweep = builder.compute_placement_point_links_sweep(pnetwork, [density])
+    links = sweep.get_links(density)
+    tree = sorted(data['weight'] for _, _, data in links if data['type'] == "MST")
+    extension = sorted(data['weight'] for _, _, data in links if data['type'] != "MST")
+    return tree, extension
+
+
+def get_tree_weight(builder : MSTPLinkBuilder, pnetwork : PlacementNetwork, density=None) -> float:
+    return sum(get_links(builder, pnetwork, density)[0])
+
+
+def get_full_kruskal_weight(distances : np.ndarray) -> float:
+    # The builders read the upper triangle of the distance matrix
+    complete = nx.Graph()
+    for i, j in zip(*np.triu_indices(len(distances), k=1)):
+        complete.add_edge(int(i), int(j), weight=float(distances[i, j]))
+    return sum(data['weight'] for _, _, data in nx.minimum_spanning_edges(complete, data=True))
+
+
+@pytest.mark.parametrize("density", [None, 0.2])
+def test_road_mst_resolves_bounded_batches(monkeypatch, grid_road_graph, density):
+    resolver = RoadNetworkDistanceResolver()
+    resolver.set_road_network(grid_road_graph, CENTER, 5.0)
+    nodes = np.random.default_rng(3).choice(grid_road_graph.number_of_nodes(), 40, replace=False)
+    coordinates = [(grid_road_graph.nodes[int(n)]["x"], grid_road_graph.nodes[int(n)]["y"]) for n in nodes]
+    points = [(lon, lat, None) for lon, lat in coordinates]
+    pnetwork = make_placement_network(nx.empty_graph(len(coordinates)), coordinates)
+    expected_tree, expected_extension = get_links(MSTPLinkBuilder(MatrixOnlyResolver(resolver)), pnetwork, density)
+
+    def fail(*args, **kwargs):
+        raise AssertionError("road distances must be resolved in batches")
+
+    batches = []
+    get_pairwise_distances_within = resolver.get_pairwise_distances_within
+
+    def record(origins, destinations, limit_m):
+        batches.append(len(origins))
+        return get_pairwise_distances_within(origins, destinations, limit_m)
+
+    monkeypatch.setattr(resolver, "get_distance_in_meters", fail)
+    monkeypatch.setattr(resolver, "get_distance_matrix", fail)
+    monkeypatch.setattr(resolver, "get_pairwise_distances_within", record)
+    resolver.get_distance_cache().clear()
+    tree, extension = get_links(MSTPLinkBuilder(resolver), pnetwork, density)
+
+    assert 0 < sum(batches) < len(points) * (len(points) - 1) // 2
+    np.testing.assert_allclose(tree, expected_tree, rtol=1e-6)
+    np.testing.assert_allclose(extension, expected_extension, rtol=1e-6)
+
+
+@pytest.mark.parametrize("density", [None, 0.1, 0.3])
+def test_lazy_kruskal_matches_full_kruskal(density):
+    points = make_points(60, seed=1)
+    graph = nx.empty_graph(len(points))
+    graph.add_edges_from([(0, 1), (2, 3), (10, 40)])
+    pnetwork = make_placement_network(graph, points)
+
+    resolver = BoundedGeodeticDistanceResolver()
+    tree, extension = get_links(MSTPLinkBuilder(resolver), pnetwork, density)
+    expected_tree, expected_extension = get_links(MSTPLinkBuilder(GeodeticDistanceResolver()), pnetwork, density)
+
+    assert 0 < resolver.lookups < len(points) * (len(points) - 1) // 2
+    np.testing.assert_allclose(tree, expected_tree, rtol=1e-6)
+    np.testing.assert_allclose(extension, expected_extension, rtol=1e-6)
+
+
+def test_lazy_kruskal_spans_every_point():
+    points = make_points(80, seed=2)
+    pnetwork = make_placement_network(nx.empty_graph(len(points)), points)
+
+    weight = get_tree_weight(MSTPLinkBuilder(BoundedGeodeticDistanceResolver()), pnetwork)
+
+    coordinates = [(lon, lat, None) for lon, lat in points.values()]
+    distances = GeodeticDistanceResolver().get_distance_matrix(coordinates, coordinates)
+    assert weight == pytest.approx(get_full_kruskal_weight(distances), rel=1e-9)
+
+
+def test_incremental_mst_repairs_match_rebuilds():
+    points = make_points(120, seed=3)
+    builder = IncrementalMSTPLinkBuilder(GeodeticDistanceResolver())
+    rng = np.random.default_rng(4)
+
+    nodes = list(range(80))
+    for step in range(6):
+        pnetwork = make_placement_network(nx.empty_graph(nodes), points)
+        tree, extension = get_links(builder, pnetwork, 0.1)
+        expected_tree, expected_extension = get_links(MSTPLinkBuilder(GeodeticDistanceResolver()), pnetwork, 0.1)
+
+        np.testing.assert_allclose(tree, expected_tree, rtol=1e-9)
+        np.testing.assert_allclose(extension, expected_extension, rtol=1e-9)
+
+        # A few points leave, arrive or move before the next run
+        removed = set(rng.choice(nodes, 3, replace=False).tolist())
+        nodes = [node for node in nodes if node not in removed] + [80 + 5 * step + k for k in range(5)]
+        moved = int(rng.choice(nodes))
+        points[moved] = (points[moved][0] + 0.01, points[moved][1])
+
+
+def test_incremental_mst_keeps_full_rows_for_bounded_resolvers():
+    points = make_points(40, seed=5)
+    pnetwork = make_placement_network(nx.empty_graph(len(points)), points)
+    resolver = BoundedGeodeticDistanceResolver()
+
+    tree, _ = get_links(IncrementalMSTPLinkBuilder(resolver), pnetwork)
+
+    assert resolver.lookups == 0
+    np.testing.assert_allclose(tree, get_links(MSTPLinkBuilder(GeodeticDistanceResolver()), pnetwork)[0], rtol=1e-9)
@@ -0,0 +1,73 @@
+import networkx as nx
+
+from models import PlacementObject, PlacementPoint, PlacementPointID
+
+from tests.helpers import get_placed_names, make_placement_network
+
+COORDINATES = [(30.5 + 0.01 * node, 50.4) for node in range(4)]
+
+
+def make_network():
+    return make_placement_network(nx.path_graph(4), COORDINATES)
+
+
+def place(pnetwork, node : int, name : str) -> None:
+    lon, lat = COORDINATES[node]
+    pnetwork.set_placement_point_data(node, PlacementPoint(PlacementPointID(node), lon, lat,
+                                                           object=PlacementObject(name, 1.0)))
+
+
+def test_snapshot_writes_leave_the_parent_unchanged():
+    parent = make_network()
+    place(parent, 0, "a")
+    snapshot = parent.snapshot()
+
+    place(snapshot, 0, "b")
+    place(snapshot, 1, "c")
+    snapshot.get_mutable_graph().add_edge(0, 3)
+
+    assert get_placed_names(parent) == {0: "a", 1: None, 2: None, 3: None}
+    assert not parent.get_graph().has_edge(0, 3)
+    assert get_placed_names(snapshot) == {0: "b", 1: "c", 2: None, 3: None}
+    assert snapshot.get_graph().has_edge(0, 3)
+
+
+def test_parent_writes_leave_the_snapshot_unchanged():
+    parent = make_network()
+    place(parent, 0, "a")
+    snapshot = parent.snapshot()
+
+    place(parent, 0, "b")
+    place(parent, 1, "c")
+    parent.get_mutable_graph().add_edge(0, 3)
+
+    assert get_placed_names(snapshot) == {0: "a", 1: None, 2: None, 3: None}
+    assert not snapshot.get_graph().has_edge(0, 3)
+    assert get_placed_names(parent) == {0: "b", 1: "c", 2: None, 3: None}
+    assert parent.get_graph().has_edge(0, 3)
+
+
+def test_sibling_snapshots_are_isolated():
+    parent = make_network()
+    first, second = parent.snapshot(), parent.snapshot()
+
+    place(first, 2, "a")
+    second.get_mutable_graph().remove_edge(1, 2)
+    place(second, 2, "b")
+
+    assert get_placed_names(first)[2] == "a" and first.get_graph().has_edge(1, 2)
+    assert get_placed_names(second)[2] == "b" and not second.get_graph().has_edge(1, 2)
+    assert get_placed_names(parent)[2] is None and parent.get_graph().has_edge(1, 2)
+
+
+def test_snapshot_of_a_snapshot_keeps_the_overlay():
+    parent = make_network()
+    snapshot = parent.snapshot()
+    place(snapshot, 3, "a")
+
+    nested = snapshot.snapshot()
+    place(nested, 3, "b")
+
+    assert get_placed_names(snapshot)[3] == "a"
+    assert get_placed_names(nested)[3] == "b"
+    assert get_placed_names(parent)[3] is None
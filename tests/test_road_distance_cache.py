@@ -0,0 +1,75 @@
+import sys
+import types
+
+import numpy as np
+import pytest
+
+from road_network.road_distance_cache import RoadDistanceCache
+
+FINGERPRINT = "grid"
+
+
+def _point(k : int):
+    return 30.5 + k * 1e-3, 50.4
+
+
+def _count_rows(cache : RoadDistanceCache) -> int:
+    return cache._connection.execute("SELECT COUNT(*) FROM distances").fetchone()[0]
+
+
+def test_get_returns_put_distances():
+    cache = RoadDistanceCache(RoadDistanceCache.IN_MEMORY)
+    cache.put(FINGERPRINT, [(_point(0), _point(1), 12.5), (_point(1), _point(0), 13.0)])
+
+    assert cache.get(FINGERPRINT, _point(0), _point(1)) == 12.5
+    assert cache.get(FINGERPRINT, _point(1), _point(0)) == 13.0
+    assert cache.get(FINGERPRINT, _point(0), _point(2)) is None
+    assert cache.get("other", _point(0), _point(1)) is None
+
+    matrix = cache.get_matrix(FINGERPRINT, [_point(0), _point(1)], [_point(0), _point(1)])
+    np.testing.assert_array_equal(matrix, [[np.nan, 12.5], [13.0, np.nan]])
+
+
+def test_entry_counter_follows_inserts_and_evictions():
+    cache = RoadDistanceCache(RoadDistanceCache.IN_MEMORY, max_entries=100)
+    for k in range(1, 150):
+        cache.put(FINGERPRINT, [(_point(0), _point(k), float(k))])
+        cache.put(FINGERPRINT, [(_point(0), _point(k), float(k))])
+        assert cache.get_stats()["entries"] == _count_rows(cache)
+
+    assert _count_rows(cache) <= 100
+
+
+def test_eviction_keeps_recently_used_distances():
+    cache = RoadDistanceCache(RoadDistanceCache.IN_MEMORY, max_entries=10)
+    cache.put(FINGERPRINT, [(_point(0), _point(k), float(k)) for k in range(1, 11)])
+    assert cache.get(FINGERPRINT, _point(0), _point(1)) == 1.0
+
+    cache.put(FINGERPRINT, [(_point(0), _point(11), 11.0)])
+
+    assert cache.get(FINGERPRINT, _point(0), _point(1)) == 1.0
+    assert cache.get(FINGERPRINT, _point(0), _point(2)) is None
+
+
+@pytest.mark.parametrize("finish", ["flush", "close"])
+def test_buffered_writes_persist(tmp_path, finish):
+    path = tmp_path / "distances.sqlite"
+    cache = RoadDistanceCache(path)
+    cache.put(FINGERPRINT, [(_point(0), _point(k), float(k)) for k in range(1, 20)])
+    assert cache.get(FINGERPRINT, _point(0), _point(3)) == 3.0
+    getattr(cache, finish)()
+
+    reopened = RoadDistanceCache(path)
+    assert reopened.get_stats()["entries"] == 19
+    assert reopened.get(FINGERPRINT, _point(0), _point(3)) == 3.0
+
+
+def test_default_path_without_entry_script(monkeypatch, tmp_path):
+    # Interactive sessions and python -c have a __main__ module without __file__
+    monkeypatch.setitem(sys.modules, "__main__", types.ModuleType("__main__"))
+    monkeypatch.chdir(tmp_path)
+
+    cache = RoadDistanceCache()
+    cache.close()
+
+    assert (tmp_path / "state" / "road_distances.sqlite").exists()
@@ -0,0 +1,103 @@
+import networkx as nx
+import numpy as np
+import pytest
+
+from algorithms.distance_resolvers import RoadNetworkDistanceResolver
+from road_network.parallel_shortest_paths import ParallelShortestPaths
+
+CENTER = (50.411, 30.511)
+
+
+def _node_coordinates(graph : nx.MultiDiGraph, node : int):
+    return graph.nodes[node]["x"], graph.nodes[node]["y"]
+
+
+def _make_resolver(graph : nx.MultiDiGraph, **kwargs) -> RoadNetworkDistanceResolver:
+    resolver = RoadNetworkDistanceResolver(**kwargs)
+    resolver.set_road_network(graph, CENTER, 5.0)
+    return resolver
+
+
+def test_distance_matches_networkx(grid_road_graph):
+    resolver = _make_resolver(grid_road_graph)
+    expected = nx.single_source_dijkstra_path_length(grid_road_graph, 0, weight="length")
+
+    for node in (1, 13, 77, 143):
+        distance = resolver.get_distance_in_meters(*_node_coordinates(grid_road_graph, 0),
+                                                   *_node_coordinates(grid_road_graph, node))
+        assert distance == pytest.approx(expected[node], rel=1e-5)
+
+
+def test_set_landmark_count_then_query(grid_road_graph):
+    resolver = _make_resolver(grid_road_graph)
+    resolver.set_landmark_count(4)
+    assert resolver.get_landmark_count() == 4
+
+    expected = nx.single_source_dijkstra_path_length(grid_road_graph, 5, weight="length")
+    distance = resolver.get_distance_in_meters(*_node_coordinates(grid_road_graph, 5),
+                                               *_node_coordinates(grid_road_graph, 130))
+    assert distance == pytest.approx(expected[130], rel=1e-5)
+
+    resolver.set_landmark_count(0)
+    distance = resolver.get_distance_in_meters(*_node_coordinates(grid_road_graph, 5),
+                                               *_node_coordinates(grid_road_graph, 131))
+    assert distance == pytest.approx(expected[131], rel=1e-5)
+
+
+def test_distance_matrix_matches_point_queries(grid_road_graph):
+    resolver = _make_resolver(grid_road_graph, landmark_count=4)
+    points = [(*_node_coordinates(grid_road_graph, node), None) for node in (0, 17, 60, 99, 143)]
+
+    matrix = resolver.get_distance_matrix(points, points)
+    for i, (o_lon, o_lat, _) in enumerate(points):
+        for j, (d_lon, d_lat, _) in enumerate(points):
+            assert matrix[i, j] == pytest.approx(resolver.get_distance_in_meters(o_lon, o_lat, d_lon, d_lat),
+                                                 rel=1e-5)
+
+
+def test_bounded_distances_are_exact_within_the_limit(grid_road_graph):
+    resolver = _make_resolver(grid_road_graph)
+    points = [(*_node_coordinates(grid_road_graph, node), None) for node in (0, 17, 60, 99, 143)]
+    expected = resolver.get_distance_matrix(points, points)
+    origins, destinations = np.triu_indices(len(points), k=1)
+    limit_m = float(np.median(expected[origins, destinations]))
+
+    resolver.get_distance_cache().clear()
+    distances = resolver.get_pairwise_distances_within([points[i] for i in origins],
+                                                       [points[j] for j in destinations], limit_m)
+
+    within = expected[origins, destinations] <= limit_m
+    assert distances[within] == pytest.approx(expected[origins, destinations][within], rel=1e-5)
+    assert np.all(np.isinf(distances[~within]))
+
+
+def test_road_lower_bounds_are_admissible(grid_road_graph):
+    resolver = _make_resolver(grid_road_graph)
+    rng = np.random.default_rng(3)
+    points = [(float(lon), float(lat), None)
+              for lon, lat in zip(30.5 + rng.random(30) * 0.022, 50.4 + rng.random(30) * 0.022)]
+
+    bounds = resolver.get_lower_bound_matrix(points, points)
+    distances = resolver.get_distance_matrix(points, points)
+
+    assert np.all(bounds <= distances)
+
+
+def test_close_stops_workers_and_removes_shared_graph(monkeypatch, grid_road_graph):
+    monkeypatch.setattr(ParallelShortestPaths, "MIN_PARALLEL_SOURCES", 1)
+    parallel_shortest_paths = ParallelShortestPaths(workers=2)
+    resolver = _make_resolver(grid_road_graph, parallel_shortest_paths=parallel_shortest_paths)
+    points = [(*_node_coordinates(grid_road_graph, node), None) for node in (0, 13, 77, 143)]
+
+    expected = resolver.get_distance_matrix(points, points)
+    shared_dir = parallel_shortest_paths._shared_dir
+    assert shared_dir is not None and shared_dir.exists()
+
+    resolver.close()
+    assert not shared_dir.exists()
+
+    # The workers start again on the next query
+    resolver.get_distance_cache().clear()
+    assert resolver.get_distance_matrix(points, points) == pytest.approx(expected)
+    assert parallel_shortest_paths._shared_dir is not None
+    resolver.close()
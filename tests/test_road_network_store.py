@@ -0,0 +1,20 @@
+import sys
+import types
+
+from road_network.road_network_store import RoadNetworkStore
+
+
+def test_default_store_dir_without_entry_script(monkeypatch, tmp_path):
+    # Interactive sessions and python -c have a __main__ module without __file__
+    monkeypatch.setitem(sys.modules, "__main__", types.ModuleType("__main__"))
+    monkeypatch.chdir(tmp_path)
+
+    assert RoadNetworkStore().get_store_dir() == tmp_path / "road_networks"
+
+
+def test_default_store_dir_next_to_entry_script(monkeypatch, tmp_path):
+    entry = types.ModuleType("__main__")
+    entry.__file__ = str(tmp_path / "main.py")
+    monkeypatch.setitem(sys.modules, "__main__", entry)
+
+    assert RoadNetworkStore().get_store_dir() == tmp_path / "road_networks"
@@ -0,0 +1,47 @@
+import networkx as nx
+
+from algorithms.distance_resolvers import RoadNetworkDistanceResolver
+from road_network import road_network_tile_cache
+from road_network.road_network_tile_cache import RoadNetworkTileCache
+
+CENTER = (50.411, 30.511)
+
+
+def _serve_tiles(monkeypatch, graph : nx.MultiDiGraph) -> None:
+    monkeypatch.setattr(road_network_tile_cache.ox, "graph_from_bbox", lambda *args, **kwargs: graph.copy())
+
+
+def test_tiles_are_cached(monkeypatch, grid_road_graph):
+    _serve_tiles(monkeypatch, grid_road_graph)
+    tile_cache = RoadNetworkTileCache(tile_size_deg=0.1)
+
+    coverage = tile_cache.get_coverage(CENTER, 500.0)
+    assert coverage.get_node_count() == grid_road_graph.number_of_nodes()
+    assert tile_cache.get_loaded_tile_count() == 1
+    assert coverage.get_source_graph() is None
+
+
+def test_keep_source_graph_reaches_tile_cache(monkeypatch, grid_road_graph):
+    _serve_tiles(monkeypatch, grid_road_graph)
+    tile_cache = RoadNetworkTileCache(tile_size_deg=0.1)
+    resolver = RoadNetworkDistanceResolver(tile_cache=tile_cache)
+
+    tile_cache.get_coverage(CENTER, 500.0)
+    resolver.set_keep_source_graph(True)
+    assert tile_cache.get_keep_source_graph()
+    assert tile_cache.get_loaded_tile_count() == 0
+
+    assert tile_cache.get_coverage(CENTER, 500.0).get_source_graph() is not None
+
+    resolver.set_keep_source_graph(True)
+    assert tile_cache.get_loaded_tile_count() == 1
+
+
+def test_coverage_larger_than_cache_streams_tiles(monkeypatch, grid_road_graph):
+    _serve_tiles(monkeypatch, grid_road_graph)
+    tile_cache = RoadNetworkTileCache(tile_size_deg=0.01, max_tiles=4)
+
+    # A 5 km radius spans about 10x15 tiles of 0.01 deg
+    coverage = tile_cache.get_coverage(CENTER, 5_000.0)
+    assert coverage.get_node_count() == grid_road_graph.number_of_nodes()
+    assert tile_cache.get_loaded_tile_count() == 4